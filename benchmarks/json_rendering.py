@@ -0,0 +1,75 @@
+"""Compara o renderizador `json` padrão do Pyramid e `restfulapi.JSONRenderer`
+na serialização de um periódico com 636 fascículos e de uma página com 1000
+registros de mudança.
+
+Uso: python benchmarks/json_rendering.py [repetições]
+"""
+import sys
+import timeit
+
+from pyramid import testing
+from pyramid.renderers import JSON
+
+from documentstore import domain, restfulapi
+
+
+def journal_fixture(issues=636):
+    journal = domain.Journal(id="0034-8910")
+    journal.title = "Revista de Saúde Pública"
+    journal.mission = [
+        {"language": "pt", "value": "Publicar trabalhos científicos originais."},
+        {"language": "en", "value": "To publish original scientific papers."},
+    ]
+    journal.subject_areas = ("Health Sciences",)
+    for index in range(issues):
+        journal.add_issue(
+            {"id": "0034-8910-%s-%s" % (1967 + index // 6, index % 6 + 1)}
+        )
+    return journal.data()
+
+
+def changes_fixture(entries=1000):
+    return {
+        "since": "",
+        "limit": entries,
+        "results": [
+            {
+                "id": "/documents/0034-8910-rsp-48-2-%04d" % index,
+                "timestamp": "2018-08-05T23:03:44.%06dZ" % index,
+            }
+            for index in range(entries)
+        ],
+    }
+
+
+def measure(render, value, number):
+    seconds = min(timeit.repeat(lambda: render(value), number=number, repeat=5))
+    return seconds / number * 1e6, len(render(value))
+
+
+def main(number=200):
+    request = testing.DummyRequest()
+    pyramid_renderer = JSON()(None)
+    kernel_renderer = restfulapi.JSONRenderer(None)
+
+    def render_pyramid(value):
+        return pyramid_renderer(value, {"request": request}).encode("utf-8")
+
+    def render_kernel(value):
+        return kernel_renderer(value, {"request": request})
+
+    print("orjson: %s" % ("yes" if domain.orjson is not None else "no"))
+    for name, value in [
+        ("journal with 636 issues", journal_fixture()),
+        ("changes page with 1000 entries", changes_fixture()),
+    ]:
+        before, before_size = measure(render_pyramid, value, number)
+        after, after_size = measure(render_kernel, value, number)
+        print(
+            "%s: %.0fus -> %.0fus (%.1fx), %s -> %s bytes"
+            % (name, before, after, before / after, before_size, after_size)
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
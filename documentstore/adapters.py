@@ -10,10 +10,12 @@ implementações.
 """
 import logging
 import json
+import hashlib
 
 import pymongo
 import bson
 from bson.objectid import ObjectId
+from slugify import slugify
 
 from . import interfaces
 from . import exceptions
@@ -23,6 +25,42 @@ from . import domain
 LOGGER = logging.getLogger(__name__)
 
 
+def revision(raw: bytes) -> str:
+    """Produz o identificador da revisão dos dados serializados em `raw`."""
+    return hashlib.sha1(raw).hexdigest()
+
+
+def _max_time_ms() -> dict:
+    """Produz o argumento `max_time_ms` das consultas ao MongoDB a partir do
+    tempo restante do prazo da requisição, caso definido.
+    """
+    remaining = domain.remaining_time()
+    if remaining is None:
+        return {}
+    return {"max_time_ms": max(1, int(remaining * 1000))}
+
+
+def slugify_assets_ids(assets, slug_fn=slugify):
+    return [
+        {"slug": slug_fn(asset_id), "id": asset_id, "url": asset_url}
+        for asset_id, asset_url in assets.items()
+    ]
+
+
+def latest_version_view(document) -> dict:
+    """Produz a visão da versão mais recente de `document`, conforme
+    `domain.Document.version`, com os identificadores dos ativos digitais já
+    convertidos em slugs. Retorna ``None`` caso o documento não possua versões.
+    """
+    try:
+        version = document.version()
+    except (KeyError, ValueError):
+        return None
+    if "assets" in version:
+        version["assets"] = slugify_assets_ids(version["assets"])
+    return version
+
+
 class MongoDB:
     """Abstrai a configuração do MongoDB de maneira que nenhum outro objeto do 
     código necessita conhecer detalhes de conexão, nome do banco de dados ou
@@ -124,9 +162,20 @@ class BaseStore(interfaces.DataStore):
     implementam/definem o atributo `DomainClass`.
     """
 
+    # projeção aplicada na leitura dos manifestos por `fetch` e `fetch_many`
+    FETCH_PROJECTION = None
+
     def __init__(self, collection):
         self._collection = collection
 
+    def _fetch_projection(self) -> dict:
+        """Produz o argumento `projection` das leituras dos manifestos, caso
+        `FETCH_PROJECTION` seja definido.
+        """
+        if self.FETCH_PROJECTION:
+            return {"projection": self.FETCH_PROJECTION}
+        return {}
+
     def _pre_write(self, data) -> dict:
         """Tratamento anterior ao armazenamento do dado no MongoDB."""
         _manifest = data.manifest
@@ -156,7 +205,9 @@ class BaseStore(interfaces.DataStore):
             )
 
     def fetch(self, id: str):
-        manifest = self._collection.find_one({"_id": id})
+        manifest = self._collection.find_one(
+            {"_id": id}, **self._fetch_projection(), **_max_time_ms()
+        )
         if manifest:
             return self.DomainClass(manifest=self._post_read(manifest))
         else:
@@ -164,6 +215,80 @@ class BaseStore(interfaces.DataStore):
                 "cannot fetch data with id " '"%s": data does not exist' % id
             )
 
+    def _raw(self, data: dict) -> tuple:
+        """Produz a representação em JSON do dado lido do MongoDB e sua
+        revisão.
+        """
+        raw = domain.json_dumps(self._post_read(data))
+        return raw, revision(raw)
+
+    def fetch_raw(self, id: str) -> tuple:
+        manifest = self._collection.find_one({"_id": id}, **_max_time_ms())
+        if manifest:
+            return self._raw(manifest)
+        else:
+            raise exceptions.DoesNotExist(
+                "cannot fetch data with id " '"%s": data does not exist' % id
+            )
+
+    def fetch_many(self, ids: list) -> dict:
+        """Recupera os dados por meio de uma única consulta com o operador
+        `$in`.
+        """
+        return {
+            manifest["_id"]: self.DomainClass(manifest=self._post_read(manifest))
+            for manifest in self._collection.find(
+                {"_id": {"$in": list(ids)}},
+                **self._fetch_projection(),
+                **_max_time_ms(),
+            )
+        }
+
+    def write_many(self, operations: list) -> list:
+        """Executa as operações por meio de um único `bulk_write` não ordenado,
+        de maneira que a falha de uma operação não impede a execução das
+        demais.
+        """
+        results = [None] * len(operations)
+        requests = []
+        for op, data in operations:
+            _id, _manifest = self._pre_write(data)
+            if op == "add":
+                requests.append(pymongo.InsertOne(_manifest))
+            elif op == "update":
+                requests.append(pymongo.ReplaceOne({"_id": _id}, _manifest))
+            else:
+                raise ValueError('unknown operation "%s"' % op)
+
+        if not requests:
+            return results
+
+        try:
+            result = self._collection.bulk_write(requests, ordered=False)
+        except pymongo.errors.BulkWriteError as exc:
+            for error in exc.details.get("writeErrors", []):
+                index = error["index"]
+                _, data = operations[index]
+                if error.get("code") == 11000:
+                    results[index] = exceptions.AlreadyExists(
+                        "cannot add data with id "
+                        '"%s": the id is already in use' % data.id()
+                    )
+                else:
+                    results[index] = exceptions.NonRetryableError(
+                        'cannot write data with id "%s": %s'
+                        % (data.id(), error.get("errmsg"))
+                    )
+        else:
+            updates = len([op for op, _ in operations if op == "update"])
+            if result.matched_count < updates:
+                LOGGER.warning(
+                    "%s of %s updates did not match any data",
+                    updates - result.matched_count,
+                    updates,
+                )
+        return results
+
 
 class ChangesStore(interfaces.ChangesDataStore):
     """Implementação de `interfaces.ChangesDataStore` para armazenamento em 
@@ -181,16 +306,37 @@ class ChangesStore(interfaces.ChangesDataStore):
                 'cannot add data with id "%s": %s' % (change["_id"], exc)
             ) from None
 
+    def add_many(self, changes: list):
+        """Insere `changes` em lote por meio de um único `insert_many` não
+        ordenado. Levanta `exceptions.AlreadyExists` caso alguma das mudanças
+        possua identificador ou timestamp duplicado, após a inserção das
+        demais.
+        """
+        if not changes:
+            return None
+        try:
+            self._collection.insert_many(changes, ordered=False)
+        except pymongo.errors.BulkWriteError as exc:
+            errors = [
+                'change with id "%s": %s'
+                % (changes[error["index"]].get("_id"), error.get("errmsg"))
+                for error in exc.details.get("writeErrors", [])
+            ]
+            raise exceptions.AlreadyExists(
+                "cannot add data: %s" % "; ".join(errors)
+            ) from None
+
     def filter(self, since: str = "", limit: int = 500):
         return self._collection.find(
             {"timestamp": {"$gt": since}},
             sort=[("timestamp", pymongo.ASCENDING)],
             projection={"content_gz": False, "content_type": False},
+            **_max_time_ms(),
         ).limit(limit)
 
     def fetch(self, id: str) -> dict:
         try:
-            change = self._collection.find_one({"_id": ObjectId(id)})
+            change = self._collection.find_one({"_id": ObjectId(id)}, **_max_time_ms())
         except bson.errors.InvalidId as exc:
             raise exceptions.DoesNotExist(
                 'cannot fetch data with id "%s": %s' % (id, exc)
@@ -203,7 +349,7 @@ class ChangesStore(interfaces.ChangesDataStore):
             )
 
 
-class DocumentStore(BaseStore):
+class DocumentStore(BaseStore, interfaces.DocumentDataStore):
     DomainClass = domain.Document
 
     def _pre_write(self, data) -> dict:
@@ -211,9 +357,26 @@ class DocumentStore(BaseStore):
         dado é armazenado em JSON por conta da presença de caracteres restritos no nome
         de campos (Ex.: "0034-8910-rsp-48-2-0347-gf01.jpg", com a presença de '.').
         Mais infos:
-        https://docs.mongodb.com/manual/reference/limits/#Restrictions-on-Field-Names"""
+        https://docs.mongodb.com/manual/reference/limits/#Restrictions-on-Field-Names
+
+        A visão da versão mais recente do documento é armazenada na mesma
+        escrita, em JSON pelo mesmo motivo, de maneira que sua leitura dispensa
+        a decodificação do manifesto. O mesmo vale para o timestamp da
+        modificação mais recente, lido em `fetch_validators`."""
         _id, _manifest = super()._pre_write(data)
-        return _id, {"_id": _id, "document": json.dumps(_manifest)}
+        raw = domain.json_dumps(_manifest)
+        return (
+            _id,
+            {
+                "_id": _id,
+                "document": raw.decode("utf-8"),
+                "revision": revision(raw),
+                "latest": domain.json_dumps(latest_version_view(data)).decode(
+                    "utf-8"
+                ),
+                "last_modified": data.last_modified(),
+            },
+        )
 
     def _post_read(self, data: dict) -> dict:
         """Tratamento posterior à leitura do dado no MongoDB. Para Document, o
@@ -222,10 +385,242 @@ class DocumentStore(BaseStore):
         https://docs.mongodb.com/manual/reference/limits/#Restrictions-on-Field-Names"""
         return json.loads(data["document"])
 
+    def _raw(self, data: dict) -> tuple:
+        """Para Document, o dado já é armazenado em JSON e acompanhado de sua
+        revisão, dispensando a decodificação e a recodificação. A revisão é
+        calculada caso tenha sido armazenado antes da sua introdução.
+        """
+        raw = data["document"].encode("utf-8")
+        return raw, data.get("revision") or revision(raw)
+
+    def fetch_validators(self, id: str) -> tuple:
+        """Recupera apenas a revisão e o timestamp armazenados em `_pre_write`.
+        Ambos são produzidos a partir do manifesto caso o documento tenha sido
+        armazenado antes da sua introdução.
+        """
+        data = self._collection.find_one(
+            {"_id": id},
+            projection={"revision": True, "last_modified": True},
+            **_max_time_ms(),
+        )
+        if not data:
+            raise exceptions.DoesNotExist(
+                "cannot fetch data with id " '"%s": data does not exist' % id
+            )
+        if "revision" in data and "last_modified" in data:
+            return data["revision"], data["last_modified"]
+        raw, _revision = self.fetch_raw(id)
+        return _revision, self.DomainClass(manifest=json.loads(raw)).last_modified()
+
+    def fetch_latest_version(self, id: str) -> dict:
+        """Recupera apenas a visão da versão mais recente, armazenada em
+        `_pre_write`. A visão é produzida a partir do manifesto caso o
+        documento tenha sido armazenado antes da sua introdução.
+        """
+        data = self._collection.find_one(
+            {"_id": id}, projection={"latest": True}, **_max_time_ms()
+        )
+        if not data:
+            raise exceptions.DoesNotExist(
+                "cannot fetch data with id " '"%s": data does not exist' % id
+            )
+        if "latest" in data:
+            latest = json.loads(data["latest"])
+        else:
+            latest = latest_version_view(self.fetch(id))
+        if latest is None:
+            raise ValueError("missing version for index: -1")
+        return latest
+
+
+class BundleStore(BaseStore, interfaces.BundleDataStore):
+    """Implementação de `interfaces.BundleDataStore` para armazenamento em
+    MongoDB. As operações sobre os itens são executadas por meio de um único
+    `find_one_and_update` condicional, de maneira que escritas concorrentes na
+    mesma entidade não se sobrepõem.
+
+    Junto ao manifesto é armazenada a sua serialização em JSON, produzida por
+    `data_bytes`, e a sua revisão, de maneira que a leitura por meio de
+    `fetch_raw` dispensa a decodificação e a recodificação do manifesto.
+    """
+
+    RAW_FIELD = "_json"
+    REVISION_FIELD = "_revision"
+    # a serialização e a revisão são lidas apenas por `fetch_raw` e
+    # `fetch_validators`
+    FETCH_PROJECTION = {RAW_FIELD: False, REVISION_FIELD: False}
+
+    def _pre_write(self, data) -> dict:
+        _id, _manifest = super()._pre_write(data)
+        raw = data.data_bytes()
+        _manifest[self.RAW_FIELD] = raw
+        _manifest[self.REVISION_FIELD] = revision(raw)
+        return _id, _manifest
+
+    def _post_read(self, data: dict) -> dict:
+        """Descarta a serialização armazenada e o identificador `_id` quando
+        redundante, de maneira que o manifesto lido corresponda ao serializado.
+        """
+        return {
+            name: value
+            for name, value in data.items()
+            if name not in (self.RAW_FIELD, self.REVISION_FIELD)
+            and not (name == "_id" and value == data.get("id"))
+        }
+
+    def fetch_raw(self, id: str) -> tuple:
+        data = self._collection.find_one(
+            {"_id": id},
+            projection={self.RAW_FIELD: True, self.REVISION_FIELD: True},
+            **_max_time_ms(),
+        )
+        if data and self.RAW_FIELD in data:
+            return bytes(data[self.RAW_FIELD]), data[self.REVISION_FIELD]
+        elif data:
+            return super().fetch_raw(id)
+        else:
+            raise exceptions.DoesNotExist(
+                "cannot fetch data with id " '"%s": data does not exist' % id
+            )
+
+    def fetch_validators(self, id: str) -> tuple:
+        """Recupera apenas a revisão e o timestamp `updated` do manifesto. A
+        revisão é produzida por meio de `fetch_raw` caso não esteja armazenada.
+        """
+        data = self._collection.find_one(
+            {"_id": id},
+            projection={self.REVISION_FIELD: True, "updated": True},
+            **_max_time_ms(),
+        )
+        if not data:
+            raise exceptions.DoesNotExist(
+                "cannot fetch data with id " '"%s": data does not exist' % id
+            )
+        if self.REVISION_FIELD in data:
+            _revision = data[self.REVISION_FIELD]
+        else:
+            _, _revision = self.fetch_raw(id)
+        return _revision, data.get("updated", "")
+
+    def _fetch_updated(self, id: str, filter: dict, update: dict):
+        """Executa `update` e produz a nova serialização do manifesto. A
+        serialização anterior é descartada na mesma operação, e a nova é
+        armazenada apenas se nenhuma outra escrita tiver ocorrido nesse
+        intervalo; caso contrário, será produzida na leitura ou na próxima
+        escrita.
+        """
+        update = {
+            **update,
+            "$unset": {self.RAW_FIELD: "", self.REVISION_FIELD: ""},
+        }
+        manifest = self._collection.find_one_and_update(
+            {"_id": id, **filter},
+            update,
+            **self._fetch_projection(),
+            **_max_time_ms(),
+            return_document=pymongo.ReturnDocument.AFTER,
+        )
+        if manifest:
+            data = self.DomainClass(manifest=self._post_read(manifest))
+            try:
+                domain.remaining_time()
+            except exceptions.DeadlineExceeded:
+                # esgotado o prazo, a serialização será armazenada na leitura
+                # ou na próxima escrita
+                return data
+            raw = data.data_bytes()
+            self._collection.update_one(
+                {"_id": id, "updated": manifest["updated"], self.RAW_FIELD: None},
+                {
+                    "$set": {
+                        self.RAW_FIELD: raw,
+                        self.REVISION_FIELD: revision(raw),
+                    }
+                },
+            )
+            return data
+        elif self._collection.find_one(
+            {"_id": id}, projection={"_id": True}, **_max_time_ms()
+        ):
+            return None
+        else:
+            raise exceptions.DoesNotExist(
+                "cannot update data with id " '"%s": data does not exist' % id
+            )
+
+    def add_item(self, id: str, item: dict, index: int = None, now=domain.utcnow):
+        try:
+            _item = dict(item)
+            _item_id = _item["id"]
+        except ValueError:
+            raise ValueError(
+                "cannot add this item " '"%s": item must be dict' % item
+            ) from None
+        except KeyError:
+            raise KeyError(
+                "cannot add this item " '"%s": item must contain id key' % item
+            ) from None
+
+        push = {"$each": [_item]}
+        if index is not None:
+            push["$position"] = index
+
+        data = self._fetch_updated(
+            id,
+            {"items.id": {"$ne": _item_id}},
+            {"$push": {"items": push}, "$set": {"updated": now()}},
+        )
+        if data is None:
+            raise exceptions.AlreadyExists(
+                'cannot add item "%s" in bundle: '
+                "the item id already exists" % _item_id
+            )
+        return data
+
+    def remove_item(self, id: str, item_id: str, now=domain.utcnow):
+        data = self._fetch_updated(
+            id,
+            {"items.id": item_id},
+            {"$pull": {"items": {"id": item_id}}, "$set": {"updated": now()}},
+        )
+        if data is None:
+            raise exceptions.DoesNotExist(
+                "cannot remove item from bundle: "
+                'the item id "%s" does not exist' % item_id
+            )
+        return data
+
+    def fetch_slice(
+        self, id: str, offset: int, limit: int, fields: list = None
+    ) -> dict:
+        """Recupera o manifesto por meio de uma projeção com o operador
+        `$slice`, de maneira que apenas os itens solicitados são lidos e
+        transferidos pelo MongoDB.
+        """
+        if fields:
+            projection = {field.split(".")[0]: True for field in fields}
+        else:
+            projection = {
+                "items": True,
+                self.RAW_FIELD: False,
+                self.REVISION_FIELD: False,
+            }
+        if "items" in projection:
+            projection["items"] = {"$slice": [offset, limit]}
+        manifest = self._collection.find_one(
+            {"_id": id}, projection=projection, **_max_time_ms()
+        )
+        if manifest:
+            return self._post_read(manifest)
+        else:
+            raise exceptions.DoesNotExist(
+                "cannot fetch data with id " '"%s": data does not exist' % id
+            )
+
 
-class DocumentsBundleStore(BaseStore):
+class DocumentsBundleStore(BundleStore):
     DomainClass = domain.DocumentsBundle
 
 
-class JournalStore(BaseStore):
+class JournalStore(BundleStore):
     DomainClass = domain.Journal
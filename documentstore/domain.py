@@ -1,5 +1,7 @@
 import itertools
 from copy import deepcopy
+from collections import deque
+from concurrent import futures
 from io import BytesIO
 import re
 from typing import Union, Callable, Any, Tuple, List, Dict
@@ -9,10 +11,18 @@ import os
 import functools
 import logging
 import json
+import threading
+import contextvars
+from urllib.parse import urlparse
 
 import requests
 from lxml import etree
-from prometheus_client import Counter, Summary
+from prometheus_client import Counter, Gauge, Summary
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from . import exceptions
 
@@ -41,6 +51,14 @@ SUBJECT_AREAS = (
 
 MAX_RETRIES = int(os.environ.get("KERNEL_LIB_MAX_RETRIES", "4"))
 BACKOFF_FACTOR = float(os.environ.get("KERNEL_LIB_BACKOFF_FACTOR", "1.2"))
+CIRCUIT_FAILURE_THRESHOLD = int(
+    os.environ.get("KERNEL_LIB_CIRCUIT_FAILURE_THRESHOLD", "5")
+)
+CIRCUIT_RESET_TIMEOUT = float(os.environ.get("KERNEL_LIB_CIRCUIT_RESET_TIMEOUT", "30"))
+HEDGE_BUDGET = float(os.environ.get("KERNEL_LIB_HEDGE_BUDGET", "0"))
+HEDGE_PERCENTILE = float(os.environ.get("KERNEL_LIB_HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_DELAY = float(os.environ.get("KERNEL_LIB_HEDGE_MIN_DELAY", "0.05"))
+OBJECTSTORE_REWRITES = os.environ.get("KERNEL_LIB_OBJECTSTORE_REWRITES", "")
 OBJECTSTORE_RESPONSE_TIME_SECONDS = Summary(
     "kernel_objectstore_response_time_seconds",
     "Elapsed time between the request for an XML and the response",
@@ -49,12 +67,111 @@ OBJECTSTORE_REQUEST_FAILURES_TOTAL = Counter(
     "kernel_objectstore_request_failures_total",
     "Total number of exceptions raised when requesting for an XML from the object-store",
 )
+OBJECTSTORE_COALESCED_REQUESTS_TOTAL = Counter(
+    "kernel_objectstore_coalesced_requests_total",
+    "Total number of requests for an XML served by an identical request in flight",
+)
+OBJECTSTORE_COALESCED_WAITERS = Gauge(
+    "kernel_objectstore_coalesced_waiters",
+    "Current number of requests for an XML waiting for an identical request",
+)
+OBJECTSTORE_HEDGED_REQUESTS_TOTAL = Counter(
+    "kernel_objectstore_hedged_requests_total",
+    "Total number of hedged requests for an XML issued to the object-store",
+)
+OBJECTSTORE_HEDGE_WINS_TOTAL = Counter(
+    "kernel_objectstore_hedge_wins_total",
+    "Total number of hedged requests that answered before the original ones",
+)
+OBJECTSTORE_CIRCUIT_STATE = Gauge(
+    "kernel_objectstore_circuit_state",
+    "State of the circuit breaker of each object-store host "
+    "(0: closed, 1: open, 2: half-open)",
+    ["host"],
+)
 
 
 def utcnow():
     return str(datetime.utcnow().isoformat() + "Z")
 
 
+def _stdlib_json_dumps(value, default=None) -> bytes:
+    return json.dumps(
+        value, default=default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+if orjson is not None:
+    # os tipos que o `orjson` serializa nativamente, mas não o módulo `json`,
+    # são delegados a `default` para que o resultado seja o mesmo em ambos
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+
+    def json_dumps(value, default=None) -> bytes:
+        """Serializa `value` em JSON, codificado em UTF-8 e sem espaços entre
+        os separadores, por meio do pacote `orjson`. Os valores não suportados
+        pelo `orjson`, e.g., inteiros maiores que 64 bits, são serializados
+        pelo módulo `json`.
+
+        Trata-se da serialização única das entidades, tanto na produção das
+        respostas HTTP quanto no armazenamento, de maneira que um mesmo dado
+        sempre produz os mesmos bytes e a mesma revisão.
+        """
+        try:
+            return orjson.dumps(value, default=default, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return _stdlib_json_dumps(value, default)
+
+
+else:
+    json_dumps = _stdlib_json_dumps
+
+
+_DEADLINE = contextvars.ContextVar("deadline", default=None)
+
+
+class deadline:
+    """Gerenciador de contexto que define o prazo, em segundos, para a
+    execução do bloco. O prazo é observado pelos acessos ao object store e ao
+    banco de dados realizados no bloco, inclusive nas novas tentativas. Em
+    blocos aninhados prevalece o menor prazo. Prazo ``None`` não impõe limite.
+    """
+
+    def __init__(self, seconds: float = None, clock=time.monotonic):
+        self.seconds = seconds
+        self.clock = clock
+
+    def __enter__(self):
+        current = _DEADLINE.get()
+        if self.seconds is not None:
+            expires_at = self.clock() + self.seconds
+            if current is None or expires_at < current:
+                current = expires_at
+        self._token = _DEADLINE.set(current)
+        return self
+
+    def __exit__(self, *exc_info):
+        _DEADLINE.reset(self._token)
+
+
+def remaining_time(clock=time.monotonic) -> float:
+    """Retorna o tempo restante, em segundos, para o esgotamento do prazo ou
+    ``None`` caso não haja prazo definido. Lança `exceptions.DeadlineExceeded`
+    caso o prazo já tenha se esgotado.
+    """
+    expires_at = _DEADLINE.get()
+    if expires_at is None:
+        return None
+    remaining = expires_at - clock()
+    if remaining <= 0:
+        raise exceptions.DeadlineExceeded("request deadline exceeded")
+    return remaining
+
+
 class DocumentManifest:
     """Namespace para funções que manipulam o manifesto do documento.
     """
@@ -194,6 +311,9 @@ class retry_gracefully:
         self.max_retries = int(max_retries)
         self.backoff_factor = float(backoff_factor)
         self.exc_list = tuple(exc_list)
+        # não há por que aguardar para tentar novamente enquanto o circuito
+        # estiver aberto
+        self.giveup_list = (exceptions.CircuitOpenError,)
 
     def _sleep(self, seconds):
         time.sleep(seconds)
@@ -205,9 +325,16 @@ class retry_gracefully:
             while True:
                 try:
                     return func(*args, **kwargs)
+                except self.giveup_list:
+                    raise
                 except self.exc_list as exc:
                     if retry <= self.max_retries:
                         wait_seconds = self.backoff_factor ** retry
+                        remaining = remaining_time()
+                        if remaining is not None and remaining <= wait_seconds:
+                            raise exceptions.DeadlineExceeded(
+                                "request deadline exceeded: %s" % exc
+                            ) from exc
                         LOGGER.info(
                             'could not get the result for "%s" with *args "%s" '
                             'and **kwargs "%s". retrying in %s seconds '
@@ -227,13 +354,404 @@ class retry_gracefully:
         return wrapper
 
 
+class CircuitBreaker:
+    """Disjuntor que passa a recusar as chamadas, i.e., se abre, após
+    `failure_threshold` falhas consecutivas. Decorridos `reset_timeout`
+    segundos, uma única chamada de teste é permitida (estado semiaberto): em
+    caso de sucesso o disjuntor se fecha e em caso de falha volta a se abrir.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 0, 1, 2
+
+    def __init__(
+        self,
+        failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=CIRCUIT_RESET_TIMEOUT,
+        on_change=None,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = int(failure_threshold)
+        self.reset_timeout = float(reset_timeout)
+        self.on_change = on_change or (lambda state: None)
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _set_state(self, state):
+        if state != self.state:
+            self.state = state
+            self.on_change(state)
+
+    def before_call(self) -> None:
+        """Lança `exceptions.CircuitOpenError` caso a chamada não possa ser
+        realizada.
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                elapsed = self.clock() - self.opened_at
+                if elapsed < self.reset_timeout:
+                    raise exceptions.CircuitOpenError(
+                        "circuit is open", retry_after=self.reset_timeout - elapsed
+                    )
+                self._set_state(self.HALF_OPEN)
+
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    raise exceptions.CircuitOpenError(
+                        "circuit is half-open", retry_after=self.reset_timeout
+                    )
+                self._probing = True
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._set_state(self.CLOSED)
+
+    def on_cancel(self) -> None:
+        """Encerra a chamada sem alterar o estado do disjuntor.
+        """
+        with self._lock:
+            self._probing = False
+
+    def on_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+                self._set_state(self.OPEN)
+
+
+class circuit_breaker:
+    """Produz decorador que associa a cada host um `CircuitBreaker`. O objeto
+    decorado deve receber a URL como primeiro argumento. Apenas as exceções
+    do tipo `exceptions.RetryableError` são consideradas falhas, já que as
+    demais indicam que o host está respondendo.
+    """
+
+    def __init__(self, **options):
+        self.options = options
+        self.breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            try:
+                return self.breakers[host]
+            except KeyError:
+                gauge = OBJECTSTORE_CIRCUIT_STATE.labels(host)
+                gauge.set(CircuitBreaker.CLOSED)
+                breaker = self.breakers[host] = CircuitBreaker(
+                    on_change=gauge.set, **self.options
+                )
+                return breaker
+
+    def reset(self) -> None:
+        """Descarta os disjuntores de todos os hosts, que voltam a ser
+        considerados disponíveis.
+        """
+        with self._lock:
+            hosts = list(self.breakers)
+            self.breakers.clear()
+        for host in hosts:
+            OBJECTSTORE_CIRCUIT_STATE.labels(host).set(CircuitBreaker.CLOSED)
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(url, *args, **kwargs):
+            breaker = self.get(urlparse(url).netloc)
+            breaker.before_call()
+            try:
+                result = func(url, *args, **kwargs)
+            except exceptions.NonRetryableError:
+                breaker.on_success()
+                raise
+            except exceptions.RetryableError:
+                breaker.on_failure()
+                raise
+            except BaseException:
+                # o esgotamento do prazo da requisição, assim como os demais
+                # erros, nada diz sobre o host
+                breaker.on_cancel()
+                raise
+            breaker.on_success()
+            return result
+
+        wrapper.circuit_breaker = self
+        return wrapper
+
+
+def parse_rewrite_rules(value: str) -> list:
+    """Produz a lista de regras de reescrita de URLs, na forma
+    ``[(<prefixo>, [<substituto>, ...]), ...]``, a partir de `value`. As
+    regras são separadas por espaços ou quebras de linha e têm a forma
+    ``<prefixo>=<substituto>[,<substituto>...]``. A lista é ordenada do maior
+    para o menor prefixo.
+    """
+    rules = []
+    for rule in value.split():
+        prefix, _, targets = rule.partition("=")
+        targets = [target for target in targets.split(",") if target]
+        if not prefix or not targets:
+            raise ValueError("invalid URL rewrite rule: %r" % rule)
+        rules.append((prefix, targets))
+    return sorted(rules, key=lambda rule: len(rule[0]), reverse=True)
+
+
+class rewrite_urls:
+    """Produz decorador que substitui o prefixo da URL, recebida como primeiro
+    argumento, conforme a regra de maior prefixo em `rules`, e.g., para que
+    os dados sejam obtidos por meio de um espelho interno do object store. Os
+    substitutos são tentados em ordem, até que um deles seja bem sucedido. As
+    URLs sem regra correspondente são mantidas.
+
+    Note que as URLs são substituídas apenas no acesso aos dados, i.e., as
+    URLs canônicas permanecem nos manifestos.
+    """
+
+    def __init__(self, rules=OBJECTSTORE_REWRITES):
+        if isinstance(rules, str):
+            rules = parse_rewrite_rules(rules)
+        self.rules = rules
+
+    def candidates(self, url: str) -> list:
+        for prefix, targets in self.rules:
+            if url.startswith(prefix):
+                return [target + url[len(prefix) :] for target in targets]
+        return [url]
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(url, *args, **kwargs):
+            *fallbacks, last = self.candidates(url)
+            for candidate in fallbacks:
+                try:
+                    return func(candidate, *args, **kwargs)
+                except (exceptions.RetryableError, exceptions.NonRetryableError) as exc:
+                    LOGGER.info(
+                        'could not get "%s" from "%s", trying the next '
+                        "candidate: %s",
+                        url,
+                        candidate,
+                        exc,
+                    )
+            return func(last, *args, **kwargs)
+
+        wrapper.rewrite_urls = self
+        return wrapper
+
+
+class HedgingPolicy:
+    """Política de requisições redundantes (*hedged requests*). Caso a
+    requisição não seja respondida em tempo equivalente ao percentil
+    `percentile` dos tempos de resposta recentes, nunca menor que `min_delay`
+    segundos, uma segunda requisição idêntica é feita e prevalece a resposta
+    que chegar primeiro.
+
+    O número de requisições redundantes é limitado por `budget`, a fração das
+    requisições que podem ser duplicadas, e.g., ``0.05`` para 5%. Esgotado o
+    orçamento, ou ocupados todos os `max_workers` workers do executor, as
+    requisições são feitas diretamente, na thread de quem as solicita.
+    """
+
+    def __init__(
+        self,
+        budget=HEDGE_BUDGET,
+        percentile=HEDGE_PERCENTILE,
+        min_delay=HEDGE_MIN_DELAY,
+        window=1000,
+        max_tokens=10,
+        max_workers=32,
+    ):
+        self.budget = float(budget)
+        self.percentile = float(percentile)
+        self.min_delay = float(min_delay)
+        self.max_tokens = max_tokens
+        self.tokens = 0.0
+        self.latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hedging"
+        )
+        # workers do executor não ocupados
+        self._workers = threading.BoundedSemaphore(max_workers)
+
+    def delay(self) -> float:
+        with self._lock:
+            latencies = sorted(self.latencies)
+        if not latencies:
+            return self.min_delay
+        index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+        return max(self.min_delay, latencies[index])
+
+    def _deposit(self):
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.budget)
+
+    def _withdraw(self) -> bool:
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def _can_hedge(self) -> bool:
+        with self._lock:
+            return self.tokens >= 1
+
+    def _timed(self, func, *args, **kwargs):
+        start = time.monotonic()
+        result = func(*args, **kwargs)
+        with self._lock:
+            self.latencies.append(time.monotonic() - start)
+        return result
+
+    def _task(self, func, *args, **kwargs):
+        try:
+            return self._timed(func, *args, **kwargs)
+        finally:
+            self._workers.release()
+
+    @staticmethod
+    def _succeeded(future) -> bool:
+        """Respostas com código de status fora da faixa 2xx, assim como as
+        exceções, não prevalecem sobre a outra requisição.
+        """
+        if future.exception() is not None:
+            return False
+        status_code = getattr(future.result(), "status_code", 200)
+        return 200 <= status_code < 300
+
+    def __call__(self, func, *args, **kwargs):
+        """Executa `func` conforme a política.
+        """
+        remaining = remaining_time()
+        self._deposit()
+        if not self._can_hedge() or not self._workers.acquire(blocking=False):
+            # sem orçamento para a requisição redundante, ou sem worker livre
+            # no executor, `func` é executada na própria thread
+            return self._timed(func, *args, **kwargs)
+
+        started = threading.Event()
+
+        def primary():
+            started.set()
+            return self._task(func, *args, **kwargs)
+
+        original = self._executor.submit(primary)
+        # o tempo de espera pelo início da execução não é contabilizado no
+        # prazo para a requisição redundante, mas é limitado pelo prazo da
+        # requisição
+        if not started.wait(remaining):
+            if original.cancel():
+                self._workers.release()
+            raise exceptions.DeadlineExceeded("request deadline exceeded")
+        done, _ = futures.wait([original], timeout=self.delay())
+        if done or not self._workers.acquire(blocking=False):
+            return original.result()
+        if not self._withdraw():
+            self._workers.release()
+            return original.result()
+
+        OBJECTSTORE_HEDGED_REQUESTS_TOTAL.inc()
+        hedged = self._executor.submit(self._task, func, *args, **kwargs)
+        pending = {original, hedged}
+        while pending:
+            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            # prevalece a primeira resposta bem sucedida
+            for future in sorted(done, key=lambda future: future is hedged):
+                if self._succeeded(future):
+                    if future is hedged:
+                        OBJECTSTORE_HEDGE_WINS_TOTAL.inc()
+                    return future.result()
+        return original.result()
+
+
+HEDGING_POLICY = HedgingPolicy() if HEDGE_BUDGET > 0 else None
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class singleflight:
+    """Produz decorador que coalesce as chamadas simultâneas ao objeto
+    decorado que recebem o mesmo primeiro argumento, e.g., a URL: apenas a
+    primeira é executada e as demais aguardam e compartilham o seu resultado,
+    ou a exceção por ela lançada. As chamadas que aguardam observam o prazo
+    da requisição, caso definido.
+    """
+
+    def __init__(self):
+        self.flights = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(key, *args, **kwargs):
+            with self._lock:
+                flight = self.flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self.flights[key] = _Flight()
+
+            if leader:
+                try:
+                    flight.result = func(key, *args, **kwargs)
+                    return flight.result
+                except BaseException as exc:
+                    flight.exception = exc
+                    raise
+                finally:
+                    with self._lock:
+                        del self.flights[key]
+                    flight.done.set()
+
+            OBJECTSTORE_COALESCED_REQUESTS_TOTAL.inc()
+            with OBJECTSTORE_COALESCED_WAITERS.track_inprogress():
+                if not flight.done.wait(remaining_time()):
+                    raise exceptions.DeadlineExceeded("request deadline exceeded")
+            if isinstance(flight.exception, exceptions.DeadlineExceeded):
+                # o prazo esgotado é o da chamada coalescida, não desta
+                return wrapper(key, *args, **kwargs)
+            elif flight.exception is not None:
+                raise flight.exception
+            return flight.result
+
+        wrapper.singleflight = self
+        return wrapper
+
+
+@singleflight()
 @retry_gracefully()
+@rewrite_urls()
+@circuit_breaker()
 @OBJECTSTORE_REQUEST_FAILURES_TOTAL.count_exceptions()
 @OBJECTSTORE_RESPONSE_TIME_SECONDS.time()
 def fetch_data(url: str, timeout: float = 2) -> bytes:
+    remaining = remaining_time()
+    bound_by_deadline = remaining is not None and remaining < timeout
+    if bound_by_deadline:
+        timeout = remaining
     try:
-        response = requests.get(url, timeout=timeout)
-    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
+        if HEDGING_POLICY is not None:
+            response = HEDGING_POLICY(requests.get, url, timeout=timeout)
+        else:
+            response = requests.get(url, timeout=timeout)
+    except requests.exceptions.Timeout as exc:
+        if bound_by_deadline:
+            raise exceptions.DeadlineExceeded(
+                "request deadline exceeded: %s" % exc
+            ) from exc
+        raise exceptions.RetryableError(exc) from exc
+    except requests.exceptions.ConnectionError as exc:
         raise exceptions.RetryableError(exc) from exc
     except (
         requests.exceptions.InvalidSchema,
@@ -265,7 +783,8 @@ def assets_from_remote_xml(
 
 class Document:
     _timestamp_pattern = (
-        r"^[0-9]{4}-[0-9]{2}-[0-9]{2}(T[0-9]{2}:[0-9]{2}(:[0-9]{2})?Z)?$"
+        r"^[0-9]{4}-[0-9]{2}-[0-9]{2}"
+        r"(T[0-9]{2}:[0-9]{2}(:[0-9]{2}(\.[0-9]{1,6})?)?Z)?$"
     )
     data_type = "text/xml"
 
@@ -365,25 +884,8 @@ class Document:
         para o nível dos microsegundos por meio da concatenação da string
         `T23:59:59:999999Z` ao valor de `timestamp`.
         """
-        if not re.match(self._timestamp_pattern, timestamp):
-            raise ValueError(
-                "invalid format for timestamp: %s: must match pattern: %s"
-                % (timestamp, self._timestamp_pattern)
-            )
-
-        if re.match(r"^\d{4}-\d{2}-\d{2}$", timestamp):
-            timestamp = f"{timestamp}T23:59:59.999999Z"
-
-        try:
-            target_version = max(
-                itertools.takewhile(
-                    lambda version: version.get("timestamp", "") <= timestamp,
-                    self.manifest["versions"],
-                ),
-                key=lambda version: version.get("timestamp", ""),
-            )
-        except ValueError:
-            raise ValueError("missing version for timestamp: %s" % timestamp) from None
+        timestamp = self._normalized_timestamp(timestamp)
+        target_version = self._version_entry_at(timestamp)
 
         if target_version.get("deleted"):
             return target_version
@@ -425,6 +927,74 @@ class Document:
         target_version["renditions"] = target_renditions
         return target_version
 
+    @classmethod
+    def _normalized_timestamp(cls, timestamp: str) -> str:
+        """Valida `timestamp` e ajusta a sua resolução, caso esteja no nível do
+        dia, para o nível dos microsegundos. Veja `version_at`.
+        """
+        if not re.match(cls._timestamp_pattern, timestamp):
+            raise ValueError(
+                "invalid format for timestamp: %s: must match pattern: %s"
+                % (timestamp, cls._timestamp_pattern)
+            )
+
+        if re.match(r"^\d{4}-\d{2}-\d{2}$", timestamp):
+            timestamp = f"{timestamp}T23:59:59.999999Z"
+        return timestamp
+
+    def _version_entry_at(self, timestamp: str) -> dict:
+        """Obtém a versão, tal como consta no manifesto, vigente no momento
+        `timestamp`, já normalizado.
+        """
+        try:
+            return max(
+                itertools.takewhile(
+                    lambda version: version.get("timestamp", "") <= timestamp,
+                    self.manifest["versions"],
+                ),
+                key=lambda version: version.get("timestamp", ""),
+            )
+        except ValueError:
+            raise ValueError("missing version for timestamp: %s" % timestamp) from None
+
+    def version_timestamp_at(self, timestamp: str) -> str:
+        """Obtém o timestamp canônico da versão no momento `timestamp`, i.e., o
+        timestamp da modificação mais recente, até `timestamp`, da versão
+        vigente ou de seus ativos digitais. Ambos os timestamps produzem o
+        mesmo resultado em `version_at`, de maneira que o canônico pode ser
+        usado para identificar a versão.
+        """
+        timestamp = self._normalized_timestamp(timestamp)
+        target_version = self._version_entry_at(timestamp)
+        timestamps = [target_version.get("timestamp", "")]
+        for uris in target_version.get("assets", {}).values():
+            timestamps.extend(uri[0] for uri in uris if uri[0] <= timestamp)
+        return max(timestamps)
+
+    @classmethod
+    def is_immutable_at(cls, version_at: str, now=utcnow) -> bool:
+        """Informa se o conteúdo das versões no momento `version_at` não pode
+        mais ser alterado, conforme `is_immutable`, sem a necessidade do
+        manifesto do documento.
+        """
+        return cls._normalized_timestamp(version_at) < now()
+
+    def is_immutable(self, version_index=-1, version_at=None, now=utcnow) -> bool:
+        """Informa se o conteúdo da versão solicitada, conforme os argumentos
+        de `data`, não pode mais ser alterado. É o caso de `version_at` no
+        passado, uma vez que novas versões do documento ou de seus ativos
+        digitais sempre são registradas no momento atual, e das versões
+        anteriores à mais recente, uma vez que apenas a versão mais recente
+        recebe novas versões de ativos digitais.
+        """
+        if version_at:
+            return self.is_immutable_at(version_at, now=now)
+        versions = len(self._manifest.get("versions", []))
+        try:
+            return range(versions)[version_index] < versions - 1
+        except IndexError:
+            return False
+
     def data(
         self,
         version_index=-1,
@@ -465,6 +1035,22 @@ class Document:
 
     data_bytes = data
 
+    def last_modified(self) -> str:
+        """Retorna o timestamp da modificação mais recente do documento, i.e.,
+        o maior dentre os timestamps das versões, dos ativos digitais e das
+        manifestações. Retorna ``""`` caso o documento não possua versões.
+        """
+        timestamps = [""]
+        for version in self._manifest.get("versions", []):
+            timestamps.append(version.get("timestamp", ""))
+            for uris in version.get("assets", {}).values():
+                timestamps.extend(uri[0] for uri in uris)
+            for rendition in version.get("renditions", []):
+                timestamps.extend(
+                    data.get("timestamp", "") for data in rendition.get("data", [])
+                )
+        return max(timestamps)
+
     def _latest_or_default(self):
         try:
             return self.version()
@@ -571,6 +1157,41 @@ class BundleManifest:
         _bundle["updated"] = now()
         return _bundle
 
+    @staticmethod
+    def set_metadata_many(
+        bundle: dict,
+        metadata: Dict[str, Any],
+        components: Dict[str, Any] = None,
+        now: Callable[[], str] = utcnow,
+    ) -> dict:
+        """Define de uma só vez todos os metadados em `metadata` e os
+        componentes em `components`, produzindo uma única cópia do maço e uma
+        única atualização de `updated`. Caso todos os valores sejam
+        equivalentes aos já definidos, o próprio `bundle` é retornado, sem
+        cópia.
+        """
+        components = components or {}
+        current = {
+            name: bundle["metadata"][name]
+            for name in metadata
+            if name in bundle["metadata"]
+        }
+        current_components = {
+            name: bundle[name] for name in components if name in bundle
+        }
+        if BundleManifest.is_equivalent(
+            {"metadata": current, "components": current_components},
+            {"metadata": metadata, "components": components},
+            ignore=(),
+        ):
+            return bundle
+
+        _bundle = deepcopy(bundle)
+        _bundle["metadata"].update(metadata)
+        _bundle.update(components)
+        _bundle["updated"] = now()
+        return _bundle
+
     @staticmethod
     def get_metadata(bundle: dict, name: str, default="") -> Any:
         return bundle["metadata"].get(name, default)
@@ -587,6 +1208,43 @@ class BundleManifest:
             if id == item["id"]:
                 return item
 
+    @staticmethod
+    def replace_items(
+        bundle: dict, items: List[dict], now: Callable[[], str] = utcnow
+    ) -> dict:
+        """Substitui todos os itens de `bundle` por `items`.
+
+        A unicidade dos identificadores é verificada uma única vez para todo o
+        conjunto e apenas uma cópia do maço é produzida, sem que os itens
+        anteriores sejam copiados.
+        """
+        _items = []
+        _ids = set()
+        for item in items:
+            try:
+                _item = dict(item)
+                _id = _item["id"]
+            except ValueError:
+                raise ValueError(
+                    "cannot add this item " '"%s": item must be dict' % item
+                ) from None
+            except KeyError:
+                raise KeyError(
+                    "cannot add this item " '"%s": item must contain id key' % item
+                ) from None
+            if _id in _ids:
+                raise exceptions.AlreadyExists(
+                    'cannot add item "%s" in bundle: '
+                    "the item id already exists" % _id
+                )
+            _ids.add(_id)
+            _items.append(_item)
+
+        _bundle = deepcopy({k: v for k, v in bundle.items() if k != "items"})
+        _bundle["items"] = _items
+        _bundle["updated"] = now()
+        return _bundle
+
     @staticmethod
     def add_item(bundle: dict, item: dict, now: Callable[[], str] = utcnow) -> dict:
 
@@ -682,12 +1340,36 @@ class BundleManifest:
         else:
             return _components_bundle
 
+    @staticmethod
+    def is_equivalent(
+        bundle: dict, other: dict, ignore: Tuple[str] = ("updated",)
+    ) -> bool:
+        """Verifica se os maços `bundle` e `other` possuem o mesmo conteúdo,
+        desconsiderando os campos de primeiro nível listados em `ignore`.
+
+        Sequências são comparadas independentemente de seu tipo, i.e., tuplas
+        e listas com os mesmos itens são equivalentes. Isso é necessário pois
+        alguns metadados são armazenados em memória como tuplas e recuperados
+        do banco de dados como listas.
+        """
 
-class DocumentsBundle:
-    """
-    DocumentsBundle representa um conjunto de documentos agnóstico ao modelo de
-    publicação. Exemplos de publicação que são DocumentsBundle: Fascículos fechados
-    e abertos, Ahead of Print, Documentos Provisórios, Erratas e Retratações.
+        def _normalize(value):
+            if isinstance(value, dict):
+                return {k: _normalize(v) for k, v in value.items()}
+            elif isinstance(value, (list, tuple)):
+                return [_normalize(v) for v in value]
+            else:
+                return value
+
+        def _relevant(b):
+            return _normalize({k: v for k, v in b.items() if k not in ignore})
+
+        return _relevant(bundle) == _relevant(other)
+
+
+class _BundleEntity:
+    """Comportamento comum às entidades cujos manifestos são manipulados por
+    meio de `BundleManifest`, i.e., `DocumentsBundle` e `Journal`.
     """
 
     data_type = "application/json"
@@ -695,17 +1377,9 @@ class DocumentsBundle:
     def __init__(self, id: str = None, manifest: dict = None):
         assert any([id, manifest])
         self.manifest = manifest or BundleManifest.new(id)
-
-    def id(self):
-        return self.manifest.get("id", "")
-
-    def data(self):
-        return self.manifest
-
-    def data_bytes(self) -> bytes:
-        """Retorna `self.data()` codificado em utf-8.
-        """
-        return json.dumps(self.data()).encode("utf-8")
+        # metadados e componentes acumulados durante `set_metadata_many`
+        self._pending_metadata = None
+        self._pending_components = None
 
     @property
     def manifest(self):
@@ -714,6 +1388,76 @@ class DocumentsBundle:
     @manifest.setter
     def manifest(self, value: dict):
         self._manifest = value
+        self._data_bytes = None
+
+    def data_bytes(self) -> bytes:
+        """Retorna `self.data()` codificado em utf-8. O resultado é mantido
+        até que o manifesto seja alterado, de maneira que é produzido apenas uma
+        vez mesmo quando requisitado pelo armazenamento e pelo registro de
+        mudanças.
+        """
+        if self._data_bytes is None:
+            self._data_bytes = json_dumps(self._manifest)
+        return self._data_bytes
+
+    def _set_metadata(self, name: str, value: Any) -> None:
+        """Define o metadado `name`. Durante a execução de `set_metadata_many`
+        o valor é apenas acumulado para ser definido ao final, em lote.
+        """
+        if self._pending_metadata is not None:
+            self._pending_metadata[name] = value
+        else:
+            self.manifest = BundleManifest.set_metadata(self._manifest, name, value)
+
+    def _set_component(self, name: str, value: Any) -> None:
+        """Define o componente `name`, e.g., `aop`, da mesma forma que
+        `_set_metadata`.
+        """
+        if self._pending_components is not None:
+            self._pending_components[name] = value
+        else:
+            self.manifest = BundleManifest.set_component(self._manifest, name, value)
+
+    def set_metadata_many(self, metadata: Dict[str, Any]) -> bool:
+        """Define os metadados em `metadata` por meio dos respectivos
+        atributos, i.e., com as mesmas validações e normalizações, porém
+        produzindo uma única cópia do manifesto. Nenhum metadado é definido
+        caso algum valor seja inválido.
+
+        Retorna ``False`` caso nenhum metadado tenha sido modificado.
+        """
+        self._pending_metadata = {}
+        self._pending_components = {}
+        try:
+            for name, value in metadata.items():
+                setattr(self, name, value)
+            pending = self._pending_metadata
+            components = self._pending_components
+        finally:
+            self._pending_metadata = None
+            self._pending_components = None
+
+        _manifest = BundleManifest.set_metadata_many(
+            self._manifest, pending, components
+        )
+        if _manifest is self._manifest:
+            return False
+        self.manifest = _manifest
+        return True
+
+
+class DocumentsBundle(_BundleEntity):
+    """
+    DocumentsBundle representa um conjunto de documentos agnóstico ao modelo de
+    publicação. Exemplos de publicação que são DocumentsBundle: Fascículos fechados
+    e abertos, Ahead of Print, Documentos Provisórios, Erratas e Retratações.
+    """
+
+    def id(self):
+        return self.manifest.get("id", "")
+
+    def data(self):
+        return self.manifest
 
     @property
     def publication_year(self):
@@ -727,9 +1471,7 @@ class DocumentsBundle:
                 "cannot set publication_year with value "
                 f'"{_value}": the value is not valid'
             )
-        self.manifest = BundleManifest.set_metadata(
-            self._manifest, "publication_year", _value
-        )
+        self._set_metadata("publication_year", _value)
 
     @property
     def publication_months(self):
@@ -745,9 +1487,7 @@ class DocumentsBundle:
                 f'"{value}": the value is not valid'
             )
         else:
-            self.manifest = BundleManifest.set_metadata(
-                self._manifest, "publication_months", _value
-            )
+            self._set_metadata("publication_months", _value)
 
     @property
     def volume(self):
@@ -756,7 +1496,7 @@ class DocumentsBundle:
     @volume.setter
     def volume(self, value: Union[str, int]):
         _value = str(value)
-        self.manifest = BundleManifest.set_metadata(self._manifest, "volume", _value)
+        self._set_metadata("volume", _value)
 
     @property
     def pid(self):
@@ -765,7 +1505,7 @@ class DocumentsBundle:
     @pid.setter
     def pid(self, value: str):
         _value = str(value)
-        self.manifest = BundleManifest.set_metadata(self._manifest, "pid", _value)
+        self._set_metadata("pid", _value)
 
     @property
     def number(self):
@@ -774,7 +1514,7 @@ class DocumentsBundle:
     @number.setter
     def number(self, value: Union[str, int]):
         _value = str(value)
-        self.manifest = BundleManifest.set_metadata(self._manifest, "number", _value)
+        self._set_metadata("number", _value)
 
     @property
     def supplement(self):
@@ -783,9 +1523,7 @@ class DocumentsBundle:
     @supplement.setter
     def supplement(self, value: Union[str, int]):
         _value = str(value)
-        self.manifest = BundleManifest.set_metadata(
-            self._manifest, "supplement", _value
-        )
+        self._set_metadata("supplement", _value)
 
     @property
     def titles(self):
@@ -800,7 +1538,7 @@ class DocumentsBundle:
                 "cannot set titles with value "
                 '"%s": value must be list of dict' % value
             ) from None
-        self.manifest = BundleManifest.set_metadata(self._manifest, "titles", _value)
+        self._set_metadata("titles", _value)
 
     def add_document(self, document: str):
         self.manifest = BundleManifest.add_item(self._manifest, document)
@@ -811,23 +1549,20 @@ class DocumentsBundle:
     def remove_document(self, document: str):
         self.manifest = BundleManifest.remove_item(self._manifest, document)
 
+    def replace_documents(self, documents: List[dict]):
+        self.manifest = BundleManifest.replace_items(self._manifest, documents)
+
     @property
     def documents(self):
         return self.manifest["items"]
 
 
-class Journal:
+class Journal(_BundleEntity):
     """
     Journal representa um periodico cientifico que contem um conjunto de documentos
     DocumentsBundle.
     """
 
-    data_type = "application/json"
-
-    def __init__(self, id: str = None, manifest: dict = None):
-        assert any([id, manifest])
-        self.manifest = manifest or BundleManifest.new(id)
-
     def id(self):
         return self.manifest.get("id", "")
 
@@ -837,23 +1572,10 @@ class Journal:
     def updated(self):
         return self.manifest.get("updated", "")
 
-    @property
-    def manifest(self):
-        return deepcopy(self._manifest)
-
-    @manifest.setter
-    def manifest(self, value: dict):
-        self._manifest = value
-
     def data(self):
         """Retorna o manifesto completo de um Journal"""
         return self.manifest
 
-    def data_bytes(self) -> bytes:
-        """Retorna `self.data()` codificado em utf-8.
-        """
-        return json.dumps(self.data()).encode("utf-8")
-
     @property
     def mission(self):
         return BundleManifest.get_metadata(self.manifest, "mission", [])
@@ -867,7 +1589,7 @@ class Journal:
                 "cannot set mission with value "
                 '"%s": value must be list of dict' % value
             ) from None
-        self.manifest = BundleManifest.set_metadata(self._manifest, "mission", value)
+        self._set_metadata("mission", value)
 
     @property
     def title(self):
@@ -876,7 +1598,7 @@ class Journal:
     @title.setter
     def title(self, value: str):
         _value = str(value)
-        self.manifest = BundleManifest.set_metadata(self._manifest, "title", _value)
+        self._set_metadata("title", _value)
 
     @property
     def title_iso(self):
@@ -885,7 +1607,7 @@ class Journal:
     @title_iso.setter
     def title_iso(self, value: str):
         _value = str(value)
-        self.manifest = BundleManifest.set_metadata(self._manifest, "title_iso", _value)
+        self._set_metadata("title_iso", _value)
 
     @property
     def short_title(self):
@@ -894,9 +1616,7 @@ class Journal:
     @short_title.setter
     def short_title(self, value: str):
         _value = str(value)
-        self.manifest = BundleManifest.set_metadata(
-            self._manifest, "short_title", _value
-        )
+        self._set_metadata("short_title", _value)
 
     @property
     def acronym(self):
@@ -905,7 +1625,7 @@ class Journal:
     @acronym.setter
     def acronym(self, value: str):
         _value = str(value)
-        self.manifest = BundleManifest.set_metadata(self._manifest, "acronym", _value)
+        self._set_metadata("acronym", _value)
 
     @property
     def scielo_issn(self):
@@ -914,9 +1634,7 @@ class Journal:
     @scielo_issn.setter
     def scielo_issn(self, value: str):
         _value = str(value)
-        self.manifest = BundleManifest.set_metadata(
-            self._manifest, "scielo_issn", _value
-        )
+        self._set_metadata("scielo_issn", _value)
 
     @property
     def print_issn(self):
@@ -925,9 +1643,7 @@ class Journal:
     @print_issn.setter
     def print_issn(self, value: str):
         _value = str(value)
-        self.manifest = BundleManifest.set_metadata(
-            self._manifest, "print_issn", _value
-        )
+        self._set_metadata("print_issn", _value)
 
     @property
     def electronic_issn(self):
@@ -936,9 +1652,7 @@ class Journal:
     @electronic_issn.setter
     def electronic_issn(self, value: str):
         _value = str(value)
-        self.manifest = BundleManifest.set_metadata(
-            self._manifest, "electronic_issn", _value
-        )
+        self._set_metadata("electronic_issn", _value)
 
     @property
     def status_history(self):
@@ -953,9 +1667,7 @@ class Journal:
                 "cannot set status_history with value "
                 '"%s": value must be a list of dict' % repr(value)
             ) from None
-        self.manifest = BundleManifest.set_metadata(
-            self._manifest, "status_history", _value
-        )
+        self._set_metadata("status_history", _value)
 
     @property
     def subject_areas(self):
@@ -976,9 +1688,7 @@ class Journal:
                 "cannot set subject_areas with value %s: " % repr(value)
                 + "%s are not valid" % repr(invalid)
             )
-        self.manifest = BundleManifest.set_metadata(
-            self._manifest, "subject_areas", value
-        )
+        self._set_metadata("subject_areas", value)
 
     @property
     def sponsors(self) -> Tuple[dict]:
@@ -991,7 +1701,7 @@ class Journal:
         except TypeError:
             raise TypeError("cannot set sponsors this type %s" % repr(value)) from None
 
-        self.manifest = BundleManifest.set_metadata(self._manifest, "sponsors", value)
+        self._set_metadata("sponsors", value)
 
     @property
     def metrics(self):
@@ -1005,7 +1715,7 @@ class Journal:
             raise TypeError(
                 "cannot set metrics with value " '"%s": value must be dict' % value
             ) from None
-        self.manifest = BundleManifest.set_metadata(self._manifest, "metrics", value)
+        self._set_metadata("metrics", value)
 
     @property
     def subject_categories(self):
@@ -1021,9 +1731,7 @@ class Journal:
                 '"%s": value must be list like object' % value
             ) from None
 
-        self.manifest = BundleManifest.set_metadata(
-            self._manifest, "subject_categories", list(value)
-        )
+        self._set_metadata("subject_categories", list(value))
 
     @property
     def institution_responsible_for(self):
@@ -1041,9 +1749,7 @@ class Journal:
                 '"%s": value must be tuple' % repr(value)
             ) from None
 
-        self.manifest = BundleManifest.set_metadata(
-            self.manifest, "institution_responsible_for", value
-        )
+        self._set_metadata("institution_responsible_for", value)
 
     @property
     def online_submission_url(self):
@@ -1052,9 +1758,7 @@ class Journal:
     @online_submission_url.setter
     def online_submission_url(self, value: str):
         _value = str(value)
-        self.manifest = BundleManifest.set_metadata(
-            self._manifest, "online_submission_url", _value
-        )
+        self._set_metadata("online_submission_url", _value)
 
     @property
     def next_journal(self):
@@ -1069,9 +1773,7 @@ class Journal:
                 "cannot set next_journal with value "
                 '"%s": value must be dict' % repr(value)
             ) from None
-        self.manifest = BundleManifest.set_metadata(
-            self._manifest, "next_journal", value
-        )
+        self._set_metadata("next_journal", value)
 
     @property
     def previous_journal(self):
@@ -1086,9 +1788,7 @@ class Journal:
                 "cannot set previous_journal with value "
                 '"%s": value must be dict' % repr(value)
             ) from None
-        self.manifest = BundleManifest.set_metadata(
-            self._manifest, "previous_journal", value
-        )
+        self._set_metadata("previous_journal", value)
 
     @property
     def contact(self) -> dict:
@@ -1105,7 +1805,7 @@ class Journal:
                 ": value must be dict" % repr(value)
             ) from None
 
-        self.manifest = BundleManifest.set_metadata(self._manifest, "contact", value)
+        self._set_metadata("contact", value)
 
     def add_issue(self, issue: str) -> None:
         self.manifest = BundleManifest.add_item(self._manifest, issue)
@@ -1116,6 +1816,9 @@ class Journal:
     def remove_issue(self, issue: str) -> None:
         self.manifest = BundleManifest.remove_item(self._manifest, issue)
 
+    def replace_issues(self, issues: List[dict]) -> None:
+        self.manifest = BundleManifest.replace_items(self._manifest, issues)
+
     @property
     def issues(self) -> List[str]:
         return self.manifest["items"]
@@ -1126,9 +1829,7 @@ class Journal:
 
     @provisional.setter
     def provisional(self, provisional: str) -> None:
-        self.manifest = BundleManifest.set_component(
-            self._manifest, "provisional", str(provisional)
-        )
+        self._set_component("provisional", str(provisional))
 
     @property
     def ahead_of_print_bundle(self) -> str:
@@ -1136,7 +1837,7 @@ class Journal:
 
     @ahead_of_print_bundle.setter
     def ahead_of_print_bundle(self, value: str) -> None:
-        self.manifest = BundleManifest.set_component(self._manifest, "aop", str(value))
+        self._set_component("aop", str(value))
 
     def remove_ahead_of_print_bundle(self) -> None:
         self.manifest = BundleManifest.remove_component(self._manifest, "aop")
@@ -5,6 +5,17 @@ class RetryableError(Exception):
     """
 
 
+class CircuitOpenError(RetryableError):
+    """Erro que representa a recusa imediata de uma requisição ao object store
+    enquanto o circuito associado ao host encontra-se aberto. O atributo
+    `retry_after` informa em quantos segundos uma nova tentativa será aceita.
+    """
+
+    def __init__(self, message, retry_after=0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class NonRetryableError(Exception):
     """Erro do qual não pode ser recuperado sem modificar o estado dos dados 
     na parte cliente, e.g., recurso solicitado não exite, URI inválida etc.
@@ -33,3 +44,9 @@ class DeletedVersion(NonRetryableError):
     """Erro que representa a tentativa de recuperar o XML de um documento
     em uma versão que foi excluída.
     """
+
+
+class DeadlineExceeded(Exception):
+    """Erro que representa o esgotamento do prazo para o atendimento de uma
+    requisição, antes ou durante o acesso ao object store ou ao banco de dados.
+    """
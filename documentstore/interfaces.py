@@ -22,6 +22,85 @@ class DataStore(abc.ABC):
     def fetch(self, id: str):
         pass
 
+    @abc.abstractmethod
+    def fetch_raw(self, id: str) -> tuple:
+        """Recupera os dados, serializados em JSON, tal como estão armazenados.
+        Retorna o par ``(<bytes>, <revisão>)``, onde revisão é um identificador
+        opaco que muda sempre que os dados mudam e que pode ser usado, e.g.,
+        como ETag.
+        """
+        pass
+
+    @abc.abstractmethod
+    def fetch_validators(self, id: str) -> tuple:
+        """Recupera, sem recuperar os dados, o par ``(<revisão>, <timestamp>)``
+        onde revisão é a mesma de `fetch_raw` e timestamp é o da modificação
+        mais recente dos dados. Destina-se às requisições condicionais.
+        """
+        pass
+
+    @abc.abstractmethod
+    def fetch_many(self, ids: list) -> dict:
+        """Recupera de uma só vez os dados identificados em `ids`. Retorna um
+        mapa entre os identificadores e as instâncias recuperadas. Os
+        identificadores desconhecidos são omitidos do mapa.
+        """
+        pass
+
+    @abc.abstractmethod
+    def write_many(self, operations: list) -> list:
+        """Executa em lote as operações em `operations`, na forma de lista de
+        pares ``(<"add" ou "update">, <data>)``. Retorna lista de mesmo
+        tamanho e ordem de `operations` contendo ``None`` para as operações
+        bem sucedidas ou a instância da exceção que impediu sua execução.
+        """
+        pass
+
+
+class DocumentDataStore(DataStore):
+    """Interface manipulação de dados de documentos.
+    """
+
+    @abc.abstractmethod
+    def fetch_latest_version(self, id: str) -> dict:
+        """Recupera a visão da versão mais recente do documento identificado
+        por `id`, com os ativos digitais e as manifestações já resolvidos.
+        """
+        pass
+
+
+class BundleDataStore(DataStore):
+    """Interface manipulação de dados de entidades que agregam itens, como
+    `DocumentsBundle` e `Journal`. As operações sobre os itens são atômicas e
+    não exigem a recuperação prévia da entidade.
+    """
+
+    @abc.abstractmethod
+    def add_item(self, id: str, item: dict, index: int = None):
+        """Adiciona `item` aos itens da entidade identificada por `id`, na
+        posição `index` ou ao final caso `index` não seja informado. Retorna a
+        instância atualizada.
+        """
+        pass
+
+    @abc.abstractmethod
+    def remove_item(self, id: str, item_id: str):
+        """Remove o item identificado por `item_id` dos itens da entidade
+        identificada por `id`. Retorna a instância atualizada.
+        """
+        pass
+
+    @abc.abstractmethod
+    def fetch_slice(
+        self, id: str, offset: int, limit: int, fields: list = None
+    ) -> dict:
+        """Recupera o manifesto da entidade identificada por `id` contendo
+        apenas os `limit` itens a partir da posição `offset`. Caso `fields`
+        seja informado, apenas os campos de primeiro nível nele listados são
+        recuperados, e.g., ``["id", "metadata"]`` descarta os itens.
+        """
+        pass
+
 
 class ChangesDataStore(abc.ABC):
     """Interface manipulação de dados de mudanças.
@@ -31,6 +110,10 @@ class ChangesDataStore(abc.ABC):
     def add(self, data: dict) -> None:
         pass
 
+    @abc.abstractmethod
+    def add_many(self, data: list) -> None:
+        pass
+
     @abc.abstractmethod
     def filter(self, since: str = "", limit: int = 500) -> list:
         pass
@@ -53,15 +136,15 @@ class Session(abc.ABC):
 
     @property
     @abc.abstractmethod
-    def documents(self) -> DataStore:
-        """Ponto de acesso à instância de ``DataStore``.
+    def documents(self) -> DocumentDataStore:
+        """Ponto de acesso à instância de ``DocumentDataStore``.
         """
         pass
 
     @property
     @abc.abstractmethod
-    def documents_bundles(self) -> DataStore:
-        """Ponto de acesso à instância de ``DataStore``.
+    def documents_bundles(self) -> BundleDataStore:
+        """Ponto de acesso à instância de ``BundleDataStore``.
         """
         pass
 
@@ -0,0 +1,205 @@
+"""Tween de controle de admissão que limita o número de requisições em
+processamento simultâneo por classe de rota.
+
+As rotas que acessam o object store, e que podem levar segundos para serem
+atendidas, compõem uma classe à parte das rotas que acessam apenas o MongoDB,
+divididas entre leitura e escrita. Assim, as requisições lentas de uma classe
+nunca ocupam as vagas destinadas às demais.
+
+Quando o limite de uma classe é atingido as requisições aguardam, numa fila
+de tamanho limitado e por tempo limitado, a liberação de uma vaga. As
+requisições que não podem ser admitidas são respondidas imediatamente com o
+status 503 e o cabeçalho `Retry-After`, de maneira que a lentidão de uma
+dependência, e.g., o object store, não ocupe todas as threads do servidor. As
+vagas das respostas transmitidas à medida que são produzidas são mantidas até
+o fim da transmissão.
+"""
+import threading
+from time import time
+
+from pyramid.httpexceptions import HTTPServiceUnavailable
+from pyramid.interfaces import IRoutesMapper
+from pyramid.tweens import EXCVIEW, INGRESS
+from prometheus_client import Counter, Gauge, Histogram
+
+ADMISSION_REJECTED = Counter(
+    "kernel_restfulapi_admission_rejected_total",
+    "Total number of HTTP requests rejected by admission control",
+    ["route_class", "reason"],
+)
+ADMISSION_QUEUED = Gauge(
+    "kernel_restfulapi_admission_queued",
+    "Current number of HTTP requests waiting to be admitted",
+    ["route_class"],
+)
+ADMISSION_QUEUE_SECONDS = Histogram(
+    "kernel_restfulapi_admission_queue_seconds",
+    "Time spent by HTTP requests waiting to be admitted",
+    ["route_class"],
+)
+
+ROUTE_CLASSES = ("object_store", "read", "write")
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# rotas, e respectivos métodos, cujas views acessam o object store
+OBJECT_STORE_ROUTES = {
+    "documents": ("GET", "PUT"),
+    "document_version": ("GET",),
+    "documents_bulk": ("GET", "POST"),
+    "assets": ("PUT",),
+    "diff": ("GET",),
+    "front": ("GET",),
+}
+
+
+class ConcurrencyLimiter:
+    """Limita em `max_inflight` o número de execuções simultâneas. Até
+    `max_queued` execuções aguardam, por no máximo `timeout` segundos, a
+    liberação de uma vaga. Valores de `max_inflight` menores que 1 desativam
+    o limite.
+    """
+
+    def __init__(self, max_inflight: int, max_queued: int, timeout: float):
+        self.max_inflight = max_inflight
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.inflight = 0
+        self.queued = 0
+        self._cond = threading.Condition()
+
+    def _has_room(self):
+        return self.inflight < self.max_inflight
+
+    def acquire(self) -> str:
+        """Tenta obter uma vaga. Retorna ``None`` em caso de sucesso ou o
+        motivo da recusa: ``"queue_full"`` ou ``"timeout"``.
+        """
+        with self._cond:
+            if self.max_inflight < 1:
+                self.inflight += 1
+                return None
+            # as requisições que chegam enquanto há outras na fila entram no
+            # final da fila, mesmo que haja vaga
+            if self._has_room() and not self.queued:
+                self.inflight += 1
+                return None
+            if self.queued >= self.max_queued:
+                return "queue_full"
+
+            self.queued += 1
+            try:
+                if not self._cond.wait_for(self._has_room, self.timeout):
+                    return "timeout"
+            finally:
+                self.queued -= 1
+            self.inflight += 1
+            return None
+
+    def release(self) -> None:
+        with self._cond:
+            self.inflight -= 1
+            self._cond.notify()
+
+
+class ReleasingAppIter:
+    """Envolve o corpo das respostas transmitidas à medida que são produzidas,
+    invocando `release` somente quando o servidor encerra a transmissão por
+    meio de `close`.
+    """
+
+    def __init__(self, app_iter, release):
+        self.app_iter = app_iter
+        self._release = release
+        self._released = False
+
+    def __iter__(self):
+        return iter(self.app_iter)
+
+    def close(self) -> None:
+        try:
+            if hasattr(self.app_iter, "close"):
+                self.app_iter.close()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+def route_class(request, mapper=None) -> str:
+    """Classifica `request` conforme a rota, obtida por meio de `mapper`, e o
+    método HTTP.
+    """
+    if mapper is not None:
+        route = mapper(request)["route"]
+        if route is not None and request.method in OBJECT_STORE_ROUTES.get(
+            route.name, ()
+        ):
+            return "object_store"
+    return "read" if request.method in READ_METHODS else "write"
+
+
+def get_limiters(settings) -> dict:
+    return {
+        name: ConcurrencyLimiter(
+            settings["kernel.app.admission.%s.max_inflight" % name],
+            settings["kernel.app.admission.max_queued"],
+            settings["kernel.app.admission.queue_timeout"],
+        )
+        for name in ROUTE_CLASSES
+    }
+
+
+def tween_factory(handler, registry):
+    settings = registry.settings
+    retry_after = settings["kernel.app.admission.retry_after"]
+    limiters = get_limiters(settings)
+    mapper = registry.queryUtility(IRoutesMapper)
+    for name, limiter in limiters.items():
+        ADMISSION_QUEUED.labels(name).set_function(lambda l=limiter: l.queued)
+
+    def tween(request):
+        name = route_class(request, mapper)
+        limiter = limiters[name]
+        start = time()
+        rejection = limiter.acquire()
+        ADMISSION_QUEUE_SECONDS.labels(name).observe(time() - start)
+        if rejection is not None:
+            ADMISSION_REJECTED.labels(name, rejection).inc()
+            response = HTTPServiceUnavailable(
+                "Too many requests are being processed. Try again later."
+            )
+            response.retry_after = retry_after
+            return response
+
+        try:
+            response = handler(request)
+        except BaseException:
+            limiter.release()
+            raise
+
+        # o corpo das respostas transmitidas é produzido após o retorno do
+        # tween, de maneira que a vaga é mantida até o fim da transmissão
+        if isinstance(response.app_iter, (list, tuple)):
+            limiter.release()
+        else:
+            content_length = response.content_length
+            response.app_iter = ReleasingAppIter(response.app_iter, limiter.release)
+            response.content_length = content_length
+        return response
+
+    return tween
+
+
+def includeme(config):
+    settings = config.registry.settings
+    if not settings["kernel.app.admission.enabled"]:
+        return None
+
+    # sob o tween de métricas, caso registrado, de maneira que as requisições
+    # recusadas também sejam medidas, e acima do tween de compressão, de
+    # maneira que as requisições aguardem na fila antes de qualquer trabalho
+    config.add_tween(
+        "documentstore.pyramid_admission.tween_factory",
+        under=("documentstore.pyramid_prometheus.tween_factory", INGRESS),
+        over=("documentstore.pyramid_compression.tween_factory", EXCVIEW),
+    )
@@ -0,0 +1,155 @@
+"""Tween que comprime as respostas HTTP conforme a codificação negociada por
+meio do cabeçalho `Accept-Encoding` da requisição.
+
+A codificação `gzip` é sempre suportada, enquanto `br` e `zstd` dependem da
+instalação dos pacotes `brotli` e `zstandard`, respectivamente. As respostas
+que já possuem o cabeçalho `Content-Encoding`, e.g., produzidas a partir de
+dados mantidos comprimidos em cache, são transmitidas sem alterações.
+"""
+import zlib
+
+from pyramid.tweens import EXCVIEW, INGRESS
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "text/xml",
+    "text/plain",
+)
+
+
+def _gzip_compressor(level):
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+def gzip_encoder(level):
+    def _encode(body):
+        compressor = _gzip_compressor(level)
+        return compressor.compress(body) + compressor.flush()
+
+    return _encode
+
+
+def brotli_encoder(level):
+    # o nível de compressão do brotli varia de 0 a 11
+    return lambda body: brotli.compress(body, quality=min(level, 11))
+
+
+def zstd_encoder(level):
+    return zstandard.ZstdCompressor(level=level).compress
+
+
+def get_encoders(level: int) -> dict:
+    """Produz o mapa entre as codificações suportadas e as respectivas funções
+    de compressão, em ordem de preferência.
+    """
+    encoders = {}
+    if zstandard is not None:
+        encoders["zstd"] = zstd_encoder(level)
+    if brotli is not None:
+        encoders["br"] = brotli_encoder(level)
+    encoders["gzip"] = gzip_encoder(level)
+    return encoders
+
+
+def negotiate(request, encodings) -> str:
+    """Seleciona, dentre `encodings`, a codificação de maior preferência do
+    cliente. Retorna ``None`` caso nenhuma seja aceita.
+    """
+    if "Accept-Encoding" not in request.headers:
+        return None
+    offers = request.accept_encoding.acceptable_offers(list(encodings))
+    return offers[0][0] if offers else None
+
+
+def is_compressible(request, response, min_size: int) -> bool:
+    if request.method == "HEAD" or response.status_code != 200:
+        return False
+    if response.content_type not in COMPRESSIBLE_TYPES:
+        return False
+    if response.content_encoding:
+        return False
+    # respostas transmitidas à medida que são produzidas não possuem
+    # `Content-Length` e são sempre comprimidas
+    return response.content_length is None or response.content_length >= min_size
+
+
+def _gzip_app_iter(app_iter, level):
+    compressor = _gzip_compressor(level)
+    try:
+        for chunk in app_iter:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+    finally:
+        if hasattr(app_iter, "close"):
+            app_iter.close()
+
+
+def compress(response, encoding, encoders, level) -> None:
+    """Comprime o corpo de `response` conforme `encoding`. As respostas sem
+    `Content-Length` são comprimidas à medida que são produzidas, por meio de
+    `gzip`. A ETag é convertida em fraca, de maneira que continua válida para
+    as requisições condicionais independentemente da codificação.
+    """
+    if response.content_length is None:
+        response.app_iter = _gzip_app_iter(response.app_iter, level)
+        response.content_length = None
+        encoding = "gzip"
+    else:
+        response.body = encoders[encoding](response.body)
+    response.content_encoding = encoding
+    if response.etag_strong:
+        response.etag = (response.etag_strong, False)
+
+
+def tween_factory(handler, registry):
+    settings = registry.settings
+    min_size = settings["kernel.app.compression.min_size"]
+    level = settings["kernel.app.compression.level"]
+    encoders = get_encoders(level)
+
+    def tween(request):
+        response = handler(request)
+        if not is_compressible(request, response, min_size):
+            return response
+
+        vary = tuple(response.vary or ())
+        if "Accept-Encoding" not in vary:
+            response.vary = vary + ("Accept-Encoding",)
+        if response.content_length is None:
+            encoding = negotiate(request, ["gzip"])
+        else:
+            encoding = negotiate(request, encoders)
+        if encoding:
+            compress(response, encoding, encoders, level)
+        return response
+
+    return tween
+
+
+def includeme(config):
+    settings = config.registry.settings
+    if not settings["kernel.app.compression.enabled"]:
+        return None
+
+    # sob o tween de métricas, caso registrado, de maneira que o tamanho das
+    # respostas seja medido após a compressão
+    config.add_tween(
+        "documentstore.pyramid_compression.tween_factory",
+        under=("documentstore.pyramid_prometheus.tween_factory", INGRESS),
+        over=EXCVIEW,
+    )
@@ -0,0 +1,66 @@
+"""Tween que define o prazo para o atendimento de cada requisição.
+
+O prazo é definido conforme a classe da rota, a mesma usada no controle de
+admissão, e pode ser reduzido pelo cliente por meio do cabeçalho
+`X-Request-Timeout`, em segundos. Durante o atendimento da requisição, o tempo
+restante limita os timeouts e as novas tentativas de acesso ao object store e
+é informado ao MongoDB por meio de `maxTimeMS`. Esgotado o prazo, a requisição
+é respondida com o status 504.
+"""
+from pyramid.interfaces import IRoutesMapper
+from pyramid.tweens import EXCVIEW, INGRESS
+
+from . import domain
+from .pyramid_admission import ROUTE_CLASSES, route_class
+
+TIMEOUT_HEADER = "X-Request-Timeout"
+
+
+def requested_timeout(request) -> float:
+    """Obtém o prazo solicitado pelo cliente. Valores inválidos são
+    ignorados.
+    """
+    try:
+        timeout = float(request.headers[TIMEOUT_HEADER])
+    except (KeyError, ValueError):
+        return None
+    return timeout if timeout > 0 else None
+
+
+def request_timeout(configured: float, requested: float) -> float:
+    """Seleciona o menor dentre os prazos definidos. Prazos configurados com
+    valor 0 não impõem limite.
+    """
+    timeouts = [t for t in (configured, requested) if t and t > 0]
+    return min(timeouts) if timeouts else None
+
+
+def tween_factory(handler, registry):
+    settings = registry.settings
+    timeouts = {
+        name: settings["kernel.app.deadline.%s" % name] for name in ROUTE_CLASSES
+    }
+    mapper = registry.queryUtility(IRoutesMapper)
+
+    def tween(request):
+        timeout = request_timeout(
+            timeouts[route_class(request, mapper)], requested_timeout(request)
+        )
+        with domain.deadline(timeout):
+            return handler(request)
+
+    return tween
+
+
+def includeme(config):
+    # acima do tween de controle de admissão, de maneira que o tempo de espera
+    # na fila também seja descontado do prazo
+    config.add_tween(
+        "documentstore.pyramid_deadline.tween_factory",
+        under=("documentstore.pyramid_prometheus.tween_factory", INGRESS),
+        over=(
+            "documentstore.pyramid_admission.tween_factory",
+            "documentstore.pyramid_compression.tween_factory",
+            EXCVIEW,
+        ),
+    )
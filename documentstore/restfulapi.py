@@ -1,28 +1,39 @@
 import logging
 import os
 import base64
+import math
+import functools
 import pkg_resources
+from datetime import datetime, timezone
 
 from pyramid.settings import asbool
 from pyramid.config import Configurator
+from pyramid.response import Response
 from pyramid.httpexceptions import (
     HTTPNotFound,
+    HTTPNotModified,
     HTTPNoContent,
     HTTPCreated,
     HTTPBadRequest,
     HTTPGone,
     HTTPUnprocessableEntity,
+    HTTPServiceUnavailable,
+    HTTPGatewayTimeout,
 )
+from webob.etag import ETagMatcher
+from webob.datetime_utils import parse_date
 from cornice import Service
-from cornice.validators import colander_body_validator
+from cornice.validators import colander_body_validator, colander_validator
 from cornice.service import get_services
 import colander
-from slugify import slugify
+from pymongo.errors import ExecutionTimeout
 from cornice_swagger import CorniceSwagger
+from cornice_swagger.converters.schema import TypeConverter
 import sentry_sdk
 from sentry_sdk.integrations.pyramid import PyramidIntegration
 
 from . import services
+from . import domain
 from . import adapters
 from . import exceptions
 
@@ -40,6 +51,18 @@ documents = Service(
     description="Get document at its latest version.",
 )
 
+document_version = Service(
+    name="document_version",
+    path="/documents/{document_id}/versions/{timestamp}",
+    description="Get document at the version identified by its timestamp.",
+)
+
+documents_bulk = Service(
+    name="documents_bulk",
+    path="/documents",
+    description="Register or retrieve documents in bulk.",
+)
+
 manifest = Service(
     name="manifest",
     path="/documents/{document_id}/manifest",
@@ -76,10 +99,16 @@ bundles = Service(
     description="Get documents bundle data.",
 )
 
+bundles_bulk = Service(
+    name="bundles_bulk",
+    path="/bundles",
+    description="Get documents bundles data in bulk.",
+)
+
 bundles_documents = Service(
     name="bundles_documents",
     path="/bundles/{bundle_id}/documents",
-    description="Update documents of documents bundle.",
+    description="Retrieve and update documents of documents bundle.",
 )
 
 changes = Service(
@@ -96,10 +125,16 @@ journals = Service(
     description="Register and retrieve journals' endpoint",
 )
 
+journals_bulk = Service(
+    name="journals_bulk",
+    path="/journals",
+    description="Retrieve journals in bulk.",
+)
+
 journal_issues = Service(
     name="journal_issues",
     path="/journals/{journal_id}/issues",
-    description="Issue addition and insertion to journal.",
+    description="Issue retrieval, addition and insertion to journal.",
 )
 
 journals_aop = Service(
@@ -136,6 +171,91 @@ class RegisterDocumentSchema(colander.MappingSchema):
     assets = Assets()
 
 
+class QueryDocumentsSchema(colander.MappingSchema):
+    """Representa os parâmetros de querystring da obtenção de documentos em
+    lote.
+    """
+
+    ids = colander.SchemaNode(colander.String())
+    when = colander.SchemaNode(colander.String(), missing=colander.drop)
+
+
+class DocumentsSchema(colander.MappingSchema):
+    """Representa o schema de dados da obtenção de documentos em lote.
+    """
+
+    data = colander.SchemaNode(colander.String(), missing=colander.drop)
+    querystring = QueryDocumentsSchema()
+
+
+class QueryIdsSchema(colander.MappingSchema):
+    """Representa os parâmetros de querystring da obtenção de entidades em
+    lote.
+    """
+
+    ids = colander.SchemaNode(colander.String())
+
+
+class BulkFetchSchema(colander.MappingSchema):
+    """Representa o schema de dados da obtenção de entidades em lote.
+    """
+
+    data = colander.SchemaNode(colander.String(), missing=colander.drop)
+    querystring = QueryIdsSchema()
+
+
+class BulkRegisterDocumentItem(RegisterDocumentSchema):
+    """Representa um documento no schema de dados para registro em lote.
+    """
+
+    id = colander.SchemaNode(colander.String())
+
+
+class BulkRegisterDocumentsSchema(colander.MappingSchema):
+    """Representa o schema de dados para registro de documentos em lote. O
+    corpo da requisição é a lista de documentos, validada por meio de
+    `colander_validator`, já que `colander_body_validator` aceita apenas
+    schemas do tipo `colander.MappingSchema` nas versões mais recentes do
+    Cornice.
+    """
+
+    @colander.instantiate()
+    class body(colander.SequenceSchema):
+        document = BulkRegisterDocumentItem()
+
+
+class BulkRegisterDocumentsResultSchema(colander.MappingSchema):
+    """Representa o resultado do registro de documentos em lote.
+    """
+
+    @colander.instantiate()
+    class results(colander.SequenceSchema):
+        @colander.instantiate()
+        class result(colander.MappingSchema):
+            id = colander.SchemaNode(colander.String())
+            status = colander.SchemaNode(colander.Int())
+            message = colander.SchemaNode(colander.String(), missing=colander.drop)
+
+
+class QuerySliceSchema(colander.MappingSchema):
+    """Representa os parâmetros de querystring da obtenção paginada dos itens
+    de bundles e periódicos.
+    """
+
+    offset = colander.SchemaNode(colander.Int(), missing=colander.drop)
+    limit = colander.SchemaNode(colander.Int(), missing=colander.drop)
+    fields = colander.SchemaNode(colander.String(), missing=colander.drop)
+
+
+class SliceSchema(colander.MappingSchema):
+    """Representa o schema de dados da obtenção paginada dos itens de bundles e
+    periódicos.
+    """
+
+    data = colander.SchemaNode(colander.String(), missing=colander.drop)
+    querystring = QuerySliceSchema()
+
+
 class QueryDiffDocumentSchema(colander.MappingSchema):
     """Representa os parâmetros de querystring do schema DiffDocument.
     """
@@ -405,8 +525,121 @@ def fetch_document_data(request):
     apontamentos para seus ativos digitais contextualizados de acordo com a
     versão do documento. Produzirá uma resposta com o código HTTP 404 caso o
     documento solicitado não seja conhecido pela aplicação.
+
+    Produzirá uma resposta com o código HTTP 304, sem obter o XML, caso os
+    validadores da requisição correspondam aos do manifesto do documento.
+
+    Caso o argumento `when` se refira a uma versão que não pode mais ser
+    alterada, a resposta poderá ser mantida indefinidamente em cache e o
+    cabeçalho `Content-Location` informará a URL canônica da versão.
+
+    As requisições HEAD são respondidas sem obter o XML, conforme
+    `_document_head`.
     """
     when = request.GET.get("when", None)
+    not_modified = _document_not_modified(request)
+    if not_modified is not None:
+        if when:
+            _set_immutable_cache_control(not_modified, when)
+        return not_modified
+    if when:
+        return _fetch_document_version(request, when)
+    elif request.method == "HEAD":
+        return _document_head(request)
+    else:
+        return _fetch_document_data(request)
+
+
+def _document_head(request, size=None):
+    """Produz a resposta à requisição HEAD ao XML do documento a partir do
+    manifesto, i.e., sem obter o XML do object store. O cabeçalho
+    `Content-Length` é informado apenas quando o tamanho do XML é conhecido
+    por ter sido produzido anteriormente.
+    """
+    if size is None:
+        try:
+            size = request.services["fetch_document_data_size"](
+                id=request.matchdict["document_id"]
+            )
+        except (exceptions.DoesNotExist, ValueError) as exc:
+            raise HTTPNotFound(exc)
+        except exceptions.DeletedVersion as exc:
+            raise HTTPGone(exc)
+    response = request.response
+    response.content_type = "text/xml"
+    response.content_length = size
+    return response
+
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _set_immutable_cache_control(response, when):
+    """Define o cabeçalho `Cache-Control` de `response`, e.g., com o código
+    HTTP 304, caso as versões no momento `when` não possam mais ser alteradas.
+    A verificação dispensa a obtenção do manifesto do documento.
+    """
+    try:
+        immutable = domain.Document.is_immutable_at(when)
+    except ValueError:
+        immutable = False
+    if immutable:
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+
+
+def _fetch_document_version(request, when):
+    """Obtém o XML, ou apenas o seu tamanho nas requisições HEAD, da versão do
+    documento no momento `when` por meio de uma única leitura do documento,
+    que também informa se a versão não pode mais ser alterada. Nesse caso, os
+    cabeçalhos `Cache-Control` e `Content-Location` da resposta são definidos.
+    """
+    try:
+        result, timestamp = request.services["fetch_document_version"](
+            id=request.matchdict["document_id"],
+            version_at=when,
+            size_only=request.method == "HEAD",
+        )
+    except (exceptions.DoesNotExist, ValueError) as exc:
+        raise HTTPNotFound(exc)
+    except exceptions.DeletedVersion as exc:
+        raise HTTPGone(exc)
+    if timestamp:
+        request.response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        request.response.content_location = request.route_path(
+            "document_version",
+            document_id=request.matchdict["document_id"],
+            timestamp=timestamp,
+        )
+    if request.method == "HEAD":
+        return _document_head(request, size=result)
+    return result
+
+
+@document_version.get(
+    schema=DocumentSchema(),
+    response_schemas={
+        "200": DocumentSchema(description="Obtém o documento na versão"),
+        "404": DocumentSchema(description="Documento ou versão não encontrado"),
+    },
+    accept="text/xml",
+    renderer="xml",
+)
+def fetch_document_version(request):
+    """Obtém o conteúdo do documento representado em XML na versão vigente no
+    momento `timestamp`, da mesma forma que o argumento `when` de
+    `fetch_document_data`. Trata-se da URL canônica das versões que não podem
+    mais ser alteradas, cujas respostas podem ser mantidas indefinidamente em
+    cache.
+    """
+    timestamp = request.matchdict["timestamp"]
+    not_modified = _document_not_modified(request)
+    if not_modified is not None:
+        _set_immutable_cache_control(not_modified, timestamp)
+        return not_modified
+    return _fetch_document_version(request, timestamp)
+
+
+def _fetch_document_data(request, when=None):
     if when:
         version = {"version_at": when}
     else:
@@ -467,6 +700,257 @@ def put_document(request):
         return HTTPCreated("document created successfully")
 
 
+BULK_MAX_IDS = 1000
+
+
+def _ids_from_querystring(request):
+    """Obtém a lista de identificadores separados por vírgulas no argumento
+    `ids` da querystring. Produzirá uma resposta com o código HTTP 400 caso
+    nenhum identificador seja informado ou caso sejam informados mais que
+    `kernel.app.bulk.max_ids` identificadores.
+    """
+    ids = [id for id in request.GET.get("ids", "").split(",") if id]
+    if not ids:
+        raise HTTPBadRequest("cannot fetch data: missing attribute ids")
+    max_ids = (request.registry.settings or {}).get(
+        "kernel.app.bulk.max_ids", BULK_MAX_IDS
+    )
+    if max_ids > 0 and len(ids) > max_ids:
+        raise HTTPBadRequest(
+            "cannot fetch data: ids must not have more than %s items" % max_ids
+        )
+    return ids
+
+
+def _bulk_json_response(results):
+    """Produz uma resposta JSON, transmitida à medida que é serializada, na
+    forma ``{"results": [...], "missing": [...]}``, a partir da lista de pares
+    ``(<id>, <dados>)`` em `results`. Os identificadores cujos dados são
+    ``None`` são listados em `missing`.
+    """
+
+    def _chunks():
+        missing = []
+        separator = b""
+        yield b'{"results":['
+        for id, data in results:
+            if data is None:
+                missing.append(id)
+                continue
+            yield separator + domain.json_dumps(data)
+            separator = b","
+        yield b'],"missing":' + domain.json_dumps(missing) + b"}"
+
+    return Response(app_iter=_chunks(), content_type="application/json")
+
+
+def _raw_json_response(request, raw, revision):
+    """Produz uma resposta com os dados `raw`, já serializados em JSON, e com
+    o cabeçalho `ETag` derivado de `revision`. Os demais cabeçalhos definidos
+    em `request.response`, e.g., por `_not_modified`, são preservados.
+    """
+    response = request.response
+    response.body = raw
+    response.content_type = "application/json"
+    response.charset = "utf-8"
+    response.etag = revision
+    return response
+
+
+def _http_date(timestamp):
+    """Converte `timestamp`, no formato produzido por `domain.utcnow`, para a
+    resolução de segundos dos cabeçalhos HTTP. Retorna ``None`` caso
+    `timestamp` seja vazio ou inválido.
+    """
+    try:
+        return datetime.fromisoformat(timestamp.rstrip("Z")).replace(
+            microsecond=0, tzinfo=timezone.utc
+        )
+    except (AttributeError, ValueError):
+        return None
+
+
+def _not_modified(request, revision, last_modified):
+    """Define os cabeçalhos `ETag` e `Last-Modified` da resposta a partir de
+    `revision` e `last_modified` e os compara aos validadores informados nos
+    cabeçalhos `If-None-Match` e `If-Modified-Since` da requisição. Produz a
+    resposta com o código HTTP 304 caso correspondam ou ``None`` caso
+    contrário.
+
+    Conforme a RFC 7232, `If-Modified-Since` é ignorado na presença de
+    `If-None-Match`.
+    """
+    modified = _http_date(last_modified)
+    request.response.etag = revision
+    request.response.last_modified = modified
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        matches = revision in ETagMatcher.parse(if_none_match, strong=False)
+    else:
+        since = parse_date(request.headers.get("If-Modified-Since"))
+        matches = bool(since and modified and modified <= since)
+
+    if matches:
+        response = HTTPNotModified()
+        response.etag = revision
+        response.last_modified = modified
+        return response
+    return None
+
+
+def _document_not_modified(request):
+    """Aplica `_not_modified` com os validadores do documento, obtidos sem a
+    decodificação do manifesto e sem a obtenção do XML. Produzirá uma resposta
+    com o código HTTP 404 caso o documento não seja conhecido pela aplicação.
+    """
+    try:
+        validators = request.services["fetch_document_validators"](
+            id=request.matchdict["document_id"]
+        )
+    except exceptions.DoesNotExist as exc:
+        raise HTTPNotFound(exc)
+    return _not_modified(request, *validators)
+
+
+def _fetch_error_status(exc):
+    """Traduz a exceção levantada na obtenção de um documento em lote para o
+    código HTTP que seria obtido caso fosse obtido individualmente.
+    """
+    if isinstance(exc, (exceptions.DoesNotExist, ValueError)):
+        return 404
+    elif isinstance(exc, exceptions.DeletedVersion):
+        return 410
+    elif isinstance(exc, exceptions.RetryableError):
+        return 503
+    elif isinstance(exc, exceptions.DeadlineExceeded):
+        return 504
+    else:
+        return 500
+
+
+@documents_bulk.get(
+    schema=DocumentsSchema(),
+    response_schemas={
+        "200": DocumentsSchema(
+            description="Obtém os documentos, um por linha, em JSON (NDJSON)"
+        ),
+        "400": DocumentsSchema(
+            description="Erro ao processar a requisição, verifique o parâmetro `ids`"
+        ),
+    },
+)
+def fetch_documents_data(request):
+    """Obtém em lote o conteúdo dos documentos representados em XML, conforme
+    ``GET /documents/:doc_id``, a partir da lista de identificadores separados
+    por vírgulas no argumento `ids`.
+
+    A resposta é transmitida à medida que os documentos são produzidos, no
+    formato NDJSON e na mesma ordem de `ids`. Cada linha é um objeto com as
+    chaves `id`, `status` -- o código HTTP que seria obtido na requisição
+    individual -- e `data`, com o XML, ou `message`, com a descrição do erro.
+    Os manifestos são obtidos, e a produção dos XMLs é iniciada, antes do
+    retorno da view, de maneira que apenas a serialização das linhas ocorre
+    durante a transmissão.
+    """
+    ids = _ids_from_querystring(request)
+    when = request.GET.get("when", None)
+    if when:
+        version = {"version_at": when}
+    else:
+        version = {}
+
+    results = request.services["fetch_documents_data"](ids=ids, **version)
+
+    def _lines():
+        for id, result in results:
+            if isinstance(result, Exception):
+                item = {
+                    "id": id,
+                    "status": _fetch_error_status(result),
+                    "message": str(result),
+                }
+            else:
+                item = {"id": id, "status": 200, "data": result.decode("utf-8")}
+            yield domain.json_dumps(item) + b"\n"
+
+    return Response(app_iter=_lines(), content_type="application/x-ndjson")
+
+
+def _bulk_result_status(result):
+    """Traduz o resultado do registro de um documento em lote para o código
+    HTTP que seria obtido caso o registro fosse feito individualmente.
+    """
+    if result["status"] == "created":
+        return 201
+    elif result["status"] in ("updated", "unchanged"):
+        return 204
+    elif isinstance(result["error"], exceptions.AlreadyExists):
+        return 409
+    elif isinstance(result["error"], (exceptions.NonRetryableError, ValueError)):
+        return 422
+    elif isinstance(result["error"], exceptions.RetryableError):
+        return 503
+    elif isinstance(result["error"], exceptions.DeadlineExceeded):
+        return 504
+    else:
+        return 500
+
+
+@documents_bulk.post(
+    schema=BulkRegisterDocumentsSchema(),
+    validators=(colander_validator,),
+    response_schemas={
+        "200": BulkRegisterDocumentsResultSchema(
+            description="Resultado do registro de cada documento do lote"
+        ),
+        "400": BulkRegisterDocumentsSchema(
+            description="O mesmo documento foi informado mais de uma vez no lote"
+        ),
+    },
+    accept="application/json",
+    renderer="json",
+)
+def post_documents(request):
+    """Adiciona ou atualiza em lote registros de documentos.
+
+    Cada item do lote é tratado da mesma forma que em ``PUT /documents/:doc_id``
+    e o resultado é informado individualmente, na mesma ordem em que foi
+    submetido, por meio do código HTTP que seria obtido no registro individual.
+    A falha de um item não impede o registro dos demais. Produzirá uma
+    resposta com o código HTTP 400 caso um mesmo documento seja informado mais
+    de uma vez.
+    """
+    documents = [
+        {
+            "id": document["id"],
+            "data_url": document["data"],
+            "assets": {
+                asset["asset_id"]: asset["asset_url"]
+                for asset in document.get("assets", [])
+            },
+        }
+        for document in request.validated["body"]
+    ]
+    try:
+        results = request.services["register_documents"](documents=documents)
+    except ValueError as exc:
+        raise HTTPBadRequest(str(exc))
+
+    response = []
+    for result in results:
+        item = {"id": result["id"], "status": _bulk_result_status(result)}
+        if result["error"] is not None:
+            LOGGER.info(
+                'cannot register document "%s" in bulk: %s',
+                result["id"],
+                result["error"],
+            )
+            item["message"] = str(result["error"])
+        response.append(item)
+    return {"results": response}
+
+
 @documents.delete(
     schema=DeleteDocumentSchema(),
     response_schemas={
@@ -497,25 +981,24 @@ def delete_document(request):
         "404": ManifestSchema(description="Manifesto não encontrado"),
     },
     accept="application/json",
-    renderer="json",
 )
 def get_manifest(request):
     """Obtém o manifesto do documento. Produzirá uma resposta com o código
     HTTP 404 caso o documento não seja conhecido pela aplicação.
+
+    O manifesto é transmitido tal como está armazenado, sem ser decodificado e
+    recodificado, e a sua revisão é informada no cabeçalho `ETag`.
     """
+    not_modified = _document_not_modified(request)
+    if not_modified is not None:
+        return not_modified
     try:
-        return request.services["fetch_document_manifest"](
+        raw, revision = request.services["fetch_raw_document_manifest"](
             id=request.matchdict["document_id"]
         )
     except exceptions.DoesNotExist as exc:
         raise HTTPNotFound(exc)
-
-
-def slugify_assets_ids(assets, slug_fn=slugify):
-    return [
-        {"slug": slug_fn(asset_id), "id": asset_id, "url": asset_url}
-        for asset_id, asset_url in assets.items()
-    ]
+    return _raw_json_response(request, raw, revision)
 
 
 @assets_list.get(
@@ -527,20 +1010,20 @@ def slugify_assets_ids(assets, slug_fn=slugify):
     },
 )
 def get_assets_list(request):
-    """Obtém relação dos ativos associados ao documento em determinada
-    versão. Produzirá uma resposta com o código HTTP 404 caso o documento não
+    """Obtém relação dos ativos associados ao documento em sua versão mais
+    recente. Produzirá uma resposta com o código HTTP 404 caso o documento não
     seja conhecido pela aplicação.
     """
+    not_modified = _document_not_modified(request)
+    if not_modified is not None:
+        return not_modified
     try:
-        assets = request.services["fetch_assets_list"](
+        return request.services["fetch_latest_document_version"](
             id=request.matchdict["document_id"]
         )
     except exceptions.DoesNotExist as exc:
         raise HTTPNotFound(exc)
 
-    assets["assets"] = slugify_assets_ids(assets["assets"])
-    return assets
-
 
 @assets.put(
     schema=AssetSchema(),
@@ -559,7 +1042,12 @@ def put_asset(request):
     A semântica desta view-function está definida conforme a especificação:
     https://www.w3.org/Protocols/rfc2616/rfc2616-sec9.html#sec9.6
     """
-    assets_list = get_assets_list(request)
+    try:
+        assets_list = request.services["fetch_latest_document_version"](
+            id=request.matchdict["document_id"]
+        )
+    except exceptions.DoesNotExist as exc:
+        raise HTTPNotFound(exc)
     assets_map = {asset["slug"]: asset["id"] for asset in assets_list["assets"]}
     asset_slug = request.matchdict["asset_slug"]
     try:
@@ -627,7 +1115,10 @@ def diff_document_versions(request):
     renderer="json",
 )
 def fetch_document_front(request):
-    data = fetch_document_data(request)
+    not_modified = _document_not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    data = _fetch_document_data(request, request.GET.get("when", None))
     return request.services["sanitize_document_front"](data)
 
 
@@ -641,17 +1132,110 @@ def fetch_document_front(request):
             description="Erro ao processar a requisição. Verifique o parâmetro `bundle_id`"
         ),
     },
-    renderer="json",
 )
 def fetch_documents_bundle(request):
+    """Obtém o bundle, transmitido tal como está armazenado, sem ser
+    decodificado e recodificado, e com a sua revisão informada no cabeçalho
+    `ETag`. Produzirá uma resposta com o código HTTP 304, sem obter o bundle,
+    caso os validadores da requisição correspondam aos do bundle.
+    """
     try:
-        return request.services["fetch_documents_bundle"](
+        not_modified = _not_modified(
+            request,
+            *request.services["fetch_documents_bundle_validators"](
+                request.matchdict["bundle_id"]
+            )
+        )
+        if not_modified is not None:
+            return not_modified
+        raw, revision = request.services["fetch_raw_documents_bundle"](
             request.matchdict["bundle_id"]
         )
     except KeyError:
         return HTTPBadRequest("bundle id is mandatory")
     except exceptions.DoesNotExist as exc:
         return HTTPNotFound(str(exc))
+    return _raw_json_response(request, raw, revision)
+
+
+@bundles_bulk.get(
+    schema=BulkFetchSchema(),
+    response_schemas={
+        "200": BulkFetchSchema(
+            description="Retorna os dados dos bundles solicitados e a lista dos "
+            "identificadores desconhecidos"
+        ),
+        "400": BulkFetchSchema(
+            description="Erro ao processar a requisição. Verifique o parâmetro `ids`"
+        ),
+    },
+)
+def fetch_documents_bundles(request):
+    """Obtém em lote os dados dos bundles a partir da lista de identificadores
+    separados por vírgulas no argumento `ids`. Os bundles são retornados na
+    mesma ordem de `ids` e os identificadores desconhecidos são listados em
+    `missing`.
+    """
+    ids = _ids_from_querystring(request)
+    return _bulk_json_response(request.services["fetch_documents_bundles"](ids=ids))
+
+
+ITEMS_SLICE_LIMIT = 100
+ITEMS_SLICE_MAX_LIMIT = 1000
+
+
+def _slice_from_querystring(request):
+    """Obtém os argumentos `offset`, `limit` e `fields` da querystring.
+    Produzirá uma resposta com o código HTTP 400 caso `offset` ou `limit`
+    sejam inválidos.
+    """
+    try:
+        offset = int(request.GET.get("offset", 0))
+        limit = int(request.GET.get("limit", ITEMS_SLICE_LIMIT))
+    except ValueError:
+        raise HTTPBadRequest("offset and limit must be integer")
+    if offset < 0:
+        raise HTTPBadRequest("offset must be greater than or equal to 0")
+    if not 0 < limit <= ITEMS_SLICE_MAX_LIMIT:
+        raise HTTPBadRequest("limit must be between 1 and %s" % ITEMS_SLICE_MAX_LIMIT)
+    fields = [field for field in request.GET.get("fields", "").split(",") if field]
+    return offset, limit, fields
+
+
+@bundles_documents.get(
+    schema=SliceSchema(),
+    response_schemas={
+        "200": SliceSchema(
+            description="Retorna o bundle com a página de documentos solicitada"
+        ),
+        "400": SliceSchema(
+            description="Erro ao processar a requisição. Verifique os parâmetros "
+            "`offset` e `limit`"
+        ),
+        "404": SliceSchema(description="Bundle não encontrado"),
+    },
+    accept="application/json",
+    renderer="json",
+)
+def fetch_bundles_documents(request):
+    """Obtém o bundle contendo apenas os `limit` documentos a partir da posição
+    `offset`. O argumento `fields` permite selecionar os campos retornados,
+    conforme descrito em `select_fields`, e.g., `fields=id,metadata` descarta
+    os documentos.
+    """
+    offset, limit, fields = _slice_from_querystring(request)
+    try:
+        data = request.services["fetch_documents_bundle_documents"](
+            id=request.matchdict["bundle_id"],
+            offset=offset,
+            limit=limit,
+            fields=fields,
+        )
+    except exceptions.DoesNotExist as exc:
+        return HTTPNotFound(str(exc))
+    if fields:
+        data = select_fields(data, fields)
+    return data
 
 
 @bundles.put(
@@ -817,6 +1401,45 @@ def fetch_change(request):
         return HTTPNotFound(exc)
 
 
+JOURNAL_EXPAND_LEVELS = ("issues", "documents")
+
+
+def select_fields(data, fields):
+    """Seleciona de `data` apenas os campos listados em `fields`.
+
+    Os campos são representados por caminhos separados por pontos, e.g.,
+    `metadata.title`. Ao encontrar uma lista, o restante do caminho é aplicado
+    a cada um de seus itens, i.e., `items.id` seleciona o campo `id` de cada
+    item da lista `items`. Campos inexistentes são ignorados.
+    """
+    tree = {}
+    for field in fields:
+        node = tree
+        *parents, leaf = field.split(".")
+        for name in parents:
+            node = node.setdefault(name, {})
+            if node is True:
+                break
+        else:
+            node[leaf] = True
+
+    def _select(value, tree):
+        if tree is True:
+            return value
+        elif isinstance(value, list):
+            return [_select(item, tree) for item in value]
+        elif isinstance(value, dict):
+            return {
+                name: _select(value[name], subtree)
+                for name, subtree in tree.items()
+                if name in value
+            }
+        else:
+            return value
+
+    return _select(data, tree)
+
+
 @journals.put(
     schema=JournalSchema(),
     validators=(colander_body_validator,),
@@ -857,16 +1480,88 @@ def put_journal(request):
     renderer="json",
 )
 def get_journal(request):
-    """Recupera um periódico por meio de seu identificador
+    """Recupera um periódico por meio de seu identificador.
+
+    O argumento `expand` permite resolver, em uma única requisição, os dados
+    dos fascículos (`expand=issues`) e também os de seus documentos
+    (`expand=issues,documents`). Os níveis devem ser expandidos em ordem, i.e.,
+    não é possível expandir os documentos sem expandir os fascículos. O
+    argumento `fields` permite selecionar os campos retornados, conforme
+    descrito em `select_fields`, e.g., `fields=id,metadata.title,items.bundle`.
+    Na ausência de ambos, o periódico é transmitido tal como está armazenado e
+    com a sua revisão informada no cabeçalho `ETag`.
+
+    Exceto quando expandido, produzirá uma resposta com o código HTTP 304,
+    sem obter o periódico, caso os validadores da requisição correspondam aos
+    do periódico.
     """
+    expand = [level for level in request.GET.get("expand", "").split(",") if level]
+    unknown = [level for level in expand if level not in JOURNAL_EXPAND_LEVELS]
+    if unknown:
+        return HTTPBadRequest("cannot expand unknown levels: %s" % ", ".join(unknown))
+    if expand and expand != list(JOURNAL_EXPAND_LEVELS[: len(expand)]):
+        return HTTPBadRequest(
+            "cannot expand levels %s: levels must be expanded in the order %s"
+            % (", ".join(expand), ", ".join(JOURNAL_EXPAND_LEVELS))
+        )
 
+    fields = [field for field in request.GET.get("fields", "").split(",") if field]
     try:
-        return request.services["fetch_journal"](id=request.matchdict["journal_id"])
+        if expand:
+            journal = request.services["fetch_journal_expanded"](
+                id=request.matchdict["journal_id"], documents="documents" in expand
+            )
+        else:
+            not_modified = _not_modified(
+                request,
+                *request.services["fetch_journal_validators"](
+                    id=request.matchdict["journal_id"]
+                )
+            )
+            if not_modified is not None:
+                return not_modified
+            if fields:
+                journal = request.services["fetch_journal"](
+                    id=request.matchdict["journal_id"]
+                )
+            else:
+                return _raw_json_response(
+                    request,
+                    *request.services["fetch_raw_journal"](
+                        id=request.matchdict["journal_id"]
+                    )
+                )
     except exceptions.DoesNotExist:
         return HTTPNotFound(
             'cannot fetch journal with id "%s"' % request.matchdict["journal_id"]
         )
 
+    if fields:
+        journal = select_fields(journal, fields)
+    return journal
+
+
+@journals_bulk.get(
+    schema=BulkFetchSchema(),
+    response_schemas={
+        "200": BulkFetchSchema(
+            description="Retorna os periódicos solicitados e a lista dos "
+            "identificadores desconhecidos"
+        ),
+        "400": BulkFetchSchema(
+            description="Erro ao processar a requisição. Verifique o parâmetro `ids`"
+        ),
+    },
+)
+def get_journals(request):
+    """Obtém em lote os periódicos a partir da lista de identificadores
+    separados por vírgulas no argumento `ids`. Os periódicos são retornados na
+    mesma ordem de `ids` e os identificadores desconhecidos são listados em
+    `missing`.
+    """
+    ids = _ids_from_querystring(request)
+    return _bulk_json_response(request.services["fetch_journals"](ids=ids))
+
 
 @journals.patch(
     schema=JournalSchema,
@@ -900,6 +1595,42 @@ def patch_journal(request):
     return HTTPNoContent("journal updated successfully")
 
 
+@journal_issues.get(
+    schema=SliceSchema(),
+    response_schemas={
+        "200": SliceSchema(
+            description="Retorna o periódico com a página de fascículos solicitada"
+        ),
+        "400": SliceSchema(
+            description="Erro ao processar a requisição. Verifique os parâmetros "
+            "`offset` e `limit`"
+        ),
+        "404": SliceSchema(description="Periódico não encontrado"),
+    },
+    accept="application/json",
+    renderer="json",
+)
+def get_journal_issues(request):
+    """Obtém o periódico contendo apenas os `limit` fascículos a partir da
+    posição `offset`. O argumento `fields` permite selecionar os campos
+    retornados, conforme descrito em `select_fields`, e.g.,
+    `fields=id,metadata` descarta os fascículos.
+    """
+    offset, limit, fields = _slice_from_querystring(request)
+    try:
+        data = request.services["fetch_journal_issues"](
+            id=request.matchdict["journal_id"],
+            offset=offset,
+            limit=limit,
+            fields=fields,
+        )
+    except exceptions.DoesNotExist as exc:
+        return HTTPNotFound(str(exc))
+    if fields:
+        data = select_fields(data, fields)
+    return data
+
+
 @journal_issues.patch(
     schema=JournalIssuesSchema(),
     validators=(colander_body_validator,),
@@ -1049,15 +1780,19 @@ def fetch_document_renditions(request):
     Produzirá uma resposta com o código HTTP 404 caso o documento solicitado
     não exista.
     """
+    not_modified = _document_not_modified(request)
+    if not_modified is not None:
+        return not_modified
     when = request.GET.get("when", None)
-    if when:
-        version = {"version_at": when}
-    else:
-        version = {}
     try:
-        return request.services["fetch_document_renditions"](
-            id=request.matchdict["document_id"], **version
-        )
+        if when:
+            return request.services["fetch_document_renditions"](
+                id=request.matchdict["document_id"], version_at=when
+            )
+        else:
+            return request.services["fetch_latest_document_version"](
+                id=request.matchdict["document_id"]
+            ).get("renditions", [])
     except (exceptions.DoesNotExist, ValueError) as exc:
         raise HTTPNotFound(exc)
 
@@ -1097,11 +1832,91 @@ def register_rendition_version(request):
     return HTTPNoContent("journal updated successfully")
 
 
+class TupleTypeConverter(TypeConverter):
+    """Representa instâncias de `colander.TupleSchema`, e.g., os intervalos de
+    datas, como arrays na especificação OpenAPI.
+    """
+
+    type = "array"
+
+    def convert_type(self, schema_node):
+        converted = super().convert_type(schema_node)
+        converted["items"] = self.dispatcher(schema_node.children[0])
+        converted["minItems"] = converted["maxItems"] = len(schema_node.children)
+        return converted
+
+
+class KernelSwagger(CorniceSwagger):
+    custom_type_converters = {colander.Tuple: TupleTypeConverter}
+    summary_docstrings = True
+
+
+@functools.lru_cache(maxsize=None)
+def _openapi_spec() -> tuple:
+    """Produz a especificação OpenAPI, serializada em JSON, e sua revisão. Como
+    os serviços são todos declarados na importação deste módulo, a
+    especificação é produzida uma única vez, na primeira requisição.
+    """
+    doc = KernelSwagger(get_services())
+    raw = domain.json_dumps(doc.generate("Kernel", "0.1"))
+    return raw, adapters.revision(raw)
+
+
 @swagger.get()
 def openAPI_spec(request):
-    doc = CorniceSwagger(get_services())
-    doc.summary_docstrings = True
-    return doc.generate("Kernel", "0.1")
+    """Obtém a especificação OpenAPI da API, mantida em memória e com a sua
+    revisão informada no cabeçalho `ETag`.
+    """
+    raw, revision = _openapi_spec()
+    not_modified = _not_modified(request, revision, None)
+    if not_modified is not None:
+        return not_modified
+    return _raw_json_response(request, raw, revision)
+
+
+def _json_default(request):
+    def default(obj):
+        if hasattr(obj, "__json__"):
+            return obj.__json__(request)
+        raise TypeError("%r is not JSON serializable" % (obj,))
+
+    return default
+
+
+class JSONRenderer:
+    """Renderizador para dados do tipo ``application/json``.
+
+    Substitui o renderizador `json` padrão do Pyramid e serializa o retorno da
+    view-function diretamente em bytes, por meio de `domain.json_dumps`, a
+    mesma serialização dos dados armazenados. Assim como no renderizador
+    padrão, os objetos que implementam o método `__json__` são suportados.
+    """
+
+    def __init__(self, info):
+        pass
+
+    def __call__(self, value, system):
+        request = system.get("request")
+        if request is not None:
+            response = request.response
+            if response.content_type == response.default_content_type:
+                response.content_type = "application/json"
+        return domain.json_dumps(value, default=_json_default(request))
+
+
+def object_store_unavailable(exc, request):
+    """Responde às requisições recusadas enquanto o circuito de acesso ao
+    object store encontra-se aberto.
+    """
+    response = HTTPServiceUnavailable("object store is unavailable: %s" % exc)
+    response.retry_after = max(1, math.ceil(exc.retry_after))
+    return response
+
+
+def deadline_exceeded(exc, request):
+    """Responde às requisições cujo prazo para atendimento se esgotou.
+    """
+    return HTTPGatewayTimeout(str(exc))
 
 
 class XMLRenderer:
@@ -1165,6 +1980,45 @@ DEFAULT_SETTINGS = [
     ("kernel.app.mongodb.dbname", "KERNEL_APP_MONGODB_DBNAME", str, "document-store"),
     ("kernel.app.prometheus.enabled", "KERNEL_APP_PROMETHEUS_ENABLED", asbool, True),
     ("kernel.app.prometheus.port", "KERNEL_APP_PROMETHEUS_PORT", int, 8087),
+    ("kernel.app.compression.enabled", "KERNEL_APP_COMPRESSION_ENABLED", asbool, True),
+    ("kernel.app.compression.min_size", "KERNEL_APP_COMPRESSION_MIN_SIZE", int, 1024),
+    ("kernel.app.compression.level", "KERNEL_APP_COMPRESSION_LEVEL", int, 6),
+    ("kernel.app.admission.enabled", "KERNEL_APP_ADMISSION_ENABLED", asbool, False),
+    (
+        "kernel.app.admission.object_store.max_inflight",
+        "KERNEL_APP_ADMISSION_OBJECT_STORE_MAX_INFLIGHT",
+        int,
+        2,
+    ),
+    (
+        "kernel.app.admission.read.max_inflight",
+        "KERNEL_APP_ADMISSION_READ_MAX_INFLIGHT",
+        int,
+        3,
+    ),
+    (
+        "kernel.app.admission.write.max_inflight",
+        "KERNEL_APP_ADMISSION_WRITE_MAX_INFLIGHT",
+        int,
+        2,
+    ),
+    ("kernel.app.admission.max_queued", "KERNEL_APP_ADMISSION_MAX_QUEUED", int, 8),
+    (
+        "kernel.app.admission.queue_timeout",
+        "KERNEL_APP_ADMISSION_QUEUE_TIMEOUT",
+        float,
+        1.0,
+    ),
+    ("kernel.app.admission.retry_after", "KERNEL_APP_ADMISSION_RETRY_AFTER", int, 1),
+    (
+        "kernel.app.deadline.object_store",
+        "KERNEL_APP_DEADLINE_OBJECT_STORE",
+        float,
+        0,
+    ),
+    ("kernel.app.deadline.read", "KERNEL_APP_DEADLINE_READ", float, 0),
+    ("kernel.app.deadline.write", "KERNEL_APP_DEADLINE_WRITE", float, 0),
+    ("kernel.app.bulk.max_ids", "KERNEL_APP_BULK_MAX_IDS", int, BULK_MAX_IDS),
     ("kernel.app.sentry.enabled", "KERNEL_APP_SENTRY_ENABLED", asbool, False),
     ("kernel.app.sentry.dsn", "KERNEL_APP_SENTRY_DSN", str, ""),
     ("kernel.app.sentry.environment", "KERNEL_APP_SENTRY_ENVIRONMENT", str, ""),
@@ -1201,9 +2055,18 @@ def main(global_config, **settings):
     config.include("cornice")
     config.include("cornice_swagger")
     config.include("documentstore.pyramid_prometheus")
+    config.include("documentstore.pyramid_deadline")
+    config.include("documentstore.pyramid_admission")
+    config.include("documentstore.pyramid_compression")
     config.scan()
+    config.add_renderer("json", JSONRenderer)
     config.add_renderer("xml", XMLRenderer)
     config.add_renderer("text", PlainTextRenderer)
+    config.add_exception_view(
+        object_store_unavailable, context=exceptions.CircuitOpenError
+    )
+    config.add_exception_view(deadline_exceeded, context=exceptions.DeadlineExceeded)
+    config.add_exception_view(deadline_exceeded, context=ExecutionTimeout)
 
     mongo = adapters.MongoDB(
         settings["kernel.app.mongodb.dsn"],
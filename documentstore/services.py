@@ -1,19 +1,35 @@
 from typing import Callable, Dict, Any, List
 import difflib
 import functools
+import os
+import threading
+import contextvars
+from datetime import datetime, timedelta
+from collections import Counter, OrderedDict
+from concurrent import futures
 from io import BytesIO
 from enum import Enum, auto
 import gzip
-import json
 
 from clea import join as clea_join, core as clea_core
 
 from .interfaces import Session
-from .domain import Document, DocumentsBundle, Journal, utcnow
-from .exceptions import DoesNotExist, AlreadyExists, VersionAlreadySet
+from .domain import (
+    Document,
+    DocumentsBundle,
+    Journal,
+    utcnow,
+    assets_from_remote_xml,
+    json_dumps,
+)
+from .exceptions import DoesNotExist, AlreadyExists, VersionAlreadySet, DeletedVersion
 
 __all__ = ["get_handlers"]
 
+BULK_MAX_WORKERS = int(os.environ.get("KERNEL_LIB_BULK_MAX_WORKERS", "8"))
+VERSIONS_CACHE_MAXSIZE = int(os.environ.get("KERNEL_LIB_VERSIONS_CACHE_MAXSIZE", "128"))
+SIZES_CACHE_MAXSIZE = int(os.environ.get("KERNEL_LIB_SIZES_CACHE_MAXSIZE", "10000"))
+
 
 class Events(Enum):
     """Eventos emitidos por instâncias de `CommandHandler`.
@@ -37,6 +53,7 @@ class Events(Enum):
     AHEAD_OF_PRINT_BUNDLE_REMOVED_FROM_JOURNAL = auto()
     RENDITION_VERSION_REGISTERED = auto()
     DOCUMENT_DELETED = auto()
+    DOCUMENTS_REGISTERED_IN_BULK = auto()
 
 
 class CommandHandler:
@@ -44,6 +61,54 @@ class CommandHandler:
         self.Session = Session
 
 
+class LRUCache:
+    """Cache de no máximo `maxsize` itens, onde os menos recentemente usados
+    são descartados primeiro. Pode ser compartilhado entre threads.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = int(maxsize)
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._items.move_to_end(key)
+            except KeyError:
+                return default
+            return self._items[key]
+
+    def set(self, key, value) -> None:
+        if self.maxsize < 1:
+            return None
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+IMMUTABLE_VERSIONS_CACHE = LRUCache(VERSIONS_CACHE_MAXSIZE)
+DATA_SIZES_CACHE = LRUCache(SIZES_CACHE_MAXSIZE)
+
+
+def version_key(version: dict) -> tuple:
+    """Identifica o XML produzido para `version`, i.e., a URL do XML e as URLs
+    dos ativos digitais resolvidos. Aceita tanto o retorno de
+    `Document.version` quanto a visão produzida por `fetch_latest_version`,
+    onde os ativos digitais são listados.
+    """
+    assets = version.get("assets", {})
+    if isinstance(assets, list):
+        assets = {asset["id"]: asset["url"] for asset in assets}
+    return version["data"], tuple(sorted(assets.items()))
+
+
 class BaseRegisterDocument(CommandHandler):
     """Implementação abstrata de comando para registrar um novo documento.
 
@@ -129,6 +194,133 @@ class RegisterDocumentVersion(BaseRegisterDocument):
             pass
 
 
+class RegisterDocuments(CommandHandler):
+    """Registra em lote novos documentos ou novas versões de documentos já
+    registrados.
+
+    O download e a análise dos XMLs são executados concorrentemente por no
+    máximo `max_workers` threads. Os documentos são persistidos por meio de
+    uma única operação em lote e suas mudanças são notificadas por meio de um
+    único evento.
+
+    :param documents: lista de dicionários com as chaves `id`, `data_url` e,
+    opcionalmente, `assets` -- mapa entre os identificadores dos ativos e suas
+    URLs.
+    :param max_workers: (opcional) número máximo de XMLs obtidos
+    simultaneamente.
+
+    Retorna uma lista, na mesma ordem de `documents`, de dicionários na forma
+    ``{"id": <id>, "status": <status>, "error": <exceção ou None>}``, onde
+    `status` pode ser `created`, `updated`, `unchanged` ou `failed`.
+
+    Levanta `ValueError` caso um mesmo identificador seja informado mais de
+    uma vez, uma vez que as novas versões seriam produzidas a partir do mesmo
+    manifesto e uma delas seria perdida.
+    """
+
+    def _prepare(self, session: Session, item: dict) -> tuple:
+        """Obtém o documento e adiciona a nova versão. Retorna a tripla
+        ``(<operação>, <documento>, <XML da nova versão>)``, onde operação é
+        `add`, `update` ou ``None`` quando a versão já está registrada.
+
+        O XML é obtido uma única vez e reutilizado tanto na identificação dos
+        ativos quanto na produção do conteúdo registrado na lista de mudanças.
+        """
+        fetched = {}
+
+        def assets_getter(url, timeout):
+            if url not in fetched:
+                fetched[url] = assets_from_remote_xml(url, timeout=timeout)
+            return fetched[url]
+
+        try:
+            assets = dict(item.get("assets") or {})
+        except TypeError:
+            assets = {}
+        try:
+            document = session.documents.fetch(item["id"])
+        except DoesNotExist:
+            document = Document(id=item["id"])
+            op = "add"
+        else:
+            op = "update"
+
+        try:
+            document.new_version(item["data_url"], assets_getter=assets_getter)
+        except VersionAlreadySet:
+            return None, document, None
+
+        for asset_id, asset_url in assets.items():
+            try:
+                document.new_asset_version(asset_id, asset_url)
+            except VersionAlreadySet:
+                pass
+        return op, document, document.data(assets_getter=assets_getter)
+
+    def __call__(
+        self, documents: List[Dict[str, Any]], max_workers: int = BULK_MAX_WORKERS
+    ) -> List[Dict[str, Any]]:
+        duplicated = [
+            id
+            for id, count in Counter(item["id"] for item in documents).items()
+            if count > 1
+        ]
+        if duplicated:
+            raise ValueError(
+                "cannot register documents in bulk: duplicated ids %s"
+                % ", ".join('"%s"' % id for id in duplicated)
+            )
+
+        session = self.Session()
+        results = [
+            {"id": item["id"], "status": "unchanged", "error": None}
+            for item in documents
+        ]
+
+        pending = []
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # as tarefas são executadas em cópias do contexto corrente, de
+            # maneira que o prazo da requisição também se aplica a elas
+            prepared = [
+                executor.submit(
+                    contextvars.copy_context().run, self._prepare, session, item
+                )
+                for item in documents
+            ]
+            for index, future in enumerate(prepared):
+                try:
+                    op, document, data = future.result()
+                except Exception as exc:
+                    results[index].update(status="failed", error=exc)
+                else:
+                    if op is not None:
+                        pending.append((index, op, document, data))
+
+        errors = session.documents.write_many(
+            [(op, document) for _, op, document, _ in pending]
+        )
+
+        registered = []
+        for (index, op, document, data), error in zip(pending, errors):
+            if error is not None:
+                results[index].update(status="failed", error=error)
+                continue
+            results[index]["status"] = "created" if op == "add" else "updated"
+            registered.append(
+                {
+                    "instance": document,
+                    "id": documents[index]["id"],
+                    "data_url": documents[index]["data_url"],
+                    "assets": documents[index].get("assets") or {},
+                    "data_bytes": data,
+                }
+            )
+
+        if registered:
+            session.notify(Events.DOCUMENTS_REGISTERED_IN_BULK, {"items": registered})
+        return results
+
+
 class FetchDocumentData(CommandHandler):
     """Recupera o documento em XML à partir de seu identificador.
 
@@ -141,14 +333,182 @@ class FetchDocumentData(CommandHandler):
     :param version_at: (opcional) string de texto de um timestamp UTC
     referente a versão do documento no determinado momento. O uso do argumento
     `version_at` faz com que qualquer valor de `version_index` seja ignorado.
+
+    As versões que não podem mais ser alteradas, conforme
+    `Document.is_immutable`, são mantidas em `cache` e identificadas pelo XML
+    e pelos ativos digitais resolvidos, de maneira que requisições distintas
+    que resolvem para a mesma versão compartilham o XML produzido. O tamanho
+    do XML produzido é mantido em `sizes`, para qualquer versão, e consultado
+    por `FetchDocumentDataSize`.
     """
 
+    def __init__(
+        self,
+        Session: Callable[[], Session],
+        cache: LRUCache = IMMUTABLE_VERSIONS_CACHE,
+        sizes: LRUCache = DATA_SIZES_CACHE,
+    ):
+        super().__init__(Session)
+        self.cache = cache
+        self.sizes = sizes
+
     def __call__(
         self, id: str, version_index: int = -1, version_at: str = None
     ) -> bytes:
+        session = self.Session()
+        return self.data(session.documents.fetch(id), version_index, version_at)
+
+    def data(
+        self, document: Document, version_index: int = -1, version_at: str = None
+    ) -> bytes:
+        """Produz o XML de `document`, já obtido, conforme os argumentos de
+        `__call__`.
+        """
+        version = (
+            document.version_at(version_at)
+            if version_at
+            else document.version(version_index)
+        )
+        if version.get("deleted"):
+            return document.data(version_index=version_index, version_at=version_at)
+
+        key = version_key(version)
+        immutable = document.is_immutable(version_index, version_at)
+        data = self.cache.get(key) if immutable else None
+        if data is None:
+            data = document.data(version_index=version_index, version_at=version_at)
+            self.sizes.set(key, len(data))
+            if immutable:
+                self.cache.set(key, data)
+        return data
+
+
+class FetchDocumentDataSize(CommandHandler):
+    """Recupera o tamanho, em bytes, do documento em XML sem obtê-lo, i.e., a
+    partir do tamanho mantido em `sizes` por `FetchDocumentData`.
+
+    Levanta `documentstore.exceptions.DeletedVersion` caso o documento tenha
+    sido excluído.
+
+    :param id: Identificador único do documento.
+    :param version_at: (opcional) string de texto de um timestamp UTC
+    referente a versão do documento no determinado momento.
+
+    Retorna ``None`` caso o XML da versão ainda não tenha sido produzido.
+    """
+
+    def __init__(
+        self, Session: Callable[[], Session], sizes: LRUCache = DATA_SIZES_CACHE
+    ):
+        super().__init__(Session)
+        self.sizes = sizes
+
+    def __call__(self, id: str, version_at: str = None) -> int:
+        session = self.Session()
+        if version_at:
+            version = session.documents.fetch(id).version_at(version_at)
+        else:
+            version = session.documents.fetch_latest_version(id)
+        return self.size(version)
+
+    def size(self, version: dict) -> int:
+        """Recupera o tamanho do XML de `version`, já obtida por meio de
+        `Document.version` ou `Document.version_at`.
+        """
+        if version.get("deleted"):
+            raise DeletedVersion("cannot get data: the document was deleted")
+        return self.sizes.get(version_key(version))
+
+
+class FetchDocumentVersion(CommandHandler):
+    """Recupera, por meio de uma única leitura do documento, o XML da versão
+    vigente no determinado momento, conforme `FetchDocumentData`, ou apenas o
+    seu tamanho, conforme `FetchDocumentDataSize`, e o timestamp canônico da
+    versão, conforme `Document.version_timestamp_at`, caso esta não possa mais
+    ser alterada, conforme `Document.is_immutable`.
+
+    :param id: Identificador único do documento.
+    :param version_at: string de texto de um timestamp UTC.
+    :param size_only: (opcional) obtém apenas o tamanho do XML.
+
+    Retorna o par ``(<XML ou tamanho>, <timestamp canônico>)``, onde o
+    timestamp canônico é ``None`` caso a versão ainda possa ser alterada.
+    """
+
+    def __init__(
+        self,
+        Session: Callable[[], Session],
+        fetch_data: FetchDocumentData = None,
+        fetch_data_size: FetchDocumentDataSize = None,
+    ):
+        super().__init__(Session)
+        self.fetch_data = fetch_data or FetchDocumentData(Session)
+        self.fetch_data_size = fetch_data_size or FetchDocumentDataSize(Session)
+
+    def __call__(self, id: str, version_at: str, size_only: bool = False) -> tuple:
         session = self.Session()
         document = session.documents.fetch(id)
-        return document.data(version_index=version_index, version_at=version_at)
+        if size_only:
+            result = self.fetch_data_size.size(document.version_at(version_at))
+        else:
+            result = self.fetch_data.data(document, version_at=version_at)
+        if document.is_immutable(version_at=version_at):
+            return result, document.version_timestamp_at(version_at)
+        return result, None
+
+
+class FetchDocumentsData(CommandHandler):
+    """Recupera em lote os documentos em XML à partir de seus identificadores.
+
+    Os manifestos são obtidos por meio de uma única consulta e os XMLs são
+    produzidos concorrentemente por no máximo `max_workers` threads.
+
+    :param ids: Lista de identificadores únicos dos documentos.
+    :param version_at: (opcional) string de texto de um timestamp UTC
+    referente a versão dos documentos no determinado momento.
+    :param max_workers: (opcional) número máximo de XMLs produzidos
+    simultaneamente.
+
+    Retorna um iterador de pares ``(<id>, <resultado>)``, na mesma ordem de
+    `ids`, onde resultado é o XML em bytes ou a instância da exceção que
+    impediu sua obtenção. Os manifestos são obtidos e a produção dos XMLs é
+    iniciada ainda durante a invocação, sob o contexto corrente, e.g., o prazo
+    da requisição, enquanto o iterador apenas aguarda os resultados.
+    """
+
+    def __call__(
+        self,
+        ids: List[str],
+        version_at: str = None,
+        max_workers: int = BULK_MAX_WORKERS,
+    ):
+        session = self.Session()
+        documents = session.documents.fetch_many(ids)
+        version = {"version_at": version_at} if version_at else {}
+
+        def _data(id):
+            try:
+                document = documents[id]
+            except KeyError:
+                return DoesNotExist(
+                    "cannot fetch data with id " '"%s": data does not exist' % id
+                )
+            try:
+                return document.data(**version)
+            except Exception as exc:
+                return exc
+
+        # o executor é encerrado sem aguardar as tarefas submetidas, que
+        # seguem em execução enquanto os resultados são consumidos
+        executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            fetched = [
+                executor.submit(contextvars.copy_context().run, _data, id)
+                for id in ids
+            ]
+        finally:
+            executor.shutdown(wait=False)
+        return zip(ids, (future.result() for future in fetched))
 
 
 class FetchDocumentManifest(CommandHandler):
@@ -163,6 +523,34 @@ class FetchDocumentManifest(CommandHandler):
         return document.manifest
 
 
+class FetchRawDocumentManifest(CommandHandler):
+    """Recupera o manifesto do documento, serializado em JSON, tal como está
+    armazenado, i.e., sem decodificá-lo.
+
+    :param id: Identificador único do documento.
+
+    Retorna o par ``(<bytes>, <revisão>)``.
+    """
+
+    def __call__(self, id: str) -> tuple:
+        session = self.Session()
+        return session.documents.fetch_raw(id)
+
+
+class FetchDocumentValidators(CommandHandler):
+    """Recupera os validadores das requisições condicionais ao documento, sem a
+    necessidade de decodificar o manifesto ou de obter o XML.
+
+    :param id: Identificador único do documento.
+
+    Retorna o par ``(<revisão>, <timestamp>)``.
+    """
+
+    def __call__(self, id: str) -> tuple:
+        session = self.Session()
+        return session.documents.fetch_validators(id)
+
+
 class FetchAssetsList(CommandHandler):
     """Recupera a lista de ativos do documento à partir de seu identificador.
 
@@ -177,6 +565,19 @@ class FetchAssetsList(CommandHandler):
         return document.version(index=version_index)
 
 
+class FetchLatestDocumentVersion(CommandHandler):
+    """Recupera a versão mais recente do documento, com os ativos digitais e as
+    manifestações já resolvidos e os identificadores dos ativos convertidos em
+    slugs, sem a necessidade de decodificar o manifesto.
+
+    :param id: Identificador único do documento.
+    """
+
+    def __call__(self, id: str) -> dict:
+        session = self.Session()
+        return session.documents.fetch_latest_version(id)
+
+
 class RegisterAssetVersion(CommandHandler):
     """Registra uma nova versão do ativo digital de documento já registrado.
 
@@ -259,10 +660,9 @@ class CreateDocumentsBundle(CommandHandler):
     def __call__(self, id: str, docs: list = None, metadata: dict = None) -> None:
         session = self.Session()
         _bundle = DocumentsBundle(id)
-        for doc in docs or []:
-            _bundle.add_document(doc)
-        for name, value in (metadata or {}).items():
-            setattr(_bundle, name, value)
+        if docs:
+            _bundle.replace_documents(docs)
+        _bundle.set_metadata_many(metadata or {})
         result = session.documents_bundles.add(_bundle)
         session.notify(
             Events.DOCUMENTSBUNDLE_CREATED,
@@ -277,12 +677,80 @@ class FetchDocumentsBundle(CommandHandler):
         return session.documents_bundles.fetch(id).data()
 
 
+class FetchRawDocumentsBundle(CommandHandler):
+    """Recupera o DocumentsBundle, serializado em JSON, tal como está
+    armazenado, i.e., sem decodificá-lo.
+
+    :param id: Identificador único do DocumentsBundle.
+
+    Retorna o par ``(<bytes>, <revisão>)``.
+    """
+
+    def __call__(self, id: str) -> tuple:
+        session = self.Session()
+        return session.documents_bundles.fetch_raw(id)
+
+
+class FetchDocumentsBundleValidators(CommandHandler):
+    """Recupera os validadores das requisições condicionais ao DocumentsBundle.
+
+    :param id: Identificador único do DocumentsBundle.
+
+    Retorna o par ``(<revisão>, <timestamp>)``.
+    """
+
+    def __call__(self, id: str) -> tuple:
+        session = self.Session()
+        return session.documents_bundles.fetch_validators(id)
+
+
+class FetchDocumentsBundles(CommandHandler):
+    """Recupera em lote DocumentsBundles por meio de uma única consulta.
+
+    :param ids: Lista de identificadores únicos dos DocumentsBundles.
+
+    Retorna uma lista de pares ``(<id>, <dados>)``, na mesma ordem de `ids`,
+    onde dados é ``None`` para os identificadores desconhecidos.
+    """
+
+    def __call__(self, ids: List[str]) -> list:
+        session = self.Session()
+        bundles = session.documents_bundles.fetch_many(ids)
+        return [(id, bundles[id].data() if id in bundles else None) for id in ids]
+
+
+class FetchDocumentsBundleDocuments(CommandHandler):
+    """Recupera o DocumentsBundle contendo apenas uma página de seus
+    documentos.
+
+    :param id: Identificador único do DocumentsBundle.
+    :param offset: Posição do primeiro documento da página.
+    :param limit: Quantidade máxima de documentos da página.
+    :param fields: (opcional) Lista dos campos a serem recuperados.
+    """
+
+    def __call__(
+        self, id: str, offset: int, limit: int, fields: List[str] = None
+    ) -> dict:
+        session = self.Session()
+        return session.documents_bundles.fetch_slice(id, offset, limit, fields)
+
+
 class UpdateDocumentsBundleMetadata(CommandHandler):
+    """Atualiza os metadados de um DocumentsBundle.
+
+    Caso os valores informados sejam idênticos aos já armazenados, nenhuma
+    escrita é realizada e nenhum evento é emitido.
+
+    :param id: Identificador único do DocumentsBundle.
+    :param metadata: Mapa entre os nomes dos metadados e seus novos valores.
+    """
+
     def __call__(self, id: str, metadata: dict) -> None:
         session = self.Session()
         _bundle = session.documents_bundles.fetch(id)
-        for name, value in metadata.items():
-            setattr(_bundle, name, value)
+        if not _bundle.set_metadata_many(metadata):
+            return None
         session.documents_bundles.update(_bundle)
         session.notify(
             Events.DOCUMENTSBUNDLE_METATADA_UPDATED,
@@ -293,9 +761,7 @@ class UpdateDocumentsBundleMetadata(CommandHandler):
 class AddDocumentToDocumentsBundle(CommandHandler):
     def __call__(self, id: str, doc: str) -> None:
         session = self.Session()
-        _bundle = session.documents_bundles.fetch(id)
-        _bundle.add_document(doc)
-        session.documents_bundles.update(_bundle)
+        _bundle = session.documents_bundles.add_item(id, doc)
         session.notify(
             Events.DOCUMENT_ADDED_TO_DOCUMENTSBUNDLE,
             {"instance": _bundle, "id": id, "doc": doc},
@@ -305,9 +771,7 @@ class AddDocumentToDocumentsBundle(CommandHandler):
 class InsertDocumentToDocumentsBundle(CommandHandler):
     def __call__(self, id: str, index: int, doc: str) -> None:
         session = self.Session()
-        _bundle = session.documents_bundles.fetch(id)
-        _bundle.insert_document(index, doc)
-        session.documents_bundles.update(_bundle)
+        _bundle = session.documents_bundles.add_item(id, doc, index=index)
         session.notify(
             Events.DOCUMENT_INSERTED_TO_DOCUMENTSBUNDLE,
             {"instance": _bundle, "id": id, "index": index, "doc": doc},
@@ -321,13 +785,7 @@ class UpdateDocumentInDocumentsBundle(CommandHandler):
     def __call__(self, id: str, docs: List[Dict]) -> None:
         session = self.Session()
         _bundle = session.documents_bundles.fetch(id)
-
-        for doc in _bundle.documents:
-            _bundle.remove_document(doc["id"])
-
-        for doc in docs:
-            _bundle.add_document(doc)
-
+        _bundle.replace_documents(docs)
         session.documents_bundles.update(_bundle)
         session.notify(
             Events.ISSUE_DOCUMENTS_UPDATED,
@@ -339,8 +797,7 @@ class CreateJournal(CommandHandler):
     def __call__(self, id: str, metadata: Dict[str, Any] = None) -> None:
         session = self.Session()
         _journal = Journal(id)
-        for name, value in (metadata or {}).items():
-            setattr(_journal, name, value)
+        _journal.set_metadata_many(metadata or {})
         result = session.journals.add(_journal)
         session.notify(
             Events.JOURNAL_CREATED,
@@ -359,12 +816,125 @@ class FetchJournal(CommandHandler):
         return session.journals.fetch(id).data()
 
 
+class FetchJournalIssues(CommandHandler):
+    """Recupera o Journal contendo apenas uma página de seus fascículos.
+
+    :param id: Identificador único do Journal.
+    :param offset: Posição do primeiro fascículo da página.
+    :param limit: Quantidade máxima de fascículos da página.
+    :param fields: (opcional) Lista dos campos a serem recuperados.
+    """
+
+    def __call__(
+        self, id: str, offset: int, limit: int, fields: List[str] = None
+    ) -> dict:
+        session = self.Session()
+        return session.journals.fetch_slice(id, offset, limit, fields)
+
+
+class FetchJournalExpanded(CommandHandler):
+    """Recupera o Journal a partir do seu identificador com os dados de seus
+    fascículos, e opcionalmente de seus documentos, resolvidos.
+
+    Cada nível é resolvido por meio de uma única consulta, de maneira que são
+    necessárias no máximo 3 consultas independentemente do número de
+    fascículos e documentos.
+
+    :param id: Identificador único do Journal.
+    :param documents: (opcional) resolve também os documentos dos fascículos.
+
+    Cada item em `items` do Journal recebe a chave `bundle` com os dados do
+    DocumentsBundle correspondente. Se `documents` for verdadeiro, cada item
+    do DocumentsBundle recebe a chave `document` com os metadados da versão
+    mais recente do documento. Em ambos os casos, o valor é ``None`` para
+    identificadores desconhecidos.
+    """
+
+    def __call__(self, id: str, documents: bool = False) -> dict:
+        session = self.Session()
+        journal = session.journals.fetch(id).data()
+
+        bundles = session.documents_bundles.fetch_many(
+            [item["id"] for item in journal["items"]]
+        )
+        for item in journal["items"]:
+            bundle = bundles.get(item["id"])
+            item["bundle"] = bundle.data() if bundle else None
+
+        if documents:
+            bundles_items = [
+                doc
+                for item in journal["items"]
+                if item["bundle"]
+                for doc in item["bundle"]["items"]
+            ]
+            fetched = session.documents.fetch_many([doc["id"] for doc in bundles_items])
+            for doc in bundles_items:
+                try:
+                    doc["document"] = fetched[doc["id"]].version()
+                except (KeyError, ValueError):
+                    doc["document"] = None
+
+        return journal
+
+
+class FetchRawJournal(CommandHandler):
+    """Recupera o Journal, serializado em JSON, tal como está armazenado, i.e.,
+    sem decodificá-lo.
+
+    :param id: Identificador único do Journal.
+
+    Retorna o par ``(<bytes>, <revisão>)``.
+    """
+
+    def __call__(self, id: str) -> tuple:
+        session = self.Session()
+        return session.journals.fetch_raw(id)
+
+
+class FetchJournalValidators(CommandHandler):
+    """Recupera os validadores das requisições condicionais ao Journal.
+
+    :param id: Identificador único do Journal.
+
+    Retorna o par ``(<revisão>, <timestamp>)``.
+    """
+
+    def __call__(self, id: str) -> tuple:
+        session = self.Session()
+        return session.journals.fetch_validators(id)
+
+
+class FetchJournals(CommandHandler):
+    """Recupera em lote Journals por meio de uma única consulta.
+
+    :param ids: Lista de identificadores únicos dos Journals.
+
+    Retorna uma lista de pares ``(<id>, <dados>)``, na mesma ordem de `ids`,
+    onde dados é ``None`` para os identificadores desconhecidos.
+    """
+
+    def __call__(self, ids: List[str]) -> list:
+        session = self.Session()
+        journals = session.journals.fetch_many(ids)
+        return [(id, journals[id].data() if id in journals else None) for id in ids]
+
+
 class UpdateJournalMetadata(CommandHandler):
+    """Atualiza os metadados de um Journal.
+
+    Caso os valores informados sejam idênticos aos já armazenados, nenhuma
+    escrita é realizada e nenhum evento é emitido.
+
+    :param id: Identificador único do Journal.
+    :param metadata: Mapa entre os nomes dos metadados e seus novos valores.
+    """
+
     def __call__(self, id: str, metadata: Dict[str, Any] = None) -> None:
         session = self.Session()
         _journal = session.journals.fetch(id)
-        for name, value in metadata.items():
-            setattr(_journal, name, value)
+        if not _journal.set_metadata_many(metadata):
+            return None
         session.journals.update(_journal)
         session.notify(
             Events.JOURNAL_METATADA_UPDATED,
@@ -375,9 +945,7 @@ class UpdateJournalMetadata(CommandHandler):
 class AddIssueToJournal(CommandHandler):
     def __call__(self, id: str, issue: dict) -> None:
         session = self.Session()
-        _journal = session.journals.fetch(id)
-        _journal.add_issue(issue)
-        session.journals.update(_journal)
+        _journal = session.journals.add_item(id, issue)
         session.notify(
             Events.ISSUE_ADDED_TO_JOURNAL,
             {"instance": _journal, "id": id, "issue": issue},
@@ -387,9 +955,7 @@ class AddIssueToJournal(CommandHandler):
 class InsertIssueToJournal(CommandHandler):
     def __call__(self, id: str, index: int, issue: dict) -> None:
         session = self.Session()
-        _journal = session.journals.fetch(id)
-        _journal.insert_issue(index, issue)
-        session.journals.update(_journal)
+        _journal = session.journals.add_item(id, issue, index=index)
         session.notify(
             Events.ISSUE_INSERTED_TO_JOURNAL,
             {"instance": _journal, "id": id, "index": index, "issue": issue},
@@ -403,13 +969,7 @@ class UpdateIssuesInJournal(CommandHandler):
     def __call__(self, id: str, issues: List[Dict]) -> None:
         session = self.Session()
         _journal = session.journals.fetch(id)
-
-        for issue in _journal.issues:
-            _journal.remove_issue(issue["id"])
-
-        for issue in issues:
-            _journal.add_issue(issue)
-
+        _journal.replace_issues(issues)
         session.journals.update(_journal)
         session.notify(
             Events.JOURNAL_ISSUES_UPDATED,
@@ -420,9 +980,7 @@ class UpdateIssuesInJournal(CommandHandler):
 class RemoveIssueFromJournal(CommandHandler):
     def __call__(self, id: str, issue: str) -> None:
         session = self.Session()
-        _journal = session.journals.fetch(id)
-        _journal.remove_issue(issue)
-        session.journals.update(_journal)
+        _journal = session.journals.remove_item(id, issue)
         session.notify(
             Events.ISSUE_REMOVED_FROM_JOURNAL,
             {"instance": _journal, "id": id, "issue": issue},
@@ -498,9 +1056,9 @@ class DocumentRenditions:
         return version.get("renditions", [])
 
     def data_bytes(self, version_index=-1, version_at=None):
-        return json.dumps(
+        return json_dumps(
             self.data(version_index=version_index, version_at=version_at)
-        ).encode("utf-8")
+        )
 
 
 class RegisterRenditionVersion(CommandHandler):
@@ -598,6 +1156,48 @@ def log_change(
     session.changes.add(change)
 
 
+def _monotonic_timestamps(now):
+    """Produz timestamps, no formato de `domain.utcnow`, estritamente
+    crescentes. O relógio `now` é lido a cada timestamp, e apenas os valores
+    que não sucedem o anterior, i.e., os empates, são incrementados em
+    1 microssegundo.
+    """
+    last = None
+    while True:
+        timestamp = datetime.fromisoformat(now().rstrip("Z"))
+        if last is not None and timestamp <= last:
+            timestamp = last + timedelta(microseconds=1)
+        last = timestamp
+        yield timestamp.isoformat(timespec="microseconds") + "Z"
+
+
+def log_changes(data, session, now=utcnow, entity="", compress=gzip.compress):
+    """Registra em lote as mudanças dos itens em `data["items"]`.
+
+    O conteúdo previamente serializado de cada item pode ser informado na
+    chave `data_bytes`, evitando que seja produzido novamente. Assim como em
+    `log_change`, os timestamps, utilizados como chave única dos registros de
+    mudança, são obtidos por meio da leitura do relógio a cada item, o que
+    ocorre apenas após a compressão de todos os conteúdos e imediatamente
+    antes do registro do lote.
+    """
+    changes = [
+        {
+            "entity": entity,
+            "id": item["id"],
+            "content_gz": compress(
+                item.get("data_bytes") or item["instance"].data_bytes()
+            ),
+            "content_type": item["instance"].data_type,
+        }
+        for item in data["items"]
+    ]
+    for change, timestamp in zip(changes, _monotonic_timestamps(now)):
+        change["timestamp"] = timestamp
+
+    session.changes.add_many(changes)
+
+
 DEFAULT_SUBSCRIBERS = [
     (Events.DOCUMENT_REGISTERED, functools.partial(log_change, entity="Document")),
     (
@@ -650,6 +1250,10 @@ DEFAULT_SUBSCRIBERS = [
         Events.ISSUE_DOCUMENTS_UPDATED,
         functools.partial(log_change, entity="DocumentsBundle"),
     ),
+    (
+        Events.DOCUMENTS_REGISTERED_IN_BULK,
+        functools.partial(log_changes, entity="Document"),
+    ),
 ]
 
 
@@ -674,14 +1278,29 @@ def get_handlers(
     return {
         "register_document": RegisterDocument(SessionWrapper),
         "register_document_version": RegisterDocumentVersion(SessionWrapper),
+        "register_documents": RegisterDocuments(SessionWrapper),
         "fetch_document_data": FetchDocumentData(SessionWrapper),
+        "fetch_documents_data": FetchDocumentsData(SessionWrapper),
+        "fetch_document_data_size": FetchDocumentDataSize(SessionWrapper),
+        "fetch_document_version": FetchDocumentVersion(SessionWrapper),
         "fetch_document_manifest": FetchDocumentManifest(SessionWrapper),
+        "fetch_raw_document_manifest": FetchRawDocumentManifest(SessionWrapper),
+        "fetch_document_validators": FetchDocumentValidators(SessionWrapper),
         "fetch_assets_list": FetchAssetsList(SessionWrapper),
+        "fetch_latest_document_version": FetchLatestDocumentVersion(SessionWrapper),
         "register_asset_version": RegisterAssetVersion(SessionWrapper),
         "diff_document_versions": DiffDocumentVersions(SessionWrapper),
         "sanitize_document_front": SanitizeDocumentFront(SessionWrapper),
         "create_documents_bundle": CreateDocumentsBundle(SessionWrapper),
         "fetch_documents_bundle": FetchDocumentsBundle(SessionWrapper),
+        "fetch_raw_documents_bundle": FetchRawDocumentsBundle(SessionWrapper),
+        "fetch_documents_bundle_validators": FetchDocumentsBundleValidators(
+            SessionWrapper
+        ),
+        "fetch_documents_bundles": FetchDocumentsBundles(SessionWrapper),
+        "fetch_documents_bundle_documents": FetchDocumentsBundleDocuments(
+            SessionWrapper
+        ),
         "update_documents_bundle_metadata": UpdateDocumentsBundleMetadata(
             SessionWrapper
         ),
@@ -696,6 +1315,11 @@ def get_handlers(
         ),
         "create_journal": CreateJournal(SessionWrapper),
         "fetch_journal": FetchJournal(SessionWrapper),
+        "fetch_raw_journal": FetchRawJournal(SessionWrapper),
+        "fetch_journal_validators": FetchJournalValidators(SessionWrapper),
+        "fetch_journals": FetchJournals(SessionWrapper),
+        "fetch_journal_expanded": FetchJournalExpanded(SessionWrapper),
+        "fetch_journal_issues": FetchJournalIssues(SessionWrapper),
         "update_journal_metadata": UpdateJournalMetadata(SessionWrapper),
         "add_issue_to_journal": AddIssueToJournal(SessionWrapper),
         "insert_issue_to_journal": InsertIssueToJournal(SessionWrapper),
@@ -37,6 +37,8 @@ setuptools.setup(
         "prometheus_client",
         "sentry-sdk",
     ],
+    extras_require={"fast": ["orjson"]},
+    tests_require=["webtest"],
     test_suite="tests",
     classifiers=[
         "Development Status :: 2 - Pre-Alpha",
@@ -1,9 +1,10 @@
 from collections import OrderedDict
+import hashlib
 
 import pymongo
 from bson.objectid import ObjectId
 
-from documentstore import interfaces, exceptions, domain
+from documentstore import interfaces, exceptions, domain, adapters
 
 
 class Session(interfaces.Session):
@@ -53,19 +54,95 @@ class InMemoryDataStore(interfaces.DataStore):
         else:
             raise exceptions.DoesNotExist()
 
+    def fetch_raw(self, id):
+        raw = domain.json_dumps(self.fetch(id).manifest)
+        return raw, hashlib.sha1(raw).hexdigest()
+
+    def fetch_validators(self, id):
+        _, revision = self.fetch_raw(id)
+        return revision, self._last_modified(self.fetch(id))
+
+    def fetch_many(self, ids):
+        return {
+            id: self.DomainClass(manifest=self._data_store[id])
+            for id in ids
+            if id in self._data_store
+        }
+
+    def write_many(self, operations):
+        results = []
+        for op, data in operations:
+            try:
+                getattr(self, op)(data)
+            except exceptions.AlreadyExists as exc:
+                results.append(exc)
+            else:
+                results.append(None)
+        return results
+
 
-class InMemoryDocumentStore(InMemoryDataStore):
+class InMemoryDocumentStore(InMemoryDataStore, interfaces.DocumentDataStore):
     DomainClass = domain.Document
 
+    def _last_modified(self, data):
+        return data.last_modified()
+
+    def fetch_latest_version(self, id):
+        latest = adapters.latest_version_view(self.fetch(id))
+        if latest is None:
+            raise ValueError("missing version for index: -1")
+        return latest
+
 
-class InMemoryDocumentsBundleStore(InMemoryDataStore):
+class InMemoryBundleDataStore(InMemoryDataStore, interfaces.BundleDataStore):
+    def _last_modified(self, data):
+        return data.manifest.get("updated", "")
+
+    def add_item(self, id, item, index=None):
+        manifest = self.fetch(id).manifest
+        if index is None:
+            manifest = domain.BundleManifest.add_item(manifest, item)
+        else:
+            manifest = domain.BundleManifest.insert_item(manifest, index, item)
+        self._data_store[id] = manifest
+        return self.DomainClass(manifest=manifest)
+
+    def remove_item(self, id, item_id):
+        manifest = domain.BundleManifest.remove_item(self.fetch(id).manifest, item_id)
+        self._data_store[id] = manifest
+        return self.DomainClass(manifest=manifest)
+
+    def fetch_slice(self, id, offset, limit, fields=None):
+        manifest = dict(self.fetch(id).manifest)
+        manifest["items"] = manifest["items"][offset : offset + limit]
+        if fields:
+            names = {field.split(".")[0] for field in fields}
+            manifest = {
+                name: value for name, value in manifest.items() if name in names
+            }
+        return manifest
+
+
+class InMemoryDocumentsBundleStore(InMemoryBundleDataStore):
     DomainClass = domain.DocumentsBundle
 
 
-class InMemoryJournalStore(InMemoryDataStore):
+class InMemoryJournalStore(InMemoryBundleDataStore):
     DomainClass = domain.Journal
 
 
+# obtido na importação, já que diversos testes substituem `domain.fetch_data`
+FETCH_DATA_CIRCUIT_BREAKER = domain.fetch_data.circuit_breaker
+
+
+def reset_circuit_breakers():
+    """Fecha os circuitos de acesso ao object store abertos por testes
+    anteriores, de maneira que o resultado de cada teste não dependa da ordem
+    de execução.
+    """
+    FETCH_DATA_CIRCUIT_BREAKER.reset()
+
+
 def document_registry_data_fixture(prefix=""):
     return {
         "data": f"https://raw.githubusercontent.com/scieloorg/packtools/master/tests/samples/{prefix}0034-8910-rsp-48-2-0347.xml",
@@ -193,6 +270,16 @@ class InMemoryChangesDataStore(interfaces.ChangesDataStore):
             self._timestamps[change["timestamp"]] = change
             self._ids[change["_id"]] = change
 
+    def add_many(self, changes: list):
+        duplicated = []
+        for change in changes:
+            try:
+                self.add(change)
+            except exceptions.AlreadyExists:
+                duplicated.append(change)
+        if duplicated:
+            raise exceptions.AlreadyExists()
+
     def filter(self, since: str = "", limit: int = 500):
 
         return [
@@ -223,6 +310,18 @@ class MongoDBCollectionStub:
             self._mongo_store[data["_id"]] = data
             self._timestamps.add(data["timestamp"])
 
+    def insert_many(self, data, ordered=True):
+        errors = []
+        for index, item in enumerate(data):
+            try:
+                self.insert_one(item)
+            except pymongo.errors.DuplicateKeyError:
+                errors.append({"index": index, "code": 11000, "errmsg": ""})
+                if ordered:
+                    break
+        if errors:
+            raise pymongo.errors.BulkWriteError({"writeErrors": errors})
+
     def find(self, query, sort=None, projection=None):
         since = query["timestamp"]["$gt"]
 
@@ -7,6 +7,9 @@ from . import apptesting
 
 
 class StoreTestMixin:
+    # argumentos esperados nas leituras dos manifestos
+    fetch_kwargs = {}
+
     def setUp(self):
         self.DBCollectionMock = Mock()
         self.DBCollectionMock.insert_one = Mock()
@@ -54,7 +57,39 @@ class StoreTestMixin:
         store = self.Adapter(self.DBCollectionMock)
         store.fetch("0034-8910-rsp-48-2")
         self.DBCollectionMock.find_one.assert_called_once_with(
-            {"_id": "0034-8910-rsp-48-2"}
+            {"_id": "0034-8910-rsp-48-2"}, **self.fetch_kwargs
+        )
+
+    def test_fetch_within_deadline_sets_max_time_ms(self):
+        manifest = apptesting.manifest_data_fixture()
+        self.DBCollectionMock.find_one.return_value = self.set_expected(manifest)
+        store = self.Adapter(self.DBCollectionMock)
+        with domain.deadline(2):
+            store.fetch("0034-8910-rsp-48-2")
+        max_time_ms = self.DBCollectionMock.find_one.call_args[1]["max_time_ms"]
+        self.assertTrue(0 < max_time_ms <= 2000)
+
+    def test_fetch_after_deadline_raises_DeadlineExceeded(self):
+        store = self.Adapter(self.DBCollectionMock)
+        with domain.deadline(-1):
+            self.assertRaises(
+                exceptions.DeadlineExceeded, store.fetch, "0034-8910-rsp-48-2"
+            )
+        self.DBCollectionMock.find_one.assert_not_called()
+
+    def test_fetch_raw(self):
+        manifest = apptesting.manifest_data_fixture()
+        self.DBCollectionMock.find_one.return_value = self.set_expected(manifest)
+        store = self.Adapter(self.DBCollectionMock)
+        raw, revision = store.fetch_raw("0034-8910-rsp-48-2")
+        self.assertEqual(json.loads(raw), manifest)
+        self.assertEqual(revision, adapters.revision(raw))
+
+    def test_fetch_raw_raises_exception_if_does_not_exist(self):
+        self.DBCollectionMock.find_one.return_value = None
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertRaises(
+            exceptions.DoesNotExist, store.fetch_raw, "0034-8910-rsp-48-2"
         )
 
     def test_fetch_returns_domain_instance(self):
@@ -83,6 +118,65 @@ class StoreTestMixin:
         data = self.DomainClass(id="0034-8910-rsp-48-2")
         self.assertRaises(exceptions.DoesNotExist, store.update, data)
 
+    def test_fetch_many(self):
+        manifest = apptesting.manifest_data_fixture()
+        manifest["_id"] = "0034-8910-rsp-48-2"
+        self.DBCollectionMock.find.return_value = [self.set_expected(manifest)]
+        store = self.Adapter(self.DBCollectionMock)
+        data = store.fetch_many(["0034-8910-rsp-48-2", "missing"])
+        self.DBCollectionMock.find.assert_called_once_with(
+            {"_id": {"$in": ["0034-8910-rsp-48-2", "missing"]}}, **self.fetch_kwargs
+        )
+        self.assertEqual(list(data.keys()), ["0034-8910-rsp-48-2"])
+        self.assertEqual(
+            data["0034-8910-rsp-48-2"].manifest["versions"], manifest["versions"]
+        )
+
+    def test_write_many(self):
+        import pymongo
+
+        store = self.Adapter(self.DBCollectionMock)
+        new = self.DomainClass(id="0034-8910-rsp-48-2")
+        existing = self.DomainClass(manifest=apptesting.manifest_data_fixture())
+        self.DBCollectionMock.bulk_write.return_value = Mock(matched_count=1)
+        self.assertEqual(
+            store.write_many([("add", new), ("update", existing)]), [None, None]
+        )
+        expected_existing = existing.manifest
+        expected_existing["_id"] = "0034-8910-rsp-48-2"
+        expected_new = new.manifest
+        expected_new["_id"] = "0034-8910-rsp-48-2"
+        self.DBCollectionMock.bulk_write.assert_called_once_with(
+            [
+                pymongo.InsertOne(self.set_expected(expected_new)),
+                pymongo.ReplaceOne(
+                    {"_id": "0034-8910-rsp-48-2"}, self.set_expected(expected_existing)
+                ),
+            ],
+            ordered=False,
+        )
+
+    def test_write_many_reports_errors_per_operation(self):
+        import pymongo
+
+        self.DBCollectionMock.bulk_write.side_effect = pymongo.errors.BulkWriteError(
+            {"writeErrors": [{"index": 1, "code": 11000, "errmsg": "dup"}]}
+        )
+        store = self.Adapter(self.DBCollectionMock)
+        results = store.write_many(
+            [
+                ("add", self.DomainClass(id="0034-8910-rsp-48-1")),
+                ("add", self.DomainClass(id="0034-8910-rsp-48-2")),
+            ]
+        )
+        self.assertIsNone(results[0])
+        self.assertIsInstance(results[1], exceptions.AlreadyExists)
+
+    def test_write_many_without_operations(self):
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertEqual(store.write_many([]), [])
+        self.DBCollectionMock.bulk_write.assert_not_called()
+
     def test_update_with_manifest_without__id(self):
         store = self.Adapter(self.DBCollectionMock)
         data = self.DomainClass(manifest={"_id": "1", "id": "0034-8910-rsp-48-2"})
@@ -92,6 +186,38 @@ class StoreTestMixin:
         )
 
 
+class LatestVersionViewTest(unittest.TestCase):
+    def test_assets_are_resolved_and_slugified(self):
+        document = domain.Document(manifest=apptesting.manifest_data_fixture())
+        latest = adapters.latest_version_view(document)
+        self.assertEqual(
+            latest["assets"],
+            [
+                {
+                    "slug": "0034-8910-rsp-48-2-0347-gf02-tiff",
+                    "id": "0034-8910-rsp-48-2-0347-gf02.tiff",
+                    "url": "http://www.scielo.br/img/revistas/rsp/v48n2/"
+                    "0034-8910-rsp-48-2-0347-gf02.tiff",
+                },
+                {
+                    "slug": "0034-8910-rsp-48-2-0347-gf02-en-tiff",
+                    "id": "0034-8910-rsp-48-2-0347-gf02-en.tiff",
+                    "url": "http://www.scielo.br/img/revistas/rsp/v48n2/"
+                    "0034-8910-rsp-48-2-0347-gf02-en.tiff",
+                },
+            ],
+        )
+
+    def test_documents_without_versions(self):
+        document = domain.Document(id="0034-8910-rsp-48-2")
+        self.assertIsNone(adapters.latest_version_view(document))
+
+    def test_deleted_documents(self):
+        document = domain.Document(id="0034-8910-rsp-48-2")
+        document.new_deleted_version()
+        self.assertTrue(adapters.latest_version_view(document)["deleted"])
+
+
 class DocumentsStoreTest(StoreTestMixin, unittest.TestCase):
     Adapter = adapters.DocumentStore
     DomainClass = domain.Document
@@ -105,25 +231,356 @@ class DocumentsStoreTest(StoreTestMixin, unittest.TestCase):
         Mais infos sobre a restrição do MongoDB para nomes de campos:
         https://docs.mongodb.com/manual/reference/limits/#Restrictions-on-Field-Names
         """
-        return {"_id": value.get("_id"), "document": json.dumps(value)}
+        document = domain.json_dumps(value)
+        return {
+            "_id": value.get("_id"),
+            "document": document.decode("utf-8"),
+            "revision": adapters.revision(document),
+            "latest": domain.json_dumps(
+                adapters.latest_version_view(domain.Document(manifest=value))
+            ).decode("utf-8"),
+            "last_modified": domain.Document(manifest=value).last_modified(),
+        }
+
+    def test_fetch_validators(self):
+        self.DBCollectionMock.find_one.return_value = {
+            "_id": "0034-8910-rsp-48-2",
+            "revision": "abc",
+            "last_modified": "2018-11-16T23:02:29.392990Z",
+        }
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertEqual(
+            store.fetch_validators("0034-8910-rsp-48-2"),
+            ("abc", "2018-11-16T23:02:29.392990Z"),
+        )
+        self.DBCollectionMock.find_one.assert_called_once_with(
+            {"_id": "0034-8910-rsp-48-2"},
+            projection={"revision": True, "last_modified": True},
+        )
+
+    def test_fetch_validators_of_documents_stored_without_them(self):
+        document = json.dumps(apptesting.manifest_data_fixture())
+        self.DBCollectionMock.find_one.side_effect = [
+            {"_id": "0034-8910-rsp-48-2"},
+            {"_id": "0034-8910-rsp-48-2", "document": document},
+        ]
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertEqual(
+            store.fetch_validators("0034-8910-rsp-48-2"),
+            (
+                adapters.revision(document.encode("utf-8")),
+                "2018-11-16T23:02:29.392990Z",
+            ),
+        )
+
+    def test_fetch_validators_raises_exception_if_does_not_exist(self):
+        self.DBCollectionMock.find_one.return_value = None
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertRaises(
+            exceptions.DoesNotExist, store.fetch_validators, "0034-8910-rsp-48-2"
+        )
+
+    def test_fetch_latest_version(self):
+        self.DBCollectionMock.find_one.return_value = {
+            "_id": "0034-8910-rsp-48-2",
+            "latest": '{"data": "https://url.to/xml", "assets": []}',
+        }
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertEqual(
+            store.fetch_latest_version("0034-8910-rsp-48-2"),
+            {"data": "https://url.to/xml", "assets": []},
+        )
+        self.DBCollectionMock.find_one.assert_called_once_with(
+            {"_id": "0034-8910-rsp-48-2"}, projection={"latest": True}
+        )
+
+    def test_fetch_latest_version_of_documents_stored_without_it(self):
+        manifest = apptesting.manifest_data_fixture()
+        self.DBCollectionMock.find_one.side_effect = [
+            {"_id": "0034-8910-rsp-48-2"},
+            {"_id": "0034-8910-rsp-48-2", "document": json.dumps(manifest)},
+        ]
+        store = self.Adapter(self.DBCollectionMock)
+        latest = store.fetch_latest_version("0034-8910-rsp-48-2")
+        self.assertEqual(latest["timestamp"], "2018-11-16T23:02:29.392990Z")
+
+    def test_fetch_latest_version_raises_exception_if_does_not_exist(self):
+        self.DBCollectionMock.find_one.return_value = None
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertRaises(
+            exceptions.DoesNotExist, store.fetch_latest_version, "0034-8910-rsp-48-2"
+        )
+
+    def test_fetch_latest_version_raises_exception_if_without_versions(self):
+        self.DBCollectionMock.find_one.return_value = {
+            "_id": "0034-8910-rsp-48-2",
+            "latest": "null",
+        }
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertRaises(ValueError, store.fetch_latest_version, "0034-8910-rsp-48-2")
+
+    def test_fetch_raw_does_not_decode_the_document(self):
+        self.DBCollectionMock.find_one.return_value = {
+            "_id": "0034-8910-rsp-48-2",
+            "document": '{"id": "0034-8910-rsp-48-2"}',
+            "revision": "abc",
+        }
+        store = self.Adapter(self.DBCollectionMock)
+        with patch.object(adapters.json, "loads") as mock_loads:
+            self.assertEqual(
+                store.fetch_raw("0034-8910-rsp-48-2"),
+                (b'{"id": "0034-8910-rsp-48-2"}', "abc"),
+            )
+            mock_loads.assert_not_called()
+
+    def test_fetch_raw_computes_missing_revision(self):
+        self.DBCollectionMock.find_one.return_value = {
+            "_id": "0034-8910-rsp-48-2",
+            "document": '{"id": "0034-8910-rsp-48-2"}',
+        }
+        store = self.Adapter(self.DBCollectionMock)
+        _, revision = store.fetch_raw("0034-8910-rsp-48-2")
+        self.assertEqual(revision, adapters.revision(b'{"id": "0034-8910-rsp-48-2"}'))
+
+
+class BundleStoreTestMixin(StoreTestMixin):
+    # a serialização armazenada não é lida junto ao manifesto
+    fetch_kwargs = {"projection": {"_json": False, "_revision": False}}
+
+    def test_fetch_validators(self):
+        self.DBCollectionMock.find_one.return_value = {
+            "_id": "xpto",
+            "_revision": "abc",
+            "updated": "2019-01-01T00:00:00.000000Z",
+        }
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertEqual(
+            store.fetch_validators("xpto"), ("abc", "2019-01-01T00:00:00.000000Z")
+        )
+        self.DBCollectionMock.find_one.assert_called_once_with(
+            {"_id": "xpto"}, projection={"_revision": True, "updated": True}
+        )
+
+    def test_fetch_validators_raises_exception_if_does_not_exist(self):
+        self.DBCollectionMock.find_one.return_value = None
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertRaises(exceptions.DoesNotExist, store.fetch_validators, "xpto")
+
+    def test_add_item(self):
+        import pymongo
 
+        manifest = {"id": "xpto", "items": [{"id": "1"}], "updated": "2019-01-01"}
+        self.DBCollectionMock.find_one_and_update.return_value = dict(
+            manifest, _id="xpto"
+        )
+        store = self.Adapter(self.DBCollectionMock)
+        data = store.add_item("xpto", {"id": "1"}, now=lambda: "2019-01-01")
+        self.DBCollectionMock.find_one_and_update.assert_called_once_with(
+            {"_id": "xpto", "items.id": {"$ne": "1"}},
+            {
+                "$push": {"items": {"$each": [{"id": "1"}]}},
+                "$set": {"updated": "2019-01-01"},
+                "$unset": {"_json": "", "_revision": ""},
+            },
+            **self.fetch_kwargs,
+            return_document=pymongo.ReturnDocument.AFTER,
+        )
+        self.assertIsInstance(data, self.DomainClass)
+        self.assertEqual(data.manifest, manifest)
+
+    def test_add_item_stores_the_new_serialization(self):
+        manifest = {"id": "xpto", "items": [{"id": "1"}], "updated": "2019-01-01"}
+        self.DBCollectionMock.find_one_and_update.return_value = dict(
+            manifest, _id="xpto"
+        )
+        store = self.Adapter(self.DBCollectionMock)
+        data = store.add_item("xpto", {"id": "1"}, now=lambda: "2019-01-01")
+        raw = domain.json_dumps(manifest)
+        self.DBCollectionMock.update_one.assert_called_once_with(
+            {"_id": "xpto", "updated": "2019-01-01", "_json": None},
+            {"$set": {"_json": raw, "_revision": adapters.revision(raw)}},
+        )
+        self.assertIs(data.data_bytes(), data.data_bytes())
+        self.assertEqual(data.data_bytes(), raw)
+
+    def test_add_item_within_deadline_sets_max_time_ms(self):
+        self.DBCollectionMock.find_one_and_update.return_value = {
+            "id": "xpto",
+            "items": [{"id": "1"}],
+            "updated": "2019-01-01",
+        }
+        store = self.Adapter(self.DBCollectionMock)
+        with domain.deadline(2):
+            store.add_item("xpto", {"id": "1"})
+        kwargs = self.DBCollectionMock.find_one_and_update.call_args[1]
+        self.assertTrue(0 < kwargs["max_time_ms"] <= 2000)
+        self.DBCollectionMock.update_one.assert_called_once()
+
+    def test_serialization_is_not_stored_after_the_deadline(self):
+        self.DBCollectionMock.find_one_and_update.return_value = {
+            "id": "xpto",
+            "items": [{"id": "1"}],
+            "updated": "2019-01-01",
+        }
+        store = self.Adapter(self.DBCollectionMock)
+        with patch.object(
+            domain,
+            "remaining_time",
+            side_effect=[1.5, exceptions.DeadlineExceeded("deadline exceeded")],
+        ):
+            data = store.add_item("xpto", {"id": "1"})
+        self.assertEqual(
+            self.DBCollectionMock.find_one_and_update.call_args[1]["max_time_ms"],
+            1500,
+        )
+        self.assertEqual(data.manifest["items"], [{"id": "1"}])
+        self.DBCollectionMock.update_one.assert_not_called()
+
+    def test_add_item_with_index(self):
+        self.DBCollectionMock.find_one_and_update.return_value = {
+            "id": "xpto",
+            "items": [{"id": "1"}],
+            "updated": "2019-01-01",
+        }
+        store = self.Adapter(self.DBCollectionMock)
+        store.add_item("xpto", {"id": "1"}, index=0)
+        _, update = self.DBCollectionMock.find_one_and_update.call_args[0]
+        self.assertEqual(
+            update["$push"], {"items": {"$each": [{"id": "1"}], "$position": 0}}
+        )
+
+    def test_add_item_raises_exception_if_item_already_exists(self):
+        self.DBCollectionMock.find_one_and_update.return_value = None
+        self.DBCollectionMock.find_one.return_value = {"_id": "xpto"}
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertRaises(exceptions.AlreadyExists, store.add_item, "xpto", {"id": "1"})
+
+    def test_add_item_raises_exception_if_does_not_exist(self):
+        self.DBCollectionMock.find_one_and_update.return_value = None
+        self.DBCollectionMock.find_one.return_value = None
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertRaises(exceptions.DoesNotExist, store.add_item, "xpto", {"id": "1"})
+
+    def test_add_item_raises_exception_if_item_has_no_id(self):
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertRaises(KeyError, store.add_item, "xpto", {"name": "1"})
+        self.DBCollectionMock.find_one_and_update.assert_not_called()
 
-class DocumentsBundleStoreTest(StoreTestMixin, unittest.TestCase):
+    def test_remove_item(self):
+        import pymongo
+
+        manifest = {"id": "xpto", "items": [], "updated": "2019-01-01"}
+        self.DBCollectionMock.find_one_and_update.return_value = manifest
+        store = self.Adapter(self.DBCollectionMock)
+        data = store.remove_item("xpto", "1", now=lambda: "2019-01-01")
+        self.DBCollectionMock.find_one_and_update.assert_called_once_with(
+            {"_id": "xpto", "items.id": "1"},
+            {
+                "$pull": {"items": {"id": "1"}},
+                "$set": {"updated": "2019-01-01"},
+                "$unset": {"_json": "", "_revision": ""},
+            },
+            **self.fetch_kwargs,
+            return_document=pymongo.ReturnDocument.AFTER,
+        )
+        self.assertEqual(data.manifest, manifest)
+
+    def test_remove_item_raises_exception_if_item_does_not_exist(self):
+        self.DBCollectionMock.find_one_and_update.return_value = None
+        self.DBCollectionMock.find_one.return_value = {"_id": "xpto"}
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertRaises(exceptions.DoesNotExist, store.remove_item, "xpto", "1")
+
+    def test_fetch_slice(self):
+        self.DBCollectionMock.find_one.return_value = {
+            "_id": "xpto",
+            "id": "xpto",
+            "items": [],
+        }
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertEqual(store.fetch_slice("xpto", 10, 5), {"id": "xpto", "items": []})
+        self.DBCollectionMock.find_one.assert_called_once_with(
+            {"_id": "xpto"},
+            projection={
+                "items": {"$slice": [10, 5]},
+                "_json": False,
+                "_revision": False,
+            },
+        )
+
+    def test_fetch_slice_with_fields(self):
+        self.DBCollectionMock.find_one.return_value = {"_id": "xpto", "id": "xpto"}
+        store = self.Adapter(self.DBCollectionMock)
+        store.fetch_slice("xpto", 0, 5, fields=["id", "items.id", "metadata.title"])
+        self.DBCollectionMock.find_one.assert_called_once_with(
+            {"_id": "xpto"},
+            projection={"id": True, "items": {"$slice": [0, 5]}, "metadata": True},
+        )
+
+    def test_fetch_slice_with_fields_without_items(self):
+        self.DBCollectionMock.find_one.return_value = {"_id": "xpto", "id": "xpto"}
+        store = self.Adapter(self.DBCollectionMock)
+        store.fetch_slice("xpto", 0, 5, fields=["id", "metadata"])
+        self.DBCollectionMock.find_one.assert_called_once_with(
+            {"_id": "xpto"}, projection={"id": True, "metadata": True}
+        )
+
+    def test_fetch_slice_raises_exception_if_does_not_exist(self):
+        self.DBCollectionMock.find_one.return_value = None
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertRaises(exceptions.DoesNotExist, store.fetch_slice, "xpto", 0, 5)
+
+
+    def test_fetch_raw_does_not_decode_the_manifest(self):
+        self.DBCollectionMock.find_one.return_value = {
+            "_id": "xpto",
+            "_json": b'{"id": "xpto"}',
+            "_revision": "abc",
+        }
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertEqual(store.fetch_raw("xpto"), (b'{"id": "xpto"}', "abc"))
+        self.DBCollectionMock.find_one.assert_called_once_with(
+            {"_id": "xpto"}, projection={"_json": True, "_revision": True}
+        )
+
+    def test_fetch_raw_serializes_manifests_stored_without_it(self):
+        self.DBCollectionMock.find_one.side_effect = [
+            {"_id": "xpto"},
+            {"_id": "xpto", "id": "xpto", "items": []},
+        ]
+        store = self.Adapter(self.DBCollectionMock)
+        raw, _ = store.fetch_raw("xpto")
+        self.assertEqual(json.loads(raw), {"id": "xpto", "items": []})
+
+    def test_redundant__id_is_not_read(self):
+        self.DBCollectionMock.find_one.return_value = {"_id": "xpto", "id": "xpto"}
+        store = self.Adapter(self.DBCollectionMock)
+        self.assertEqual(store.fetch("xpto").manifest, {"id": "xpto"})
+
+
+class DocumentsBundleStoreTest(BundleStoreTestMixin, unittest.TestCase):
 
     Adapter = adapters.DocumentsBundleStore
     DomainClass = domain.DocumentsBundle
 
     def set_expected(self, value):
-        return value
+        """
+        Junto ao manifesto é armazenada a sua serialização, da qual é omitido o
+        `_id` quando redundante.
+        """
+        raw = domain.json_dumps(
+            {k: v for k, v in value.items() if not (k == "_id" and v == value["id"])}
+        )
+        return dict(value, _json=raw, _revision=adapters.revision(raw))
 
 
-class JournalStoreTest(StoreTestMixin, unittest.TestCase):
+class JournalStoreTest(BundleStoreTestMixin, unittest.TestCase):
 
     Adapter = adapters.JournalStore
     DomainClass = domain.Journal
 
     def set_expected(self, value):
-        return value
+        return DocumentsBundleStoreTest.set_expected(self, value)
 
 
 class SessionTestMixin:
@@ -375,6 +832,54 @@ class ChangesStoreTestMixin:
 
         self.assertEqual(store.fetch(str(changes[1]["_id"])), changes[1])
 
+    def test_add_many(self):
+        store = self.Store()
+        changes = [
+            {
+                "timestamp": "2018-08-05T23:03:44.971230Z",
+                "id": "0034-8910-rsp-48-2-0347",
+                "entity": "document",
+            },
+            {
+                "timestamp": "2018-08-05T23:03:44.971231Z",
+                "id": "0034-8910-rsp-48-2-0348",
+                "entity": "document",
+            },
+        ]
+        self.assertIsNone(store.add_many(changes))
+        self.assertEqual(len(list(store.filter())), 2)
+
+    def test_add_many_raises_already_exists_with_duplicated_timestamps(self):
+        store = self.Store()
+        store.add(
+            {
+                "timestamp": "2018-08-05T23:03:44.971230Z",
+                "id": "0034-8910-rsp-48-2-0347",
+                "entity": "document",
+            }
+        )
+        self.assertRaises(
+            exceptions.AlreadyExists,
+            store.add_many,
+            [
+                {
+                    "timestamp": "2018-08-05T23:03:44.971230Z",
+                    "id": "0034-8910-rsp-48-2-0348",
+                    "entity": "document",
+                },
+                {
+                    "timestamp": "2018-08-05T23:03:44.971231Z",
+                    "id": "0034-8910-rsp-48-2-0349",
+                    "entity": "document",
+                },
+            ],
+        )
+        # as demais mudanças são inseridas
+        self.assertEqual(
+            [c["id"] for c in store.filter()],
+            ["0034-8910-rsp-48-2-0347", "0034-8910-rsp-48-2-0349"],
+        )
+
 
 class InMemoryChangesStoreTest(ChangesStoreTestMixin, unittest.TestCase):
     Store = apptesting.InMemoryChangesDataStore
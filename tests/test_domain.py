@@ -1,8 +1,12 @@
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest import mock
 import functools
 from copy import deepcopy
 import datetime
+import json
+import time
 
 from documentstore import domain, exceptions
 
@@ -328,6 +332,83 @@ class DocumentTests(unittest.TestCase):
         expected = {"deleted": True, "timestamp": "2018-08-05T23:30:29.392990Z"}
         self.assertEqual(document.version_at("2018-08-05T23:30:29Z"), expected)
 
+    def test_version_at_accepts_fractions_of_seconds(self):
+        document = self.make_one()
+        self.assertEqual(
+            document.version_at("2018-08-05T23:30:29.392990Z")["data"],
+            "/rawfiles/2d3ad9c6bc656/0034-8910-rsp-48-2-0275.xml",
+        )
+
+    def test_version_timestamp_at_considers_assets_until_timestamp(self):
+        document = self.make_one()
+        self.assertEqual(
+            document.version_timestamp_at("2018-08-05T23:05:00Z"),
+            "2018-08-05T23:03:44.971230Z",
+        )
+        self.assertEqual(
+            document.version_timestamp_at("2018-08-05T23:10:00Z"),
+            "2018-08-05T23:08:41.590174Z",
+        )
+
+    def test_version_timestamp_at_resolves_to_the_same_version(self):
+        document = self.make_one()
+        for timestamp in ("2018-08-05T23:05:00Z", "2018-08-05", "2018-08-06"):
+            with self.subTest(timestamp=timestamp):
+                canonical = document.version_timestamp_at(timestamp)
+                self.assertEqual(
+                    document.version_at(canonical), document.version_at(timestamp)
+                )
+
+    def test_version_timestamp_at_prior_to_data_registration(self):
+        document = self.make_one()
+        self.assertRaises(
+            ValueError, lambda: document.version_timestamp_at("2018-08-05T23:01Z")
+        )
+
+    def test_past_version_at_is_immutable(self):
+        document = self.make_one()
+        self.assertTrue(
+            document.is_immutable(
+                version_at="2018-08-05", now=lambda: "2018-08-06T00:00:00.000000Z"
+            )
+        )
+
+    def test_future_version_at_is_mutable(self):
+        document = self.make_one()
+        self.assertFalse(
+            document.is_immutable(
+                version_at="2018-08-05", now=lambda: "2018-08-05T23:40:00.000000Z"
+            )
+        )
+
+    def test_only_versions_prior_to_the_latest_are_immutable(self):
+        document = self.make_one()
+        self.assertTrue(document.is_immutable(version_index=0))
+        self.assertTrue(document.is_immutable(version_index=-2))
+        self.assertFalse(document.is_immutable(version_index=1))
+        self.assertFalse(document.is_immutable(version_index=-1))
+        self.assertFalse(document.is_immutable(version_index=2))
+
+    def test_last_modified_considers_assets(self):
+        document = self.make_one()
+        self.assertEqual(document.last_modified(), "2018-08-05T23:30:29.392995Z")
+
+    def test_last_modified_considers_renditions(self):
+        document = self.make_one()
+        document.new_rendition_version(
+            "0034-8910-rsp-48-2-0275-en.pdf",
+            "/rawfiles/7ca9f9b2687cb/0034-8910-rsp-48-2-0275-en.pdf",
+            "application/pdf",
+            "en",
+            23456,
+        )
+        rendition = document.manifest["versions"][-1]["renditions"][0]
+        self.assertEqual(document.last_modified(), rendition["data"][-1]["timestamp"])
+
+    def test_last_modified_without_versions(self):
+        document = domain.Document(id="0034-8910-rsp-48-2-0275")
+        self.assertEqual(document.last_modified(), "")
+
     def test_add_new_rendition(self):
         document = self.make_one()
         self.assertEqual(len(document.version()["renditions"]), 0)
@@ -820,6 +901,86 @@ class BundleManifestTest(UnittestMixin, unittest.TestCase):
             [{"id": "/documents/0034-8910-rsp-48-2-0275"}], bundle_manifest["items"]
         )
 
+    def test_is_equivalent_ignores_updated(self):
+        bundle = new_bundle("0034-8910-rsp-48-2")
+        other = domain.BundleManifest.set_metadata(
+            bundle, "volume", "", now=lambda: "2018-08-05T22:34:07.795151Z"
+        )
+        bundle = domain.BundleManifest.set_metadata(bundle, "volume", "")
+        self.assertTrue(domain.BundleManifest.is_equivalent(bundle, other))
+
+    def test_is_equivalent_detects_metadata_changes(self):
+        bundle = new_bundle("0034-8910-rsp-48-2")
+        other = domain.BundleManifest.set_metadata(bundle, "volume", "25")
+        self.assertFalse(domain.BundleManifest.is_equivalent(bundle, other))
+
+    def test_is_equivalent_detects_items_changes(self):
+        bundle = new_bundle("0034-8910-rsp-48-2")
+        other = domain.BundleManifest.add_item(bundle, {"id": "doc-1"})
+        self.assertFalse(domain.BundleManifest.is_equivalent(bundle, other))
+
+    def test_is_equivalent_treats_tuples_and_lists_alike(self):
+        bundle = new_bundle("0034-8910-rsp-48-2")
+        bundle = domain.BundleManifest.set_metadata(
+            bundle, "sponsors", ({"name": "FAPESP"},), now=fake_utcnow
+        )
+        other = domain.BundleManifest.set_metadata(
+            bundle, "sponsors", [{"name": "FAPESP"}], now=fake_utcnow
+        )
+        self.assertTrue(domain.BundleManifest.is_equivalent(bundle, other))
+
+    def test_replace_items(self):
+        bundle = new_bundle("0034-8910-rsp-48-2")
+        bundle = domain.BundleManifest.add_item(bundle, {"id": "doc-1"})
+        bundle = domain.BundleManifest.replace_items(
+            bundle,
+            [{"id": "doc-2"}, [("id", "doc-1"), ("order", "2")]],
+            now=lambda: "2018-08-05T22:34:07.795151Z",
+        )
+        self.assertEqual(
+            bundle["items"], [{"id": "doc-2"}, {"id": "doc-1", "order": "2"}]
+        )
+        self.assertEqual(bundle["updated"], "2018-08-05T22:34:07.795151Z")
+
+    def test_replace_items_does_not_modify_the_original(self):
+        bundle = new_bundle("0034-8910-rsp-48-2")
+        bundle = domain.BundleManifest.add_item(bundle, {"id": "doc-1"})
+        domain.BundleManifest.replace_items(bundle, [{"id": "doc-2"}])
+        self.assertEqual(bundle["items"], [{"id": "doc-1"}])
+
+    def test_replace_items_raises_already_exists_with_duplicated_ids(self):
+        bundle = new_bundle("0034-8910-rsp-48-2")
+        self._assert_raises_with_message(
+            exceptions.AlreadyExists,
+            'cannot add item "doc-1" in bundle: the item id already exists',
+            domain.BundleManifest.replace_items,
+            bundle,
+            [{"id": "doc-1"}, {"id": "doc-2"}, {"id": "doc-1"}],
+        )
+
+    def test_replace_items_requires_id(self):
+        bundle = new_bundle("0034-8910-rsp-48-2")
+        self.assertRaises(
+            KeyError, domain.BundleManifest.replace_items, bundle, [{"order": "1"}]
+        )
+
+    def test_set_metadata_many(self):
+        bundle = new_bundle("0034-8910-rsp-48-2")
+        bundle = domain.BundleManifest.set_metadata_many(
+            bundle,
+            {"volume": "25", "number": "2"},
+            now=lambda: "2018-08-05T22:34:07.795151Z",
+        )
+        self.assertEqual(bundle["metadata"], {"volume": "25", "number": "2"})
+        self.assertEqual(bundle["updated"], "2018-08-05T22:34:07.795151Z")
+
+    def test_set_metadata_many_returns_same_bundle_if_unchanged(self):
+        bundle = new_bundle("0034-8910-rsp-48-2")
+        bundle = domain.BundleManifest.set_metadata(bundle, "volume", "25")
+        self.assertIs(
+            domain.BundleManifest.set_metadata_many(bundle, {"volume": "25"}), bundle
+        )
+
 
 class DocumentsBundleTest(UnittestMixin, unittest.TestCase):
     def setUp(self):
@@ -832,6 +993,59 @@ class DocumentsBundleTest(UnittestMixin, unittest.TestCase):
         )
         self.addCleanup(datetime_patcher.stop)
 
+    def test_set_metadata_many(self):
+        documents_bundle = domain.DocumentsBundle(id="0034-8910-rsp-48-2")
+        self.assertTrue(
+            documents_bundle.set_metadata_many(
+                {"publication_year": 2018, "volume": 25, "unknown": "0"}
+            )
+        )
+        self.assertEqual(
+            documents_bundle.manifest["metadata"],
+            {"publication_year": "2018", "volume": "25"},
+        )
+
+    def test_data_bytes_is_serialized_once(self):
+        documents_bundle = domain.DocumentsBundle(id="0034-8910-rsp-48-2")
+        with mock.patch.object(domain, "json_dumps", wraps=domain.json_dumps) as dumps:
+            data = documents_bundle.data_bytes()
+            self.assertIs(documents_bundle.data_bytes(), data)
+            dumps.assert_called_once()
+
+    def test_data_bytes_follows_manifest_changes(self):
+        documents_bundle = domain.DocumentsBundle(id="0034-8910-rsp-48-2")
+        documents_bundle.data_bytes()
+        documents_bundle.volume = "25"
+        self.assertEqual(
+            json.loads(documents_bundle.data_bytes())["metadata"], {"volume": "25"}
+        )
+
+    def test_set_metadata_many_copies_manifest_once(self):
+        documents_bundle = domain.DocumentsBundle(id="0034-8910-rsp-48-2")
+        with mock.patch.object(
+            domain, "deepcopy", wraps=domain.deepcopy
+        ) as mock_deepcopy:
+            documents_bundle.set_metadata_many(
+                {"publication_year": 2018, "volume": 25, "number": 2}
+            )
+            mock_deepcopy.assert_called_once()
+
+    def test_set_metadata_many_is_all_or_nothing(self):
+        documents_bundle = domain.DocumentsBundle(id="0034-8910-rsp-48-2")
+        self.assertRaises(
+            ValueError,
+            documents_bundle.set_metadata_many,
+            {"volume": 25, "publication_year": "invalid"},
+        )
+        self.assertEqual(documents_bundle.manifest["metadata"], {})
+        documents_bundle.volume = 26
+        self.assertEqual(documents_bundle.volume, "26")
+
+    def test_set_metadata_many_returns_false_if_unchanged(self):
+        documents_bundle = domain.DocumentsBundle(id="0034-8910-rsp-48-2")
+        documents_bundle.volume = 25
+        self.assertFalse(documents_bundle.set_metadata_many({"volume": 25}))
+
     def test_manifest_is_generated_on_init(self):
         documents_bundle = domain.DocumentsBundle(id="0034-8910-rsp-48-2")
         self.assertTrue(isinstance(documents_bundle.manifest, dict))
@@ -1145,6 +1359,64 @@ class JournalTest(UnittestMixin, unittest.TestCase):
         )
         self.addCleanup(datetime_patcher.stop)
 
+    def test_set_metadata_many(self):
+        journal = domain.Journal(id="0034-8910-rsp-48-2")
+        self.assertTrue(
+            journal.set_metadata_many(
+                {"title": "Title", "subject_areas": ["Engineering"]}
+            )
+        )
+        self.assertEqual(journal.title, "Title")
+        self.assertEqual(journal.subject_areas, ("Engineering",))
+
+    def test_set_metadata_many_returns_false_if_unchanged(self):
+        journal = domain.Journal(id="0034-8910-rsp-48-2")
+        journal.sponsors = [{"name": "FAPESP"}]
+        self.assertFalse(journal.set_metadata_many({"sponsors": [{"name": "FAPESP"}]}))
+
+    def test_set_metadata_many_sets_components_in_the_same_copy(self):
+        journal = domain.Journal(id="0034-8910-rsp-48-2")
+        self.assertTrue(
+            journal.set_metadata_many(
+                {"title": "Title", "provisional": "provisional-id"}
+            )
+        )
+        self.assertEqual(journal.title, "Title")
+        self.assertEqual(journal.provisional, "provisional-id")
+
+    def test_set_metadata_many_with_components_is_all_or_nothing(self):
+        journal = domain.Journal(id="0034-8910-rsp-48-2")
+        self.assertRaises(
+            TypeError,
+            journal.set_metadata_many,
+            {
+                "title": "Title",
+                "provisional": "provisional-id",
+                "ahead_of_print_bundle": "aop-id",
+                "sponsors": 1,
+            },
+        )
+        self.assertEqual(journal.title, "")
+        self.assertEqual(journal.provisional, "")
+        self.assertEqual(journal.ahead_of_print_bundle, "")
+
+    def test_set_metadata_many_applies_components_when_metadata_is_unchanged(self):
+        journal = domain.Journal(id="0034-8910-rsp-48-2")
+        journal.title = "Title"
+        self.assertTrue(
+            journal.set_metadata_many({"title": "Title", "provisional": "prov-id"})
+        )
+        self.assertEqual(journal.provisional, "prov-id")
+        self.assertFalse(
+            journal.set_metadata_many({"title": "Title", "provisional": "prov-id"})
+        )
+
+    def test_metadata_is_set_immediately_outside_set_metadata_many(self):
+        journal = domain.Journal(id="0034-8910-rsp-48-2")
+        self.assertIsNone(journal._pending_metadata)
+        journal.ahead_of_print_bundle = "aop-id"
+        self.assertEqual(journal.manifest["aop"], "aop-id")
+
     def test_manifest_is_generated_on_init(self):
         journal = domain.Journal(id="0034-8910-rsp-48-2")
         self.assertTrue(isinstance(journal.manifest, dict))
@@ -1974,3 +2246,671 @@ class RetryGracefullyDecoratorTests(unittest.TestCase):
 
         calls = [mock.call(1.2 ** i) for i in range(1, 3)]
         retry_gracefully._sleep.assert_has_calls(calls)
+
+    def test_open_circuit_is_not_retried(self):
+        retry_gracefully = domain.retry_gracefully(max_retries=2, backoff_factor=0.001)
+
+        failing_obj = mock.Mock(side_effect=exceptions.CircuitOpenError("open"))
+        failing_obj.__qualname__ = "failing_function"
+        decorated_obj = retry_gracefully(failing_obj)
+        self.assertRaises(exceptions.CircuitOpenError, decorated_obj)
+        self.assertEqual(failing_obj.call_count, 1)
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 0
+        self.states = []
+        self.breaker = domain.CircuitBreaker(
+            failure_threshold=2,
+            reset_timeout=10,
+            on_change=self.states.append,
+            clock=lambda: self.now,
+        )
+
+    def fail(self, times=1):
+        for _ in range(times):
+            self.breaker.before_call()
+            self.breaker.on_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.fail(2)
+        self.assertEqual(self.breaker.state, domain.CircuitBreaker.OPEN)
+        self.assertRaises(exceptions.CircuitOpenError, self.breaker.before_call)
+
+    def test_successes_reset_the_failure_count(self):
+        self.fail()
+        self.breaker.on_success()
+        self.fail()
+        self.assertEqual(self.breaker.state, domain.CircuitBreaker.CLOSED)
+
+    def test_open_circuit_informs_when_to_retry(self):
+        self.fail(2)
+        self.now = 4
+        with self.assertRaises(exceptions.CircuitOpenError) as exc:
+            self.breaker.before_call()
+        self.assertEqual(exc.exception.retry_after, 6)
+
+    def test_allows_a_single_probe_after_reset_timeout(self):
+        self.fail(2)
+        self.now = 10
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, domain.CircuitBreaker.HALF_OPEN)
+        self.assertRaises(exceptions.CircuitOpenError, self.breaker.before_call)
+
+    def test_successful_probe_closes_the_circuit(self):
+        self.fail(2)
+        self.now = 10
+        self.breaker.before_call()
+        self.breaker.on_success()
+        self.assertEqual(self.breaker.state, domain.CircuitBreaker.CLOSED)
+        self.breaker.before_call()
+
+    def test_failed_probe_reopens_the_circuit(self):
+        self.fail(2)
+        self.now = 10
+        self.fail()
+        self.assertEqual(self.breaker.state, domain.CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.opened_at, 10)
+
+    def test_state_changes_are_reported(self):
+        self.fail(2)
+        self.now = 10
+        self.breaker.before_call()
+        self.breaker.on_success()
+        self.assertEqual(
+            self.states,
+            [
+                domain.CircuitBreaker.OPEN,
+                domain.CircuitBreaker.HALF_OPEN,
+                domain.CircuitBreaker.CLOSED,
+            ],
+        )
+
+
+class CircuitBreakerDecoratorTests(unittest.TestCase):
+    def setUp(self):
+        self.circuit_breaker = domain.circuit_breaker(
+            failure_threshold=1, reset_timeout=60
+        )
+
+    def test_circuits_are_kept_per_host(self):
+        failing_obj = mock.Mock(side_effect=exceptions.RetryableError())
+        decorated_obj = self.circuit_breaker(failing_obj)
+        self.assertRaises(
+            exceptions.RetryableError, decorated_obj, "http://a.example/x.xml"
+        )
+        self.assertRaises(
+            exceptions.CircuitOpenError, decorated_obj, "http://a.example/y.xml"
+        )
+        self.assertRaises(
+            exceptions.RetryableError, decorated_obj, "http://b.example/x.xml"
+        )
+        self.assertEqual(failing_obj.call_count, 2)
+
+    def test_non_retryable_errors_are_not_failures(self):
+        failing_obj = mock.Mock(side_effect=exceptions.NonRetryableError())
+        decorated_obj = self.circuit_breaker(failing_obj)
+        for _ in range(3):
+            self.assertRaises(
+                exceptions.NonRetryableError, decorated_obj, "http://a.example/x.xml"
+            )
+        self.assertEqual(failing_obj.call_count, 3)
+
+    def test_other_errors_do_not_change_the_state(self):
+        failing_obj = mock.Mock(side_effect=ValueError())
+        decorated_obj = self.circuit_breaker(failing_obj)
+        for _ in range(3):
+            self.assertRaises(ValueError, decorated_obj, "http://a.example/x.xml")
+        self.assertEqual(failing_obj.call_count, 3)
+        breaker = self.circuit_breaker.get("a.example")
+        self.assertEqual(breaker.state, domain.CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.failures, 0)
+
+    def test_half_open_probe_is_released_by_other_errors(self):
+        breaker = self.circuit_breaker.get("a.example")
+        breaker.before_call()
+        breaker.on_failure()
+        breaker.opened_at -= 60
+        failing_obj = mock.Mock(side_effect=[ValueError(), b"<article/>"])
+        decorated_obj = self.circuit_breaker(failing_obj)
+        self.assertRaises(ValueError, decorated_obj, "http://a.example/x.xml")
+        self.assertEqual(decorated_obj("http://a.example/x.xml"), b"<article/>")
+        self.assertEqual(breaker.state, domain.CircuitBreaker.CLOSED)
+
+    def test_reset_closes_every_circuit(self):
+        failing_obj = mock.Mock(side_effect=exceptions.RetryableError())
+        decorated_obj = self.circuit_breaker(failing_obj)
+        self.assertRaises(
+            exceptions.RetryableError, decorated_obj, "http://d.example/x.xml"
+        )
+        self.circuit_breaker.reset()
+        gauge = domain.OBJECTSTORE_CIRCUIT_STATE.labels("d.example")
+        self.assertEqual(gauge._value.get(), domain.CircuitBreaker.CLOSED)
+        self.assertRaises(
+            exceptions.RetryableError, decorated_obj, "http://d.example/x.xml"
+        )
+        self.assertEqual(failing_obj.call_count, 2)
+
+    def test_state_is_exported(self):
+        failing_obj = mock.Mock(side_effect=exceptions.RetryableError())
+        decorated_obj = self.circuit_breaker(failing_obj)
+        self.assertRaises(
+            exceptions.RetryableError, decorated_obj, "http://c.example/x.xml"
+        )
+        gauge = domain.OBJECTSTORE_CIRCUIT_STATE.labels("c.example")
+        self.assertEqual(gauge._value.get(), domain.CircuitBreaker.OPEN)
+
+    def test_fetch_data_fails_fast_while_open(self):
+        breaker = domain.fetch_data.circuit_breaker.get("dead.example")
+        self.addCleanup(domain.fetch_data.circuit_breaker.reset)
+        for _ in range(breaker.failure_threshold):
+            breaker.before_call()
+            breaker.on_failure()
+        with mock.patch("documentstore.domain.requests.get") as mock_get:
+            self.assertRaises(
+                exceptions.CircuitOpenError,
+                domain.fetch_data,
+                "http://dead.example/x.xml",
+            )
+        mock_get.assert_not_called()
+
+
+class DeadlineTests(unittest.TestCase):
+    def test_no_deadline_by_default(self):
+        self.assertIsNone(domain.remaining_time())
+
+    def test_remaining_time_within_block(self):
+        with domain.deadline(10, clock=lambda: 100):
+            self.assertEqual(domain.remaining_time(clock=lambda: 104), 6)
+        self.assertIsNone(domain.remaining_time())
+
+    def test_exhausted_deadline_raises(self):
+        with domain.deadline(10, clock=lambda: 100):
+            self.assertRaises(
+                exceptions.DeadlineExceeded, domain.remaining_time, clock=lambda: 110
+            )
+
+    def test_nested_blocks_keep_the_shortest_deadline(self):
+        with domain.deadline(5, clock=lambda: 100):
+            with domain.deadline(10, clock=lambda: 100):
+                self.assertEqual(domain.remaining_time(clock=lambda: 100), 5)
+            with domain.deadline(None):
+                self.assertEqual(domain.remaining_time(clock=lambda: 100), 5)
+
+    def test_retries_give_up_when_deadline_is_shorter_than_backoff(self):
+        retry_gracefully = domain.retry_gracefully(max_retries=2, backoff_factor=10)
+        retry_gracefully._sleep = mock.MagicMock(return_value=None)
+
+        failing_obj = mock.Mock(side_effect=exceptions.RetryableError())
+        failing_obj.__qualname__ = "failing_function"
+        decorated_obj = retry_gracefully(failing_obj)
+        with domain.deadline(5):
+            self.assertRaises(exceptions.DeadlineExceeded, decorated_obj)
+        self.assertEqual(failing_obj.call_count, 1)
+        retry_gracefully._sleep.assert_not_called()
+
+
+class FetchDataDeadlineTests(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(domain.fetch_data.circuit_breaker.reset)
+
+    def test_timeout_is_bound_by_the_deadline(self):
+        with mock.patch("documentstore.domain.requests.get") as mock_get:
+            with domain.deadline(0.5):
+                domain.fetch_data("http://deadline.example/x.xml", timeout=2)
+        self.assertLessEqual(mock_get.call_args[1]["timeout"], 0.5)
+
+    def test_timeout_bound_by_the_deadline_raises_DeadlineExceeded(self):
+        with mock.patch(
+            "documentstore.domain.requests.get",
+            side_effect=domain.requests.exceptions.ReadTimeout(),
+        ) as mock_get:
+            with domain.deadline(0.5):
+                self.assertRaises(
+                    exceptions.DeadlineExceeded,
+                    domain.fetch_data,
+                    "http://deadline.example/x.xml",
+                )
+        mock_get.assert_called_once()
+
+    def test_exhausted_deadline_does_not_open_the_circuit(self):
+        breaker = domain.fetch_data.circuit_breaker.get("deadline.example")
+        with mock.patch(
+            "documentstore.domain.requests.get",
+            side_effect=domain.requests.exceptions.ReadTimeout(),
+        ):
+            for _ in range(breaker.failure_threshold):
+                with domain.deadline(0.5):
+                    self.assertRaises(
+                        exceptions.DeadlineExceeded,
+                        domain.fetch_data,
+                        "http://deadline.example/x.xml",
+                    )
+        self.assertEqual(breaker.state, domain.CircuitBreaker.CLOSED)
+
+
+class SingleflightDecoratorTests(unittest.TestCase):
+    def setUp(self):
+        self.singleflight = domain.singleflight()
+        self.release = threading.Event()
+        self.calls = []
+
+    def blocking(self, result=None, exc=None):
+        def func(url, *args, **kwargs):
+            self.calls.append(url)
+            self.release.wait(5)
+            if exc is not None:
+                raise exc
+            return result
+
+        return self.singleflight(func)
+
+    def run_concurrently(self, decorated_obj, key, followers=3):
+        results = []
+
+        def call():
+            try:
+                results.append(decorated_obj(key))
+            except Exception as exc:
+                results.append(exc)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        while key not in self.singleflight.flights:
+            pass
+        threads = [threading.Thread(target=call) for _ in range(followers)]
+        for thread in threads:
+            thread.start()
+        while domain.OBJECTSTORE_COALESCED_WAITERS._value.get() < followers:
+            pass
+        self.release.set()
+        for thread in [leader] + threads:
+            thread.join()
+        return results
+
+    def test_concurrent_calls_are_coalesced(self):
+        decorated_obj = self.blocking(result=b"<article/>")
+        results = self.run_concurrently(decorated_obj, "http://a.example/x.xml")
+        self.assertEqual(self.calls, ["http://a.example/x.xml"])
+        self.assertEqual(results, [b"<article/>"] * 4)
+        self.assertEqual(self.singleflight.flights, {})
+
+    def test_exceptions_are_shared(self):
+        exc = exceptions.NonRetryableError("not found")
+        decorated_obj = self.blocking(exc=exc)
+        results = self.run_concurrently(decorated_obj, "http://a.example/x.xml")
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(results, [exc] * 4)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        self.release.set()
+        decorated_obj = self.blocking(result=b"<article/>")
+        decorated_obj("http://a.example/x.xml")
+        decorated_obj("http://a.example/x.xml")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_coalesced_requests_are_counted(self):
+        before = domain.OBJECTSTORE_COALESCED_REQUESTS_TOTAL._value.get()
+        decorated_obj = self.blocking(result=b"<article/>")
+        self.run_concurrently(decorated_obj, "http://a.example/x.xml", followers=2)
+        self.assertEqual(
+            domain.OBJECTSTORE_COALESCED_REQUESTS_TOTAL._value.get(), before + 2
+        )
+
+    def test_waiters_observe_the_deadline(self):
+        decorated_obj = self.blocking(result=b"<article/>")
+        leader = threading.Thread(
+            target=decorated_obj, args=("http://a.example/x.xml",)
+        )
+        leader.start()
+        self.addCleanup(leader.join)
+        self.addCleanup(self.release.set)
+        while "http://a.example/x.xml" not in self.singleflight.flights:
+            pass
+        with domain.deadline(0.01):
+            self.assertRaises(
+                exceptions.DeadlineExceeded, decorated_obj, "http://a.example/x.xml"
+            )
+
+    def test_waiters_retry_when_the_leader_exceeds_its_deadline(self):
+        outcomes = [exceptions.DeadlineExceeded(), b"<article/>"]
+
+        def func(url):
+            self.calls.append(url)
+            self.release.wait(5)
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        decorated_obj = self.singleflight(func)
+        results = self.run_concurrently(
+            decorated_obj, "http://a.example/x.xml", followers=1
+        )
+        self.assertEqual(len(self.calls), 2)
+        self.assertIn(b"<article/>", results)
+        self.assertTrue(
+            any(isinstance(r, exceptions.DeadlineExceeded) for r in results)
+        )
+
+    def test_fetch_data_is_coalesced(self):
+        self.singleflight = domain.fetch_data.singleflight
+        self.addCleanup(domain.fetch_data.circuit_breaker.reset)
+
+        def get(url, timeout):
+            self.calls.append(url)
+            self.release.wait(5)
+            return mock.Mock(content=b"<article/>")
+
+        with mock.patch("documentstore.domain.requests.get", side_effect=get):
+            results = self.run_concurrently(
+                domain.fetch_data, "http://coalesced.example/x.xml"
+            )
+        self.assertEqual(self.calls, ["http://coalesced.example/x.xml"])
+        self.assertEqual(results, [b"<article/>"] * 4)
+
+
+class LatencyInjectingHandler(BaseHTTPRequestHandler):
+    """Responde às requisições após o atraso, em segundos, definido para cada
+    requisição em `server.delays`.
+    """
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+            delay = self.server.delays.pop(0) if self.server.delays else 0
+        self.server.released.wait(delay)
+        body = b"<article/>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HedgingPolicyTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), LatencyInjectingHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.released = threading.Event()
+        self.server.delays = []
+        self.server.requests = 0
+        thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.01}
+        )
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(self.server.released.set)
+        self.url = "http://127.0.0.1:%s/article.xml" % self.server.server_port
+
+    def get(self, policy):
+        start = time.monotonic()
+        response = policy(domain.requests.get, self.url, timeout=5)
+        return response.content, time.monotonic() - start
+
+    def test_slow_requests_are_hedged(self):
+        self.server.delays = [5]
+        policy = domain.HedgingPolicy(budget=1, min_delay=0.05)
+        content, elapsed = self.get(policy)
+        self.assertEqual(content, b"<article/>")
+        self.assertLess(elapsed, 2)
+        self.assertEqual(self.server.requests, 2)
+
+    def test_fast_requests_are_not_hedged(self):
+        policy = domain.HedgingPolicy(budget=1, min_delay=1)
+        self.get(policy)
+        self.assertEqual(self.server.requests, 1)
+
+    def test_hedges_are_limited_by_the_budget(self):
+        self.server.delays = [0.3, 1]
+        policy = domain.HedgingPolicy(budget=0.5, min_delay=0.05)
+        self.get(policy)
+        self.assertEqual(self.server.requests, 1)
+        self.get(policy)
+        self.assertEqual(self.server.requests, 3)
+
+    def test_delay_follows_the_percentile_of_recent_latencies(self):
+        policy = domain.HedgingPolicy(budget=1, percentile=90, min_delay=0.01)
+        policy.latencies.extend(i / 100 for i in range(1, 101))
+        self.assertEqual(policy.delay(), 0.91)
+
+    def test_delay_is_never_below_min_delay(self):
+        policy = domain.HedgingPolicy(budget=1, min_delay=0.5)
+        policy.latencies.extend([0.01] * 10)
+        self.assertEqual(policy.delay(), 0.5)
+
+    def test_hedged_response_is_used_when_original_fails(self):
+        calls = []
+
+        def get(url, timeout):
+            calls.append(url)
+            if len(calls) == 1:
+                time.sleep(0.1)
+                raise domain.requests.exceptions.ConnectionError()
+            return "hedged"
+
+        policy = domain.HedgingPolicy(budget=1, min_delay=0.01)
+        self.assertEqual(policy(get, self.url, timeout=1), "hedged")
+
+    def test_errors_are_raised_when_all_requests_fail(self):
+        def get(url, timeout):
+            time.sleep(0.05)
+            raise domain.requests.exceptions.ConnectionError()
+
+        policy = domain.HedgingPolicy(budget=1, min_delay=0.01)
+        self.assertRaises(
+            domain.requests.exceptions.ConnectionError, policy, get, self.url, timeout=1
+        )
+
+    def test_requests_without_budget_run_in_the_calling_thread(self):
+        threads = []
+
+        def get(url, timeout):
+            threads.append(threading.current_thread())
+            return "original"
+
+        policy = domain.HedgingPolicy(budget=0.5, min_delay=0.01)
+        self.assertEqual(policy(get, self.url, timeout=1), "original")
+        self.assertEqual(threads, [threading.current_thread()])
+
+    def test_queue_time_does_not_count_towards_the_delay(self):
+        def get(url, timeout):
+            time.sleep(0.1)
+            return "original"
+
+        counter = domain.OBJECTSTORE_HEDGED_REQUESTS_TOTAL
+        before = counter._value.get()
+        policy = domain.HedgingPolicy(budget=1, min_delay=0.3, max_workers=1)
+        policy._executor.submit(time.sleep, 0.4)
+        self.assertEqual(policy(get, self.url, timeout=1), "original")
+        self.assertEqual(counter._value.get(), before)
+
+    def test_requests_run_in_the_calling_thread_when_workers_are_busy(self):
+        threads = []
+
+        def get(url, timeout):
+            threads.append(threading.current_thread())
+            return "original"
+
+        policy = domain.HedgingPolicy(budget=1, min_delay=0.01, max_workers=1)
+        policy._workers.acquire()
+        self.assertEqual(policy(get, self.url, timeout=1), "original")
+        self.assertEqual(threads, [threading.current_thread()])
+
+    def test_waiting_for_a_worker_is_bounded_by_the_deadline(self):
+        get = mock.Mock(return_value="original")
+        policy = domain.HedgingPolicy(budget=1, min_delay=0.01, max_workers=1)
+        policy._executor.submit(time.sleep, 0.5)
+        with domain.deadline(0.1):
+            self.assertRaises(
+                exceptions.DeadlineExceeded, policy, get, self.url, timeout=1
+            )
+        get.assert_not_called()
+        # a vaga da requisição cancelada é devolvida
+        self.assertTrue(policy._workers.acquire(blocking=False))
+
+    def test_unsuccessful_responses_do_not_prevail(self):
+        responses = [
+            mock.Mock(status_code=503, name="original"),
+            mock.Mock(status_code=200, name="hedged"),
+        ]
+
+        def get(url, timeout):
+            response = responses.pop(0)
+            time.sleep(0.1 if response.status_code == 503 else 0.2)
+            return response
+
+        policy = domain.HedgingPolicy(budget=1, min_delay=0.01)
+        self.assertEqual(policy(get, self.url, timeout=1).status_code, 200)
+
+    def test_unsuccessful_response_is_returned_when_all_requests_fail(self):
+        def get(url, timeout):
+            time.sleep(0.05)
+            return mock.Mock(status_code=503)
+
+        policy = domain.HedgingPolicy(budget=1, min_delay=0.01)
+        self.assertEqual(policy(get, self.url, timeout=1).status_code, 503)
+
+    def test_fetch_data_uses_the_hedging_policy(self):
+        self.addCleanup(domain.fetch_data.circuit_breaker.reset)
+        self.server.delays = [5]
+        policy = domain.HedgingPolicy(budget=1, min_delay=0.05)
+        with mock.patch("documentstore.domain.HEDGING_POLICY", new=policy):
+            self.assertEqual(domain.fetch_data(self.url, timeout=10), b"<article/>")
+        self.assertEqual(self.server.requests, 2)
+
+
+class ParseRewriteRulesTests(unittest.TestCase):
+    def test_rules_with_fallbacks(self):
+        self.assertEqual(
+            domain.parse_rewrite_rules(
+                "https://minio.scielo.br/=http://minio:9000/,https://minio.scielo.br/"
+            ),
+            [
+                (
+                    "https://minio.scielo.br/",
+                    ["http://minio:9000/", "https://minio.scielo.br/"],
+                )
+            ],
+        )
+
+    def test_rules_are_sorted_by_prefix_length(self):
+        rules = domain.parse_rewrite_rules(
+            "https://a.br/=http://a/\nhttps://a.br/docs/=http://docs/"
+        )
+        self.assertEqual(
+            [prefix for prefix, _ in rules], ["https://a.br/docs/", "https://a.br/"]
+        )
+
+    def test_empty_value(self):
+        self.assertEqual(domain.parse_rewrite_rules(""), [])
+
+    def test_invalid_rules(self):
+        for value in ("https://a.br/", "https://a.br/=", "=http://a/"):
+            with self.subTest(value=value):
+                self.assertRaises(ValueError, domain.parse_rewrite_rules, value)
+
+
+class RewriteUrlsDecoratorTests(unittest.TestCase):
+    def setUp(self):
+        self.rewrite_urls = domain.rewrite_urls(
+            "https://a.br/=http://mirror-1/,http://mirror-2/"
+        )
+
+    def test_candidates(self):
+        self.assertEqual(
+            self.rewrite_urls.candidates("https://a.br/x/doc.xml"),
+            ["http://mirror-1/x/doc.xml", "http://mirror-2/x/doc.xml"],
+        )
+
+    def test_urls_without_rule_are_kept(self):
+        self.assertEqual(
+            self.rewrite_urls.candidates("https://b.br/doc.xml"),
+            ["https://b.br/doc.xml"],
+        )
+
+    def test_first_candidate_is_used(self):
+        func = mock.Mock(return_value=b"<article/>")
+        decorated_obj = self.rewrite_urls(func)
+        self.assertEqual(decorated_obj("https://a.br/doc.xml", 2), b"<article/>")
+        func.assert_called_once_with("http://mirror-1/doc.xml", 2)
+
+    def test_fallbacks_are_tried_in_order(self):
+        func = mock.Mock(
+            side_effect=[exceptions.RetryableError(), exceptions.NonRetryableError()]
+        )
+        decorated_obj = self.rewrite_urls(func)
+        self.assertRaises(
+            exceptions.NonRetryableError, decorated_obj, "https://a.br/doc.xml"
+        )
+        self.assertEqual(
+            func.call_args_list,
+            [
+                mock.call("http://mirror-1/doc.xml"),
+                mock.call("http://mirror-2/doc.xml"),
+            ],
+        )
+
+    def test_fallback_is_used_when_candidate_fails(self):
+        func = mock.Mock(side_effect=[exceptions.RetryableError(), b"<article/>"])
+        decorated_obj = self.rewrite_urls(func)
+        self.assertEqual(decorated_obj("https://a.br/doc.xml"), b"<article/>")
+
+    def test_fetch_data_uses_the_rewritten_url(self):
+        self.addCleanup(domain.fetch_data.circuit_breaker.reset)
+        with mock.patch.object(
+            domain.fetch_data.rewrite_urls,
+            "rules",
+            domain.parse_rewrite_rules("https://a.br/=http://mirror-1/"),
+        ), mock.patch("documentstore.domain.requests.get") as mock_get:
+            domain.fetch_data("https://a.br/doc.xml")
+        self.assertEqual(mock_get.call_args[0], ("http://mirror-1/doc.xml",))
+
+    def test_document_keeps_canonical_urls(self):
+        document = domain.Document(id="0034-8910-rsp-48-2-0275")
+        with mock.patch.object(
+            domain.fetch_data.rewrite_urls,
+            "rules",
+            domain.parse_rewrite_rules("https://a.br/=http://mirror-1/"),
+        ), mock.patch("documentstore.domain.requests.get") as mock_get:
+            mock_get.return_value.content = b"<article/>"
+            document.new_version("https://a.br/doc.xml")
+            document.data()
+        self.assertEqual(document.version()["data"], "https://a.br/doc.xml")
+        self.assertEqual(
+            [call[0] for call in mock_get.call_args_list],
+            [("http://mirror-1/doc.xml",)] * 2,
+        )
+
+
+class JSONDumpsTests(unittest.TestCase):
+    def setUp(self):
+        self.value = {
+            "id": "0034-8910",
+            "metadata": {"title": [["pt", "Revista de Saúde Pública\n"]]},
+            "items": [{"id": "x", "order": 1, "pid": None, "aop": True}],
+            2: ["/", '"', "\\", "\x01", "😀"],
+        }
+
+    def test_output_is_compact_utf8(self):
+        self.assertEqual(
+            domain.json_dumps({"title": "Saúde", "items": [1, 2]}),
+            '{"title":"Saúde","items":[1,2]}'.encode("utf-8"),
+        )
+
+    @unittest.skipIf(domain.orjson is None, "orjson is not installed")
+    def test_output_is_the_same_with_or_without_orjson(self):
+        self.assertEqual(
+            domain.json_dumps(self.value), domain._stdlib_json_dumps(self.value)
+        )
+
+    def test_values_not_supported_by_orjson_are_serialized(self):
+        self.assertEqual(
+            domain.json_dumps({"big": 2 ** 70}), b'{"big":1180591620717411303424}'
+        )
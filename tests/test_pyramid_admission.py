@@ -0,0 +1,200 @@
+import threading
+import unittest
+
+from pyramid.config import Configurator
+from pyramid.interfaces import IRoutesMapper
+from pyramid.request import Request
+from pyramid.response import Response
+
+from documentstore import pyramid_admission
+
+
+def make_mapper():
+    config = Configurator()
+    config.add_route("documents", "/documents/{document_id}")
+    config.add_route("manifest", "/documents/{document_id}/manifest")
+    config.add_route("assets", "/documents/{document_id}/assets/{asset_slug}")
+    config.commit()
+    return config.registry.queryUtility(IRoutesMapper)
+
+
+class Registry:
+    def __init__(self, mapper=None, **settings):
+        self.mapper = mapper
+        self.settings = {
+            "kernel.app.admission.object_store.max_inflight": 1,
+            "kernel.app.admission.read.max_inflight": 1,
+            "kernel.app.admission.write.max_inflight": 1,
+            "kernel.app.admission.max_queued": 0,
+            "kernel.app.admission.queue_timeout": 0.01,
+            "kernel.app.admission.retry_after": 5,
+        }
+        self.settings.update(settings)
+
+    def queryUtility(self, iface):
+        return self.mapper
+
+
+def make_request(method="GET", path="/"):
+    return Request.blank(path, method=method)
+
+
+class BlockingHandler:
+    """Handler que, nas requisições GET, permanece em execução até que
+    `release` seja invocado.
+    """
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self._release = threading.Event()
+
+    def __call__(self, request):
+        if request.method == "GET":
+            self.entered.set()
+            self._release.wait(5)
+        return Response("ok")
+
+    def release(self):
+        self._release.set()
+
+
+class ConcurrencyLimiterTests(unittest.TestCase):
+    def test_acquires_up_to_max_inflight(self):
+        limiter = pyramid_admission.ConcurrencyLimiter(2, 0, 0.01)
+        self.assertIsNone(limiter.acquire())
+        self.assertIsNone(limiter.acquire())
+        self.assertEqual(limiter.acquire(), "queue_full")
+
+    def test_release_frees_a_slot(self):
+        limiter = pyramid_admission.ConcurrencyLimiter(1, 0, 0.01)
+        limiter.acquire()
+        limiter.release()
+        self.assertIsNone(limiter.acquire())
+
+    def test_queued_acquisitions_time_out(self):
+        limiter = pyramid_admission.ConcurrencyLimiter(1, 1, 0.01)
+        limiter.acquire()
+        self.assertEqual(limiter.acquire(), "timeout")
+        self.assertEqual(limiter.queued, 0)
+
+    def test_queued_acquisitions_are_admitted_on_release(self):
+        limiter = pyramid_admission.ConcurrencyLimiter(1, 1, 5)
+        limiter.acquire()
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(limiter.acquire()))
+        waiter.start()
+        while not limiter.queued:
+            pass
+        limiter.release()
+        waiter.join()
+        self.assertEqual(results, [None])
+        self.assertEqual(limiter.inflight, 1)
+
+    def test_limit_can_be_disabled(self):
+        limiter = pyramid_admission.ConcurrencyLimiter(0, 0, 0.01)
+        for _ in range(100):
+            self.assertIsNone(limiter.acquire())
+
+
+class TweenTests(unittest.TestCase):
+    def setUp(self):
+        self.handler = BlockingHandler()
+        self.tween = pyramid_admission.tween_factory(self.handler, Registry())
+
+    def occupy(self, path="/"):
+        thread = threading.Thread(target=self.tween, args=(make_request(path=path),))
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.handler.release)
+        self.handler.entered.wait(5)
+
+    def test_saturated_route_class_returns_503_with_retry_after(self):
+        self.occupy()
+        response = self.tween(make_request())
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "5")
+
+    def test_route_classes_have_separate_limits(self):
+        self.occupy()
+        self.assertEqual(self.tween(make_request("PUT")).status_code, 200)
+
+    def test_object_store_routes_do_not_take_metadata_slots(self):
+        self.tween = pyramid_admission.tween_factory(
+            self.handler, Registry(mapper=make_mapper())
+        )
+        self.occupy("/documents/doc-1")
+        self.assertEqual(
+            self.tween(make_request(path="/documents/doc-2")).status_code, 503
+        )
+        self.handler.entered.clear()
+        self.occupy("/documents/doc-1/manifest")
+        self.assertTrue(self.handler.entered.is_set())
+
+    def test_queue_time_is_observed(self):
+        histogram = pyramid_admission.ADMISSION_QUEUE_SECONDS.labels("write")
+        before = histogram._sum.get(), sum(b.get() for b in histogram._buckets)
+        self.tween(make_request("PUT"))
+        after = histogram._sum.get(), sum(b.get() for b in histogram._buckets)
+        self.assertEqual(after[1], before[1] + 1)
+
+    def test_rejections_are_counted(self):
+        counter = pyramid_admission.ADMISSION_REJECTED.labels("read", "queue_full")
+        before = counter._value.get()
+        self.occupy()
+        self.tween(make_request())
+        self.assertEqual(counter._value.get(), before + 1)
+
+    def test_streamed_responses_hold_the_slot_until_closed(self):
+        tween = pyramid_admission.tween_factory(
+            lambda request: Response(app_iter=iter([b"a", b"b"])), Registry()
+        )
+        streamed = tween(make_request("PUT"))
+        self.assertEqual(tween(make_request("PUT")).status_code, 503)
+        self.assertEqual(b"".join(streamed.app_iter), b"ab")
+        streamed.app_iter.close()
+        streamed.app_iter.close()
+        # a vaga é liberada uma única vez
+        self.assertEqual(tween(make_request("PUT")).status_code, 200)
+        self.assertEqual(tween(make_request("PUT")).status_code, 503)
+
+    def test_slot_is_released_when_handler_raises(self):
+        def handler(request):
+            raise ValueError()
+
+        tween = pyramid_admission.tween_factory(handler, Registry())
+        self.assertRaises(ValueError, tween, make_request())
+        self.assertRaises(ValueError, tween, make_request())
+
+
+class RouteClassTests(unittest.TestCase):
+    def test_safe_methods_are_reads(self):
+        for method in ("GET", "HEAD", "OPTIONS"):
+            with self.subTest(method=method):
+                self.assertEqual(
+                    pyramid_admission.route_class(make_request(method)), "read"
+                )
+
+    def test_object_store_routes(self):
+        mapper = make_mapper()
+        for method, path, expected in [
+            ("GET", "/documents/doc-1", "object_store"),
+            ("PUT", "/documents/doc-1", "object_store"),
+            ("HEAD", "/documents/doc-1", "read"),
+            ("DELETE", "/documents/doc-1", "write"),
+            ("GET", "/documents/doc-1/manifest", "read"),
+            ("PUT", "/documents/doc-1/assets/fig-1", "object_store"),
+            ("GET", "/documents/doc-1/assets/fig-1", "read"),
+            ("GET", "/unknown", "read"),
+        ]:
+            with self.subTest(method=method, path=path):
+                self.assertEqual(
+                    pyramid_admission.route_class(make_request(method, path), mapper),
+                    expected,
+                )
+
+    def test_unsafe_methods_are_writes(self):
+        for method in ("PUT", "PATCH", "POST", "DELETE"):
+            with self.subTest(method=method):
+                self.assertEqual(
+                    pyramid_admission.route_class(make_request(method)), "write"
+                )
@@ -0,0 +1,106 @@
+import gzip
+import json
+import unittest
+
+from pyramid.request import Request
+from pyramid.response import Response
+
+from documentstore import pyramid_compression
+
+
+class Registry:
+    settings = {
+        "kernel.app.compression.min_size": 100,
+        "kernel.app.compression.level": 6,
+    }
+
+
+def make_tween(response):
+    return pyramid_compression.tween_factory(lambda request: response, Registry())
+
+
+def make_request(method="GET", accept_encoding="gzip"):
+    headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+    return Request.blank("/", method=method, headers=headers)
+
+
+def json_response(size=1000):
+    body = json.dumps({"items": ["x" * size]}).encode("utf-8")
+    response = Response(body=body, content_type="application/json")
+    response.etag = "abc"
+    return response
+
+
+class TweenTests(unittest.TestCase):
+    def test_compresses_with_negotiated_encoding(self):
+        response = json_response()
+        body = response.body
+        response = make_tween(response)(make_request())
+        self.assertEqual(response.content_encoding, "gzip")
+        self.assertEqual(gzip.decompress(response.body), body)
+        self.assertEqual(response.content_length, len(response.body))
+        self.assertIn("Accept-Encoding", response.vary)
+
+    def test_etag_becomes_weak(self):
+        response = make_tween(json_response())(make_request())
+        self.assertEqual(response.headers["ETag"], 'W/"abc"')
+
+    def test_responses_below_threshold_are_not_compressed(self):
+        response = make_tween(json_response(size=10))(make_request())
+        self.assertIsNone(response.content_encoding)
+        self.assertEqual(response.headers["ETag"], '"abc"')
+
+    def test_without_accept_encoding_is_not_compressed(self):
+        response = make_tween(json_response())(make_request(accept_encoding=None))
+        self.assertIsNone(response.content_encoding)
+        self.assertIn("Accept-Encoding", response.vary)
+
+    def test_unaccepted_encodings_are_not_used(self):
+        response = make_tween(json_response())(make_request(accept_encoding="identity"))
+        self.assertIsNone(response.content_encoding)
+
+    def test_already_encoded_responses_pass_through(self):
+        response = json_response()
+        response.body = gzip.compress(response.body)
+        response.content_encoding = "gzip"
+        body = response.body
+        response = make_tween(response)(make_request())
+        self.assertEqual(response.body, body)
+
+    def test_other_content_types_are_not_compressed(self):
+        response = Response(body=b"x" * 1000, content_type="image/jpeg")
+        response = make_tween(response)(make_request())
+        self.assertIsNone(response.content_encoding)
+        self.assertIsNone(response.vary)
+
+    def test_head_requests_are_not_compressed(self):
+        response = make_tween(json_response())(make_request(method="HEAD"))
+        self.assertIsNone(response.content_encoding)
+
+    def test_streamed_responses_are_compressed_as_produced(self):
+        chunks = [b'{"results": [', b"1, " * 500, b"2]}"]
+        response = Response(app_iter=iter(chunks), content_type="application/json")
+        response = make_tween(response)(make_request(accept_encoding="br, gzip"))
+        self.assertEqual(response.content_encoding, "gzip")
+        self.assertIsNone(response.content_length)
+        self.assertEqual(gzip.decompress(b"".join(response.app_iter)), b"".join(chunks))
+
+    def test_streamed_ndjson_responses_are_compressed(self):
+        lines = [json.dumps({"id": "doc-%s" % i}).encode() + b"\n" for i in range(100)]
+        response = Response(app_iter=iter(lines), content_type="application/x-ndjson")
+        response = make_tween(response)(make_request())
+        self.assertEqual(response.content_encoding, "gzip")
+        self.assertEqual(gzip.decompress(b"".join(response.app_iter)), b"".join(lines))
+
+
+class NegotiateTests(unittest.TestCase):
+    def test_client_preference_is_respected(self):
+        request = make_request(accept_encoding="gzip;q=0.5, br")
+        self.assertEqual(pyramid_compression.negotiate(request, ["br", "gzip"]), "br")
+
+    def test_server_preference_breaks_ties(self):
+        request = make_request(accept_encoding="*")
+        self.assertEqual(pyramid_compression.negotiate(request, ["br", "gzip"]), "br")
+
+    def test_gzip_is_always_available(self):
+        self.assertIn("gzip", pyramid_compression.get_encoders(6))
@@ -0,0 +1,79 @@
+import unittest
+
+from pyramid.request import Request
+from pyramid.response import Response
+
+from documentstore import domain, pyramid_deadline
+
+
+class Registry:
+    settings = {
+        "kernel.app.deadline.object_store": 0,
+        "kernel.app.deadline.read": 10,
+        "kernel.app.deadline.write": 0,
+    }
+
+    def queryUtility(self, iface):
+        return None
+
+
+def make_request(method="GET", timeout=None):
+    headers = {"X-Request-Timeout": timeout} if timeout else {}
+    return Request.blank("/", method=method, headers=headers)
+
+
+class TweenTests(unittest.TestCase):
+    def setUp(self):
+        self.remaining = []
+
+        def handler(request):
+            self.remaining.append(domain.remaining_time())
+            return Response("ok")
+
+        self.tween = pyramid_deadline.tween_factory(handler, Registry())
+
+    def test_deadline_of_the_route_class(self):
+        self.tween(make_request())
+        self.assertTrue(9 < self.remaining[0] <= 10)
+
+    def test_client_may_shorten_the_deadline(self):
+        self.tween(make_request(timeout="2.5"))
+        self.assertTrue(2 < self.remaining[0] <= 2.5)
+
+    def test_client_may_not_extend_the_deadline(self):
+        self.tween(make_request(timeout="60"))
+        self.assertTrue(self.remaining[0] <= 10)
+
+    def test_route_classes_without_deadline(self):
+        self.tween(make_request(method="PUT"))
+        self.assertIsNone(self.remaining[0])
+
+    def test_deadline_ends_with_the_request(self):
+        self.tween(make_request())
+        self.assertIsNone(domain.remaining_time())
+
+
+class RequestedTimeoutTests(unittest.TestCase):
+    def test_valid_values(self):
+        request = make_request(timeout="3")
+        self.assertEqual(pyramid_deadline.requested_timeout(request), 3)
+
+    def test_invalid_values_are_ignored(self):
+        for value in ("abc", "0", "-1"):
+            with self.subTest(value=value):
+                self.assertIsNone(
+                    pyramid_deadline.requested_timeout(make_request(timeout=value))
+                )
+
+    def test_missing_header(self):
+        self.assertIsNone(pyramid_deadline.requested_timeout(make_request()))
+
+
+class RequestTimeoutTests(unittest.TestCase):
+    def test_shortest_timeout_wins(self):
+        self.assertEqual(pyramid_deadline.request_timeout(10, 2), 2)
+        self.assertEqual(pyramid_deadline.request_timeout(2, 10), 2)
+
+    def test_zero_means_no_limit(self):
+        self.assertEqual(pyramid_deadline.request_timeout(0, 2), 2)
+        self.assertIsNone(pyramid_deadline.request_timeout(0, None))
@@ -1,20 +1,25 @@
 import os
+import json
 import unittest
 from copy import deepcopy
 from unittest.mock import patch, Mock
 
 import colander
+import webtest
 from pyramid import testing
+from pyramid.config import Configurator
 from pyramid.httpexceptions import (
     HTTPOk,
     HTTPNotFound,
+    HTTPNotModified,
+    HTTPGone,
     HTTPCreated,
     HTTPNoContent,
     HTTPBadRequest,
     HTTPUnprocessableEntity,
 )
 
-from documentstore import services, restfulapi, exceptions
+from documentstore import services, restfulapi, exceptions, domain
 from . import apptesting
 
 _CWD = os.path.dirname(os.path.abspath(__file__))
@@ -23,6 +28,7 @@ with open(os.path.join(_CWD, "0034-8910-rsp-48-2-0347.xml"), "rb") as f:
 
 
 def make_request():
+    apptesting.reset_circuit_breakers()
     request = testing.DummyRequest()
     session = apptesting.Session()
     # atenção: os callbacks em `services.DEFAULT_SUBSCRIBERS` serão executados
@@ -31,6 +37,23 @@ def make_request():
     return request
 
 
+def make_app(session):
+    """Produz a aplicação WSGI com as views e os validadores do Cornice, de
+    maneira que as requisições sejam tratadas como em produção.
+    """
+    config = Configurator(settings={})
+    config.include("cornice")
+    config.include("cornice_swagger")
+    config.scan("documentstore.restfulapi")
+    config.add_renderer("json", restfulapi.JSONRenderer)
+    config.add_request_method(
+        lambda request: services.get_handlers(lambda: session),
+        "services",
+        reify=True,
+    )
+    return webtest.TestApp(config.make_wsgi_app())
+
+
 def fetch_data_stub(url, timeout=2):
     assert url.endswith("0034-8910-rsp-48-2-0347.xml")
     return SAMPLE_DOCUMENT_DATA
@@ -106,6 +129,543 @@ class PutDocumentUnitTests(unittest.TestCase):
         self.assertIsInstance(restfulapi.put_document(request), HTTPNoContent)
 
 
+@patch("documentstore.domain.fetch_data", new=fetch_data_stub)
+class PostDocumentsUnitTests(unittest.TestCase):
+    def make_item(self, id, prefix=""):
+        return {"id": id, **apptesting.document_registry_data_fixture(prefix=prefix)}
+
+    def test_registration_of_new_documents_returns_201_per_item(self):
+        request = make_request()
+        request.validated = {
+            "body": [self.make_item("doc-1"), self.make_item("doc-2")]
+        }
+        self.assertEqual(
+            restfulapi.post_documents(request),
+            {
+                "results": [
+                    {"id": "doc-1", "status": 201},
+                    {"id": "doc-2", "status": 201},
+                ]
+            },
+        )
+
+    def test_registration_of_updates_returns_204_per_item(self):
+        request = make_request()
+        request.validated = {"body": [self.make_item("doc-1")]}
+        restfulapi.post_documents(request)
+        request.validated = {
+            "body": [self.make_item("doc-1", "v2-"), self.make_item("doc-2")]
+        }
+        self.assertEqual(
+            restfulapi.post_documents(request),
+            {
+                "results": [
+                    {"id": "doc-1", "status": 204},
+                    {"id": "doc-2", "status": 201},
+                ]
+            },
+        )
+
+    def test_duplicated_documents_return_400(self):
+        request = make_request()
+        request.validated = {
+            "body": [self.make_item("doc-1"), self.make_item("doc-1", "v2-")]
+        }
+        self.assertRaises(HTTPBadRequest, restfulapi.post_documents, request)
+
+    def test_response_matches_declared_schema(self):
+        request = make_request()
+        request.validated = {"body": [self.make_item("doc-1")]}
+        response = restfulapi.post_documents(request)
+        self.assertEqual(
+            restfulapi.BulkRegisterDocumentsResultSchema().deserialize(response),
+            response,
+        )
+
+    def test_failed_items_are_reported_with_message(self):
+        request = make_request()
+        request.validated = {"body": [self.make_item("doc-1")]}
+        request.services["register_documents"] = Mock(
+            return_value=[
+                {
+                    "id": "doc-1",
+                    "status": "failed",
+                    "error": exceptions.RetryableError("timeout"),
+                }
+            ]
+        )
+        self.assertEqual(
+            restfulapi.post_documents(request),
+            {"results": [{"id": "doc-1", "status": 503, "message": "timeout"}]},
+        )
+
+    def test_items_are_passed_to_the_service(self):
+        request = make_request()
+        request.validated = {"body": [self.make_item("doc-1")]}
+        MockRegisterDocuments = Mock(return_value=[])
+        request.services["register_documents"] = MockRegisterDocuments
+        restfulapi.post_documents(request)
+        documents = MockRegisterDocuments.call_args[1]["documents"]
+        self.assertEqual(documents[0]["id"], "doc-1")
+        self.assertEqual(
+            documents[0]["data_url"], request.validated["body"][0]["data"],
+        )
+        self.assertEqual(len(documents[0]["assets"]), 8)
+
+
+@patch("documentstore.domain.fetch_data", new=fetch_data_stub)
+class PostDocumentsFunctionalTests(unittest.TestCase):
+    def setUp(self):
+        apptesting.reset_circuit_breakers()
+        self.app = make_app(apptesting.Session())
+
+    def make_item(self, id):
+        return {"id": id, **apptesting.document_registry_data_fixture()}
+
+    def test_json_array_is_registered(self):
+        response = self.app.post_json(
+            "/documents", [self.make_item("doc-1"), self.make_item("doc-2")]
+        )
+        self.assertEqual(
+            response.json,
+            {
+                "results": [
+                    {"id": "doc-1", "status": 201},
+                    {"id": "doc-2", "status": 201},
+                ]
+            },
+        )
+
+    def test_invalid_items_return_400(self):
+        response = self.app.post_json(
+            "/documents", [{"id": "doc-1", "data": "not a url"}], status=400
+        )
+        self.assertEqual(response.json["status"], "error")
+        self.assertEqual(response.json["errors"][0]["location"], "body")
+
+    def test_json_object_returns_400(self):
+        self.app.post_json("/documents", self.make_item("doc-1"), status=400)
+
+
+class FetchDocumentsDataUnitTests(unittest.TestCase):
+    def setUp(self):
+        fetch_data_patcher = patch(
+            "documentstore.domain.fetch_data", new=fetch_data_stub
+        )
+        fetch_data_patcher.start()
+        self.addCleanup(fetch_data_patcher.stop)
+        self.request = make_request()
+        self.request.services["register_documents"](
+            documents=[
+                {
+                    "id": "doc-1",
+                    "data_url": apptesting.document_registry_data_fixture()["data"],
+                }
+            ],
+            max_workers=1,
+        )
+
+    def read_lines(self, response):
+        return [json.loads(line) for line in b"".join(response.app_iter).splitlines()]
+
+    def test_missing_ids_returns_400(self):
+        self.request.GET = {}
+        self.assertRaises(HTTPBadRequest, restfulapi.fetch_documents_data, self.request)
+
+    def test_too_many_ids_returns_400(self):
+        testing.setUp(settings={"kernel.app.bulk.max_ids": 2})
+        self.addCleanup(testing.tearDown)
+        self.request.GET = {"ids": "doc-1,doc-2,doc-3"}
+        self.assertRaises(HTTPBadRequest, restfulapi.fetch_documents_data, self.request)
+
+    def test_ids_are_limited_by_default(self):
+        self.request.GET = {
+            "ids": ",".join("doc-%s" % i for i in range(restfulapi.BULK_MAX_IDS + 1))
+        }
+        self.assertRaises(HTTPBadRequest, restfulapi.fetch_documents_data, self.request)
+
+    def test_zero_disables_the_limit_of_ids(self):
+        testing.setUp(settings={"kernel.app.bulk.max_ids": 0})
+        self.addCleanup(testing.tearDown)
+        self.request.GET = {
+            "ids": ",".join("doc-%s" % i for i in range(restfulapi.BULK_MAX_IDS + 1))
+        }
+        response = restfulapi.fetch_documents_data(self.request)
+        self.assertEqual(len(self.read_lines(response)), restfulapi.BULK_MAX_IDS + 1)
+
+    def test_returns_one_line_per_id(self):
+        self.request.GET = {"ids": "doc-1,unknown"}
+        response = restfulapi.fetch_documents_data(self.request)
+        self.assertEqual(response.content_type, "application/x-ndjson")
+        lines = self.read_lines(response)
+        self.assertEqual(lines[0]["id"], "doc-1")
+        self.assertEqual(lines[0]["status"], 200)
+        self.assertIn("<article", lines[0]["data"])
+        self.assertEqual(lines[1]["id"], "unknown")
+        self.assertEqual(lines[1]["status"], 404)
+
+    def test_deleted_documents_return_410(self):
+        self.request.services["delete_document"](id="doc-1")
+        self.request.GET = {"ids": "doc-1"}
+        lines = self.read_lines(restfulapi.fetch_documents_data(self.request))
+        self.assertEqual(lines[0]["status"], 410)
+
+    def test_service_is_invoked_before_the_body_is_streamed(self):
+        MockFetchDocumentsData = Mock(return_value=[])
+        self.request.services["fetch_documents_data"] = MockFetchDocumentsData
+        self.request.GET = {"ids": "doc-1"}
+        restfulapi.fetch_documents_data(self.request)
+        MockFetchDocumentsData.assert_called_once()
+
+    def test_when_is_passed_to_the_service(self):
+        MockFetchDocumentsData = Mock(return_value=[])
+        self.request.services["fetch_documents_data"] = MockFetchDocumentsData
+        self.request.GET = {"ids": "doc-1", "when": "2018-01-01"}
+        self.read_lines(restfulapi.fetch_documents_data(self.request))
+        MockFetchDocumentsData.assert_called_once_with(
+            ids=["doc-1"], version_at="2018-01-01"
+        )
+
+
+class GetManifestUnitTests(unittest.TestCase):
+    def setUp(self):
+        self.request = make_request()
+        self.request.matchdict = {"document_id": "0034-8910-rsp-48-2"}
+
+    def test_manifest_is_served_as_stored(self):
+        self.request.services["fetch_document_validators"] = Mock(
+            return_value=("abc", "2018-08-05T23:02:29.392990Z")
+        )
+        MockFetchRawDocumentManifest = Mock(
+            return_value=(b'{"id": "0034-8910-rsp-48-2"}', "abc")
+        )
+        self.request.services[
+            "fetch_raw_document_manifest"
+        ] = MockFetchRawDocumentManifest
+        response = restfulapi.get_manifest(self.request)
+        MockFetchRawDocumentManifest.assert_called_once_with(id="0034-8910-rsp-48-2")
+        self.assertEqual(response.body, b'{"id": "0034-8910-rsp-48-2"}')
+        self.assertEqual(response.content_type, "application/json")
+        self.assertEqual(response.etag, "abc")
+
+    def test_unknown_document_returns_404(self):
+        self.assertRaises(HTTPNotFound, restfulapi.get_manifest, self.request)
+
+
+@patch("documentstore.domain.fetch_data", new=fetch_data_stub)
+class GetAssetsListUnitTests(unittest.TestCase):
+    def setUp(self):
+        self.request = make_request()
+        self.request.matchdict = {"document_id": "0034-8910-rsp-48-2"}
+
+    def test_assets_are_resolved_and_slugified(self):
+        data = apptesting.document_registry_data_fixture()
+        self.request.services["register_document"](
+            id="0034-8910-rsp-48-2",
+            data_url=data["data"],
+            assets={asset["asset_id"]: asset["asset_url"] for asset in data["assets"]},
+        )
+        assets = restfulapi.get_assets_list(self.request)
+        self.assertEqual(assets["data"], data["data"])
+        self.assertEqual(
+            assets["assets"][0],
+            {
+                "slug": "0034-8910-rsp-48-2-0347-gf01",
+                "id": "0034-8910-rsp-48-2-0347-gf01",
+                "url": data["assets"][0]["asset_url"],
+            },
+        )
+
+    def test_unknown_document_returns_404(self):
+        self.assertRaises(HTTPNotFound, restfulapi.get_assets_list, self.request)
+
+
+@patch("documentstore.domain.fetch_data", new=fetch_data_stub)
+class ConditionalGetUnitTests(unittest.TestCase):
+    def setUp(self):
+        self.request = make_request()
+        self.request.matchdict = {"document_id": "my-testing-doc"}
+        with patch("documentstore.domain.fetch_data", new=fetch_data_stub):
+            self.request.services["register_document"](
+                id="my-testing-doc",
+                data_url="https://raw.githubusercontent.com/scieloorg/packtools/master/tests/samples/0034-8910-rsp-48-2-0347.xml",
+                assets={},
+            )
+        self.revision, self.last_modified = self.request.services[
+            "fetch_document_validators"
+        ](id="my-testing-doc")
+
+    def test_document_data_carries_validators(self):
+        restfulapi.fetch_document_data(self.request)
+        self.assertEqual(self.request.response.etag, self.revision)
+        self.assertIsNotNone(self.request.response.last_modified)
+
+    def test_matching_etag_returns_304_without_fetching_xml(self):
+        self.request.headers["If-None-Match"] = '"%s"' % self.revision
+        with patch("documentstore.domain.fetch_data") as mock_fetch_data:
+            response = restfulapi.fetch_document_data(self.request)
+        self.assertIsInstance(response, HTTPNotModified)
+        self.assertEqual(response.etag, self.revision)
+        mock_fetch_data.assert_not_called()
+
+    def test_weak_etag_matches(self):
+        self.request.headers["If-None-Match"] = 'W/"%s"' % self.revision
+        response = restfulapi.fetch_document_data(self.request)
+        self.assertIsInstance(response, HTTPNotModified)
+
+    def test_mismatching_etag_returns_data(self):
+        self.request.headers["If-None-Match"] = '"other"'
+        response = restfulapi.fetch_document_data(self.request)
+        self.assertIsInstance(response, bytes)
+
+    def test_if_modified_since_later_than_last_modified_returns_304(self):
+        self.request.headers["If-Modified-Since"] = "Fri, 01 Jan 2100 00:00:00 GMT"
+        response = restfulapi.fetch_document_data(self.request)
+        self.assertIsInstance(response, HTTPNotModified)
+
+    def test_if_modified_since_earlier_than_last_modified_returns_data(self):
+        self.request.headers["If-Modified-Since"] = "Mon, 01 Jan 1900 00:00:00 GMT"
+        response = restfulapi.fetch_document_data(self.request)
+        self.assertIsInstance(response, bytes)
+
+    def test_if_modified_since_is_ignored_in_presence_of_if_none_match(self):
+        self.request.headers["If-None-Match"] = '"other"'
+        self.request.headers["If-Modified-Since"] = "Fri, 01 Jan 2100 00:00:00 GMT"
+        response = restfulapi.fetch_document_data(self.request)
+        self.assertIsInstance(response, bytes)
+
+    def test_unknown_document_returns_404(self):
+        self.request.matchdict = {"document_id": "unknown"}
+        self.request.headers["If-None-Match"] = '"%s"' % self.revision
+        self.assertRaises(HTTPNotFound, restfulapi.fetch_document_data, self.request)
+
+    def test_manifest_returns_304_without_fetching_it(self):
+        self.request.headers["If-None-Match"] = '"%s"' % self.revision
+        self.request.services["fetch_raw_document_manifest"] = Mock()
+        response = restfulapi.get_manifest(self.request)
+        self.assertIsInstance(response, HTTPNotModified)
+        self.request.services["fetch_raw_document_manifest"].assert_not_called()
+
+    def test_manifest_etag_is_the_manifest_revision(self):
+        response = restfulapi.get_manifest(self.request)
+        self.assertEqual(response.etag, self.revision)
+        self.assertIsNotNone(response.last_modified)
+
+    def test_assets_list_returns_304(self):
+        self.request.headers["If-None-Match"] = '"%s"' % self.revision
+        response = restfulapi.get_assets_list(self.request)
+        self.assertIsInstance(response, HTTPNotModified)
+
+    def test_renditions_returns_304(self):
+        self.request.headers["If-None-Match"] = '"%s"' % self.revision
+        response = restfulapi.fetch_document_renditions(self.request)
+        self.assertIsInstance(response, HTTPNotModified)
+
+    def test_front_returns_304(self):
+        self.request.headers["If-None-Match"] = '"%s"' % self.revision
+        response = restfulapi.fetch_document_front(self.request)
+        self.assertIsInstance(response, HTTPNotModified)
+
+    def test_bundle_returns_304_without_fetching_it(self):
+        self.request.services["create_documents_bundle"]("0034-8910-rsp-48-2")
+        revision, _ = self.request.services["fetch_documents_bundle_validators"](
+            "0034-8910-rsp-48-2"
+        )
+        self.request.matchdict = {"bundle_id": "0034-8910-rsp-48-2"}
+        self.request.headers["If-None-Match"] = '"%s"' % revision
+        self.request.services["fetch_raw_documents_bundle"] = Mock()
+        response = restfulapi.fetch_documents_bundle(self.request)
+        self.assertIsInstance(response, HTTPNotModified)
+        self.request.services["fetch_raw_documents_bundle"].assert_not_called()
+
+    def test_journal_returns_304_without_fetching_it(self):
+        self.request.matchdict = {"journal_id": "1678-4596-cr-49-02"}
+        self.request.validated = apptesting.journal_registry_fixture()
+        restfulapi.put_journal(self.request)
+        revision, _ = self.request.services["fetch_journal_validators"](
+            id="1678-4596-cr-49-02"
+        )
+        self.request.headers["If-None-Match"] = '"%s"' % revision
+        self.request.services["fetch_raw_journal"] = Mock()
+        response = restfulapi.get_journal(self.request)
+        self.assertIsInstance(response, HTTPNotModified)
+        self.request.services["fetch_raw_journal"].assert_not_called()
+
+    def test_expanded_journal_ignores_validators(self):
+        self.request.matchdict = {"journal_id": "1678-4596-cr-49-02"}
+        self.request.validated = apptesting.journal_registry_fixture()
+        restfulapi.put_journal(self.request)
+        revision, _ = self.request.services["fetch_journal_validators"](
+            id="1678-4596-cr-49-02"
+        )
+        self.request.headers["If-None-Match"] = '"%s"' % revision
+        self.request.GET = {"expand": "issues"}
+        response = restfulapi.get_journal(self.request)
+        self.assertEqual(response["id"], "1678-4596-cr-49-02")
+
+
+@patch("documentstore.domain.fetch_data", new=fetch_data_stub)
+class ImmutableVersionsUnitTests(unittest.TestCase):
+    def setUp(self):
+        self.config = testing.setUp()
+        self.config.add_route(
+            "document_version", pattern="/documents/{document_id}/versions/{timestamp}"
+        )
+        self.request = make_request()
+        self.request.matchdict = {"document_id": "my-testing-doc"}
+        with patch("documentstore.domain.fetch_data", new=fetch_data_stub):
+            self.request.services["register_document"](
+                id="my-testing-doc",
+                data_url="https://raw.githubusercontent.com/scieloorg/packtools/master/tests/samples/0034-8910-rsp-48-2-0347.xml",
+                assets={},
+            )
+        self.timestamp = self.request.services["fetch_document_manifest"](
+            id="my-testing-doc"
+        )["versions"][0]["timestamp"]
+
+    def test_past_versions_are_immutable(self):
+        self.request.GET = {"when": domain.utcnow()}
+        restfulapi.fetch_document_data(self.request)
+        self.assertEqual(
+            self.request.response.headers["Cache-Control"],
+            restfulapi.IMMUTABLE_CACHE_CONTROL,
+        )
+        self.assertEqual(
+            self.request.response.content_location,
+            "/documents/my-testing-doc/versions/%s" % self.timestamp,
+        )
+
+    def test_future_versions_are_not_immutable(self):
+        self.request.GET = {"when": "2100-01-01"}
+        restfulapi.fetch_document_data(self.request)
+        self.assertNotIn("Cache-Control", self.request.response.headers)
+        self.assertIsNone(self.request.response.content_location)
+
+    def test_latest_version_is_not_immutable(self):
+        restfulapi.fetch_document_data(self.request)
+        self.assertNotIn("Cache-Control", self.request.response.headers)
+
+    def test_canonical_url_returns_the_version(self):
+        self.request.matchdict["timestamp"] = self.timestamp
+        data = restfulapi.fetch_document_version(self.request)
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(
+            self.request.response.headers["Cache-Control"],
+            restfulapi.IMMUTABLE_CACHE_CONTROL,
+        )
+
+    def test_canonical_url_prior_to_creation_returns_404(self):
+        self.request.matchdict["timestamp"] = "1900-01-01"
+        self.assertRaises(HTTPNotFound, restfulapi.fetch_document_version, self.request)
+
+    def test_version_is_resolved_once(self):
+        self.request.GET = {"when": domain.utcnow()}
+        self.request.services["fetch_document_data"] = Mock()
+        fetch_document_version = Mock(
+            wraps=self.request.services["fetch_document_version"]
+        )
+        self.request.services["fetch_document_version"] = fetch_document_version
+        data = restfulapi.fetch_document_data(self.request)
+        self.assertIsInstance(data, bytes)
+        fetch_document_version.assert_called_once()
+        self.request.services["fetch_document_data"].assert_not_called()
+
+    def test_not_modified_immutable_versions_keep_cache_control(self):
+        revision, _ = self.request.services["fetch_document_validators"](
+            id="my-testing-doc"
+        )
+        self.request.headers["If-None-Match"] = '"%s"' % revision
+        self.request.GET = {"when": domain.utcnow()}
+        response = restfulapi.fetch_document_data(self.request)
+        self.assertIsInstance(response, HTTPNotModified)
+        self.assertEqual(
+            response.headers["Cache-Control"], restfulapi.IMMUTABLE_CACHE_CONTROL
+        )
+
+    def test_not_modified_canonical_url_keeps_cache_control(self):
+        revision, _ = self.request.services["fetch_document_validators"](
+            id="my-testing-doc"
+        )
+        self.request.headers["If-None-Match"] = '"%s"' % revision
+        self.request.matchdict["timestamp"] = self.timestamp
+        response = restfulapi.fetch_document_version(self.request)
+        self.assertIsInstance(response, HTTPNotModified)
+        self.assertEqual(
+            response.headers["Cache-Control"], restfulapi.IMMUTABLE_CACHE_CONTROL
+        )
+
+    def test_not_modified_future_versions_are_not_immutable(self):
+        revision, _ = self.request.services["fetch_document_validators"](
+            id="my-testing-doc"
+        )
+        self.request.headers["If-None-Match"] = '"%s"' % revision
+        self.request.GET = {"when": "2100-01-01"}
+        response = restfulapi.fetch_document_data(self.request)
+        self.assertIsInstance(response, HTTPNotModified)
+        self.assertNotIn("Cache-Control", response.headers)
+
+    def test_head_of_immutable_version(self):
+        self.request.method = "HEAD"
+        self.request.GET = {"when": domain.utcnow()}
+        response = restfulapi.fetch_document_data(self.request)
+        self.assertEqual(response.content_type, "text/xml")
+        self.assertEqual(
+            response.headers["Cache-Control"], restfulapi.IMMUTABLE_CACHE_CONTROL
+        )
+
+
+@patch("documentstore.domain.fetch_data", new=fetch_data_stub)
+class HeadDocumentUnitTests(unittest.TestCase):
+    def setUp(self):
+        services.DATA_SIZES_CACHE.clear()
+        self.request = make_request()
+        self.request.matchdict = {"document_id": "my-testing-doc"}
+        with patch("documentstore.domain.fetch_data", new=fetch_data_stub):
+            self.request.services["register_document"](
+                id="my-testing-doc",
+                data_url="https://raw.githubusercontent.com/scieloorg/packtools/master/tests/samples/0034-8910-rsp-48-2-0347.xml",
+                assets={},
+            )
+        self.head_request = make_request()
+        self.head_request.method = "HEAD"
+        self.head_request.matchdict = self.request.matchdict
+        self.head_request.services = self.request.services
+
+    def test_head_does_not_fetch_the_xml(self):
+        with patch("documentstore.domain.fetch_data") as mock_fetch_data:
+            response = restfulapi.fetch_document_data(self.head_request)
+        mock_fetch_data.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content_type, "text/xml")
+        self.assertTrue(response.etag)
+
+    def test_head_omits_unknown_content_length(self):
+        response = restfulapi.fetch_document_data(self.head_request)
+        self.assertIsNone(response.content_length)
+
+    def test_head_informs_content_length_once_known(self):
+        data = restfulapi.fetch_document_data(self.request)
+        response = restfulapi.fetch_document_data(self.head_request)
+        self.assertEqual(response.content_length, len(data))
+        self.assertEqual(response.etag, self.request.response.etag)
+
+    def test_head_unknown_document_returns_404(self):
+        self.head_request.matchdict = {"document_id": "unknown"}
+        self.assertRaises(
+            HTTPNotFound, restfulapi.fetch_document_data, self.head_request
+        )
+
+    def test_head_deleted_document_returns_410(self):
+        self.request.services["delete_document"](id="my-testing-doc")
+        self.assertRaises(HTTPGone, restfulapi.fetch_document_data, self.head_request)
+
+    def test_head_version_prior_to_creation_returns_404(self):
+        self.head_request.GET = {"when": "1900-01-01"}
+        self.assertRaises(
+            HTTPNotFound, restfulapi.fetch_document_data, self.head_request
+        )
+
+
 class ParseSettingsFunctionTests(unittest.TestCase):
     def test_known_values_are_preserved_when_given(self):
         defaults = [("apptest.foo", "APPTEST_FOO", str, "modified foo")]
@@ -159,6 +719,9 @@ class FetchDocumentsBundleTest(unittest.TestCase):
         self.request = make_request()
         self.config = testing.setUp()
         self.config.add_route("bundles", pattern="/bundles/{bundle_id}")
+        self.request.services["fetch_documents_bundle_validators"] = Mock(
+            return_value=("abc", "2019-01-01T00:00:00.000000Z")
+        )
 
     def test_fetch_documents_bundle_raises_bad_request_if_bundle_id_is_not_informed(
         self
@@ -169,28 +732,131 @@ class FetchDocumentsBundleTest(unittest.TestCase):
 
     def test_fetch_documents_bundle_raises_not_found_if_bundle_does_not_exist(self):
         self.request.matchdict["bundle_id"] = "0034-8910-rsp-48-2"
-        MockFetchDocumentsBundle = Mock(
+        MockFetchRawDocumentsBundle = Mock(
             side_effect=exceptions.DoesNotExist("Does Not Exist")
         )
-        self.request.services["fetch_documents_bundle"] = MockFetchDocumentsBundle
+        self.request.services["fetch_raw_documents_bundle"] = MockFetchRawDocumentsBundle
         response = restfulapi.fetch_documents_bundle(self.request)
         self.assertIsInstance(response, HTTPNotFound)
         self.assertEqual(response.message, "Does Not Exist")
 
-    def test_fetch_documents_bundle_calls_fetch_documents_bundle_service(self):
+    def test_fetch_documents_bundle_calls_fetch_raw_documents_bundle_service(self):
         self.request.matchdict["bundle_id"] = "0034-8910-rsp-48-2"
-        MockFetchDocumentsBundle = Mock(return_value={"id": "0034-8910-rsp-48-2"})
-        self.request.services["fetch_documents_bundle"] = MockFetchDocumentsBundle
+        MockFetchRawDocumentsBundle = Mock(return_value=(b"{}", "abc"))
+        self.request.services["fetch_raw_documents_bundle"] = MockFetchRawDocumentsBundle
         restfulapi.fetch_documents_bundle(self.request)
-        MockFetchDocumentsBundle.assert_called_once_with("0034-8910-rsp-48-2")
+        MockFetchRawDocumentsBundle.assert_called_once_with("0034-8910-rsp-48-2")
 
-    def test_fetch_documents_bundle_returns_fetch_documents_bundle_service_return(self):
+    def test_fetch_documents_bundle_returns_fetch_raw_documents_bundle_service_return(
+        self
+    ):
         self.request.matchdict["bundle_id"] = "0034-8910-rsp-48-2"
         expected = apptesting.documents_bundle_registry_data_fixture()
-        data = deepcopy(expected)
-        MockFetchDocumentsBundle = Mock(return_value=data)
-        self.request.services["fetch_documents_bundle"] = MockFetchDocumentsBundle
-        self.assertEqual(restfulapi.fetch_documents_bundle(self.request), expected)
+        raw = json.dumps(expected).encode("utf-8")
+        MockFetchRawDocumentsBundle = Mock(return_value=(raw, "abc"))
+        self.request.services["fetch_raw_documents_bundle"] = MockFetchRawDocumentsBundle
+        response = restfulapi.fetch_documents_bundle(self.request)
+        self.assertEqual(response.json, expected)
+        self.assertEqual(response.etag, "abc")
+
+    def test_fetch_documents_bundle_serves_the_stored_serialization(self):
+        self.request.matchdict["bundle_id"] = "0034-8910-rsp-48-2"
+        self.request.services["create_documents_bundle"](
+            "0034-8910-rsp-48-2", metadata={"volume": "1"}
+        )
+        response = restfulapi.fetch_documents_bundle(self.request)
+        self.assertEqual(response.content_type, "application/json")
+        self.assertEqual(response.json["metadata"], {"volume": "1"})
+
+
+class FetchDocumentsBundlesTest(unittest.TestCase):
+    def setUp(self):
+        self.request = make_request()
+        for bundle_id in ("bundle-1", "bundle-2"):
+            self.request.services["create_documents_bundle"](
+                bundle_id, metadata={"volume": bundle_id}
+            )
+
+    def test_missing_ids_returns_400(self):
+        self.request.GET = {}
+        self.assertRaises(
+            HTTPBadRequest, restfulapi.fetch_documents_bundles, self.request
+        )
+
+    def test_too_many_ids_returns_400(self):
+        testing.setUp(settings={"kernel.app.bulk.max_ids": 2})
+        self.addCleanup(testing.tearDown)
+        self.request.GET = {"ids": "bundle-1,bundle-2,bundle-3"}
+        self.assertRaises(
+            HTTPBadRequest, restfulapi.fetch_documents_bundles, self.request
+        )
+
+    def test_preserves_the_order_of_ids_and_reports_missing(self):
+        self.request.GET = {"ids": "bundle-2,unknown,bundle-1"}
+        response = restfulapi.fetch_documents_bundles(self.request)
+        self.assertEqual(response.content_type, "application/json")
+        data = json.loads(b"".join(response.app_iter))
+        self.assertEqual(
+            [bundle["id"] for bundle in data["results"]], ["bundle-2", "bundle-1"]
+        )
+        self.assertEqual(data["missing"], ["unknown"])
+
+    def test_all_missing(self):
+        self.request.GET = {"ids": "unknown"}
+        response = restfulapi.fetch_documents_bundles(self.request)
+        self.assertEqual(
+            json.loads(b"".join(response.app_iter)),
+            {"results": [], "missing": ["unknown"]},
+        )
+
+
+class FetchBundlesDocumentsUnitTest(unittest.TestCase):
+    def setUp(self):
+        self.request = make_request()
+        self.request.services["create_documents_bundle"](
+            "issue-1",
+            docs=[{"id": "doc-%s" % i, "order": str(i)} for i in range(5)],
+            metadata={"volume": "1"},
+        )
+        self.request.matchdict = {"bundle_id": "issue-1"}
+
+    def test_returns_the_requested_slice(self):
+        self.request.GET = {"offset": "1", "limit": "2"}
+        bundle = restfulapi.fetch_bundles_documents(self.request)
+        self.assertEqual([doc["id"] for doc in bundle["items"]], ["doc-1", "doc-2"])
+        self.assertEqual(bundle["metadata"], {"volume": "1"})
+
+    def test_default_slice(self):
+        self.request.GET = {}
+        bundle = restfulapi.fetch_bundles_documents(self.request)
+        self.assertEqual(len(bundle["items"]), 5)
+
+    def test_fields_selection_drops_items(self):
+        self.request.GET = {"fields": "id,metadata"}
+        self.assertEqual(
+            restfulapi.fetch_bundles_documents(self.request),
+            {"id": "issue-1", "metadata": {"volume": "1"}},
+        )
+
+    def test_invalid_arguments_returns_400(self):
+        for args in (
+            {"offset": "a"},
+            {"offset": "-1"},
+            {"limit": "0"},
+            {"limit": "1001"},
+        ):
+            with self.subTest(args=args):
+                self.request.GET = args
+                self.assertRaises(
+                    HTTPBadRequest, restfulapi.fetch_bundles_documents, self.request
+                )
+
+    def test_unknown_bundle_returns_404(self):
+        self.request.GET = {}
+        self.request.matchdict = {"bundle_id": "unknown"}
+        self.assertIsInstance(
+            restfulapi.fetch_bundles_documents(self.request), HTTPNotFound
+        )
 
 
 class DocumentsBundleSchemaTest(unittest.TestCase):
@@ -345,7 +1011,7 @@ class PutDocumentsBundleDocumentTest(unittest.TestCase):
         self.request.validated = [{"id": "doc-1"}, {"id": "doc-1"}]
         restfulapi.put_bundles_documents(self.request)
         response = restfulapi.fetch_documents_bundle(self.request)
-        self.assertEqual([], response.get("items"))
+        self.assertEqual([], response.json.get("items"))
 
     def test_should_return_404_if_bundle_not_found(self):
         self.request.matchdict["bundle_id"] = "example-bundle-id"
@@ -508,8 +1174,147 @@ class FetchJournalUnitTest(unittest.TestCase):
     def test_should_fetch_journal(self):
         self.request.services["fetch_journal"](id="1678-4596-cr-49-02")
         self.request.matchdict = {"journal_id": "1678-4596-cr-49-02"}
-        journal_data = restfulapi.get_journal(self.request)
-        self.assertIsInstance(journal_data, dict)
+        response = restfulapi.get_journal(self.request)
+        self.assertEqual(response.json["id"], "1678-4596-cr-49-02")
+        self.assertEqual(response.content_type, "application/json")
+        self.assertTrue(response.etag)
+
+
+class FetchJournalExpandedUnitTest(unittest.TestCase):
+    def setUp(self):
+        self.request = make_request()
+        self.request.services["create_documents_bundle"](
+            "issue-1", docs=[{"id": "doc-1", "order": "1"}], metadata={"volume": "1"}
+        )
+        self.request.services["create_journal"](id="1678-4596-cr")
+        self.request.services["add_issue_to_journal"](
+            id="1678-4596-cr", issue={"id": "issue-1", "year": "2019"}
+        )
+        self.request.services["add_issue_to_journal"](
+            id="1678-4596-cr", issue={"id": "issue-2", "year": "2020"}
+        )
+        self.request.matchdict = {"journal_id": "1678-4596-cr"}
+
+    def test_expand_issues(self):
+        self.request.GET = {"expand": "issues"}
+        journal = restfulapi.get_journal(self.request)
+        self.assertEqual(journal["items"][0]["year"], "2019")
+        self.assertEqual(journal["items"][0]["bundle"]["metadata"], {"volume": "1"})
+        self.assertIsNone(journal["items"][1]["bundle"])
+
+    def test_expand_issues_and_documents(self):
+        self.request.GET = {"expand": "issues,documents"}
+        journal = restfulapi.get_journal(self.request)
+        self.assertEqual(
+            journal["items"][0]["bundle"]["items"],
+            [{"id": "doc-1", "order": "1", "document": None}],
+        )
+
+    def test_documents_cannot_be_expanded_without_issues(self):
+        self.request.GET = {"expand": "documents"}
+        self.assertIsInstance(restfulapi.get_journal(self.request), HTTPBadRequest)
+
+    def test_unknown_levels_returns_400(self):
+        self.request.GET = {"expand": "issues,authors"}
+        self.assertIsInstance(restfulapi.get_journal(self.request), HTTPBadRequest)
+
+    def test_fields_selection(self):
+        self.request.GET = {"expand": "issues", "fields": "id,items.bundle.metadata"}
+        self.assertEqual(
+            restfulapi.get_journal(self.request),
+            {
+                "id": "1678-4596-cr",
+                "items": [{"bundle": {"metadata": {"volume": "1"}}}, {"bundle": None}],
+            },
+        )
+
+    def test_fields_selection_without_expansion(self):
+        self.request.GET = {"fields": "id"}
+        self.assertEqual(restfulapi.get_journal(self.request), {"id": "1678-4596-cr"})
+
+
+class GetJournalIssuesUnitTest(unittest.TestCase):
+    def setUp(self):
+        self.request = make_request()
+        self.request.services["create_journal"](
+            id="1678-4596-cr", metadata={"title": "Ciência Rural"}
+        )
+        self.request.services["update_issues_in_journal"](
+            id="1678-4596-cr",
+            issues=[{"id": "issue-%s" % i, "year": "2019"} for i in range(3)],
+        )
+        self.request.matchdict = {"journal_id": "1678-4596-cr"}
+
+    def test_returns_the_requested_slice(self):
+        self.request.GET = {"offset": "2", "limit": "10"}
+        journal = restfulapi.get_journal_issues(self.request)
+        self.assertEqual(journal["items"], [{"id": "issue-2", "year": "2019"}])
+        self.assertEqual(journal["metadata"], {"title": "Ciência Rural"})
+
+    def test_fields_selection(self):
+        self.request.GET = {"limit": "1", "fields": "items.id"}
+        self.assertEqual(
+            restfulapi.get_journal_issues(self.request), {"items": [{"id": "issue-0"}]}
+        )
+
+    def test_unknown_journal_returns_404(self):
+        self.request.GET = {}
+        self.request.matchdict = {"journal_id": "unknown"}
+        self.assertIsInstance(restfulapi.get_journal_issues(self.request), HTTPNotFound)
+
+
+class SelectFieldsTest(unittest.TestCase):
+    def test_selects_top_level_fields(self):
+        self.assertEqual(
+            restfulapi.select_fields({"a": 1, "b": 2}, ["a", "c"]), {"a": 1}
+        )
+
+    def test_selects_nested_fields(self):
+        self.assertEqual(
+            restfulapi.select_fields({"a": {"b": 1, "c": 2}, "d": 3}, ["a.b"]),
+            {"a": {"b": 1}},
+        )
+
+    def test_traverses_lists(self):
+        self.assertEqual(
+            restfulapi.select_fields(
+                {"items": [{"id": 1, "x": 1}, {"id": 2, "x": 2}]}, ["items.id"]
+            ),
+            {"items": [{"id": 1}, {"id": 2}]},
+        )
+
+    def test_broader_fields_take_precedence(self):
+        data = {"a": {"b": 1, "c": 2}}
+        self.assertEqual(restfulapi.select_fields(data, ["a.b", "a"]), data)
+        self.assertEqual(restfulapi.select_fields(data, ["a", "a.b"]), data)
+
+
+class FetchJournalsUnitTest(unittest.TestCase):
+    def setUp(self):
+        self.request = make_request()
+        for journal_id in ("1678-4596-cr", "0034-8910-rsp"):
+            self.request.services["create_journal"](
+                id=journal_id, metadata={"title": journal_id}
+            )
+
+    def test_missing_ids_returns_400(self):
+        self.request.GET = {"ids": ","}
+        self.assertRaises(HTTPBadRequest, restfulapi.get_journals, self.request)
+
+    def test_too_many_ids_returns_400(self):
+        testing.setUp(settings={"kernel.app.bulk.max_ids": 2})
+        self.addCleanup(testing.tearDown)
+        self.request.GET = {"ids": "0034-8910-rsp,1678-4596-cr,0001-3714"}
+        self.assertRaises(HTTPBadRequest, restfulapi.get_journals, self.request)
+
+    def test_preserves_the_order_of_ids_and_reports_missing(self):
+        self.request.GET = {"ids": "0034-8910-rsp,unknown,1678-4596-cr"}
+        data = json.loads(b"".join(restfulapi.get_journals(self.request).app_iter))
+        self.assertEqual(
+            [journal["metadata"]["title"] for journal in data["results"]],
+            ["0034-8910-rsp", "1678-4596-cr"],
+        )
+        self.assertEqual(data["missing"], ["unknown"])
 
 
 class PatchJournalUnitTest(unittest.TestCase):
@@ -706,7 +1511,7 @@ class PutJournalIssuesTest(unittest.TestCase):
         ]
         restfulapi.put_journal_issues(self.request)
         response = restfulapi.get_journal(self.request)
-        self.assertEqual([], response.get("items"))
+        self.assertEqual([], response.json.get("items"))
 
     def test_should_return_404_if_journal_not_found(self):
         self.request.matchdict["journal_id"] = "example-journal-id"
@@ -991,3 +1796,113 @@ class DeleteDocumentUnitTests(unittest.TestCase):
         request.matchdict = {"document_id": "unknown"}
         request.services["delete_document"] = Mock()
         self.assertRaises(HTTPNoContent, restfulapi.delete_document, request)
+
+
+class OpenAPISpecUnitTests(unittest.TestCase):
+    def setUp(self):
+        restfulapi._openapi_spec.cache_clear()
+        self.addCleanup(restfulapi._openapi_spec.cache_clear)
+
+    def test_spec_is_served_as_json_with_etag(self):
+        request = make_request()
+        response = restfulapi.openAPI_spec(request)
+        self.assertEqual(response.content_type, "application/json")
+        self.assertEqual(response.json["info"]["title"], "Kernel")
+        self.assertIsNotNone(response.etag)
+
+    def test_spec_is_generated_once(self):
+        with patch.object(
+            restfulapi.KernelSwagger, "generate", return_value={"swagger": "2.0"}
+        ) as mock_generate:
+            first = restfulapi.openAPI_spec(make_request()).body
+            second = restfulapi.openAPI_spec(make_request()).body
+        mock_generate.assert_called_once()
+        self.assertEqual(first, second)
+
+    def test_matching_etag_returns_304(self):
+        etag = restfulapi.openAPI_spec(make_request()).etag
+        request = make_request()
+        request.headers["If-None-Match"] = '"%s"' % etag
+        self.assertIsInstance(restfulapi.openAPI_spec(request), HTTPNotModified)
+
+    def test_tuple_schemas_are_described_as_arrays(self):
+        spec = restfulapi.openAPI_spec(make_request()).json
+        (param,) = spec["paths"]["/bundles/{bundle_id}"]["put"]["parameters"]
+        months = param["schema"]["properties"]["publication_months"]
+        self.assertEqual(months["properties"]["range"]["type"], "array")
+        self.assertEqual(months["properties"]["range"]["maxItems"], 2)
+
+
+class JSONRendererTests(unittest.TestCase):
+    def setUp(self):
+        self.value = {
+            "id": "0034-8910",
+            "metadata": {"title": [["pt", "Revista de Saúde Pública\n"]]},
+            "items": [{"id": "x", "order": 1, "pid": None, "aop": True}],
+            2: ["/", '"', "\\", "\x01", "😀"],
+        }
+
+    def render(self, value, request=None):
+        renderer = restfulapi.JSONRenderer(None)
+        return renderer(value, {"request": request})
+
+    def test_renders_bytes(self):
+        rendered = self.render(self.value)
+        self.assertIsInstance(rendered, bytes)
+        self.assertEqual(json.loads(rendered), json.loads(json.dumps(self.value)))
+
+    def test_values_not_supported_by_orjson_are_rendered(self):
+        self.assertEqual(
+            self.render({"big": 2 ** 70}), b'{"big":1180591620717411303424}'
+        )
+
+    def test_rendered_and_stored_serializations_are_the_same(self):
+        journal = domain.Journal(id="0034-8910")
+        journal.title = "Revista de Saúde Pública"
+        self.assertEqual(self.render(journal.data()), journal.data_bytes())
+
+    def test_objects_implementing___json__(self):
+        class Item:
+            def __json__(self, request):
+                return {"id": "x"}
+
+        self.assertEqual(self.render([Item()]), b'[{"id":"x"}]')
+
+    def test_unknown_objects_raise_TypeError(self):
+        self.assertRaises(TypeError, self.render, [object()])
+
+    def test_sets_content_type(self):
+        request = testing.DummyRequest()
+        self.render(self.value, request)
+        self.assertEqual(request.response.content_type, "application/json")
+
+    def test_preserves_content_type_set_by_the_view(self):
+        request = testing.DummyRequest()
+        request.response.content_type = "application/problem+json"
+        self.render(self.value, request)
+        self.assertEqual(request.response.content_type, "application/problem+json")
+
+
+class ObjectStoreUnavailableTests(unittest.TestCase):
+    def test_returns_503_with_retry_after(self):
+        exc = exceptions.CircuitOpenError("circuit is open", retry_after=12.3)
+        response = restfulapi.object_store_unavailable(exc, make_request())
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "13")
+
+    def test_retry_after_is_at_least_one_second(self):
+        exc = exceptions.CircuitOpenError("circuit is half-open")
+        response = restfulapi.object_store_unavailable(exc, make_request())
+        self.assertEqual(response.headers["Retry-After"], "1")
+
+
+class DeadlineExceededTests(unittest.TestCase):
+    def test_returns_504(self):
+        exc = exceptions.DeadlineExceeded("request deadline exceeded")
+        response = restfulapi.deadline_exceeded(exc, make_request())
+        self.assertEqual(response.status_code, 504)
+
+    def test_bulk_fetch_status(self):
+        self.assertEqual(
+            restfulapi._fetch_error_status(exceptions.DeadlineExceeded()), 504
+        )
@@ -1,7 +1,9 @@
 import os
+import threading
 import unittest
 from unittest import mock
 import datetime
+import itertools
 import random
 
 from bson.objectid import ObjectId
@@ -11,6 +13,7 @@ from . import apptesting
 
 
 def make_services():
+    apptesting.reset_circuit_breakers()
     session = apptesting.Session()
     return services.get_handlers(lambda: session, subscribers=[]), session
 
@@ -116,6 +119,54 @@ class FetchDocumentsBundleTest(CommandTestMixin, unittest.TestCase):
         )
 
 
+class FetchDocumentsBundlesTest(CommandTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.services, self.session = make_services()
+        self.command = self.services.get("fetch_documents_bundles")
+
+    def test_command_success(self):
+        self.services["create_documents_bundle"](id="xpto")
+        self.services["create_documents_bundle"](id="abc")
+        result = self.command(ids=["xpto", "unknown", "abc"])
+        self.assertEqual([id for id, _ in result], ["xpto", "unknown", "abc"])
+        self.assertEqual(result[0][1]["id"], "xpto")
+        self.assertIsNone(result[1][1])
+        self.assertEqual(result[2][1]["id"], "abc")
+
+    def test_command_fetches_at_once(self):
+        store = self.session.documents_bundles
+        with mock.patch.object(
+            store, "fetch_many", wraps=store.fetch_many
+        ) as mock_fetch_many:
+            self.command(ids=["xpto", "abc"])
+            mock_fetch_many.assert_called_once_with(["xpto", "abc"])
+
+
+class FetchDocumentsBundleDocumentsTest(CommandTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.services, self.session = make_services()
+        self.command = self.services.get("fetch_documents_bundle_documents")
+        self.services["create_documents_bundle"](
+            id="xpto", docs=[{"id": "/document/1"}, {"id": "/document/2"}]
+        )
+
+    def test_command_success(self):
+        result = self.command(id="xpto", offset=1, limit=10)
+        self.assertEqual(result["items"], [{"id": "/document/2"}])
+
+    def test_command_calls_fetch_slice(self):
+        with mock.patch.object(
+            self.session.documents_bundles, "fetch_slice"
+        ) as mock_fetch_slice:
+            self.command(id="xpto", offset=0, limit=1, fields=["metadata"])
+            mock_fetch_slice.assert_called_once_with("xpto", 0, 1, ["metadata"])
+
+    def test_command_raises_exception_if_does_not_exist(self):
+        self.assertRaises(
+            exceptions.DoesNotExist, self.command, id="unknown", offset=0, limit=1
+        )
+
+
 class UpdateDocumentsBundleTest(CommandTestMixin, unittest.TestCase):
     def setUp(self):
         self.services, self.session = make_services()
@@ -185,6 +236,24 @@ class UpdateDocumentsBundleTest(CommandTestMixin, unittest.TestCase):
                 },
             )
 
+    def test_command_with_unchanged_metadata_does_not_update(self):
+        self.services["create_documents_bundle"](
+            id="xpto", metadata={"publication_year": "2018", "volume": "2"}
+        )
+        with mock.patch.object(self.session.documents_bundles, "update") as mock_update:
+            self.command(id="xpto", metadata={"publication_year": "2018"})
+            mock_update.assert_not_called()
+
+    def test_command_with_unchanged_metadata_does_not_notify(self):
+        self.services["create_documents_bundle"](
+            id="xpto", metadata={"publication_year": "2018", "volume": "2"}
+        )
+        with mock.patch.object(self.session, "notify") as mock_notify:
+            self.command(
+                id="xpto", metadata={"publication_year": "2018", "volume": "2"}
+            )
+            mock_notify.assert_not_called()
+
 
 class AddDocumentToDocumentsBundleTest(CommandTestMixin, unittest.TestCase):
     def setUp(self):
@@ -318,15 +387,19 @@ class UpdateDocumentInDocumentsBundleTest(CommandTestMixin, unittest.TestCase):
         with mock.patch.object(self.session.documents_bundles, "fetch") as mock_fetch:
             DocumentsBundleStub = mock.Mock(spec=domain.DocumentsBundle)
             DocumentsBundleStub.documents = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
-            DocumentsBundleStub.add_document = mock.Mock()
-            DocumentsBundleStub.remove_document = mock.Mock()
+            DocumentsBundleStub.replace_documents = mock.Mock()
             mock_fetch.return_value = DocumentsBundleStub
 
-            self.command(id="issue-example-id", docs=["d"])
-            DocumentsBundleStub.remove_document.assert_has_calls(
-                [mock.call("a"), mock.call("b"), mock.call("c")]
-            )
-            DocumentsBundleStub.add_document.assert_called_once_with("d")
+            self.command(id="issue-example-id", docs=[{"id": "d"}])
+            DocumentsBundleStub.replace_documents.assert_called_once_with([{"id": "d"}])
+
+    def test_documents_are_replaced_in_order(self):
+        self.services["create_documents_bundle"](
+            id="xpto", docs=[{"id": "a"}, {"id": "b"}]
+        )
+        self.command(id="xpto", docs=[{"id": "c"}, {"id": "a"}])
+        result = self.services["fetch_documents_bundle"](id="xpto")
+        self.assertEqual(result["items"], [{"id": "c"}, {"id": "a"}])
 
     def test_raises_already_exists_if_duplicated_are_in_list(self):
         self.assertRaises(
@@ -345,13 +418,11 @@ class UpdateDocumentInDocumentsBundleTest(CommandTestMixin, unittest.TestCase):
         with mock.patch.object(self.session.documents_bundles, "fetch") as mock_fetch:
             DocumentsBundleStub = mock.Mock(spec=domain.DocumentsBundle)
             DocumentsBundleStub.documents = [{"id": "a"}]
-            DocumentsBundleStub.add_document = mock.Mock()
-            DocumentsBundleStub.remove_document = mock.Mock()
+            DocumentsBundleStub.replace_documents = mock.Mock()
             mock_fetch.return_value = DocumentsBundleStub
 
             self.command(id="issue-example-id", docs=[])
-            DocumentsBundleStub.remove_document.assert_has_calls([mock.call("a")])
-            DocumentsBundleStub.add_document.assert_not_called()
+            DocumentsBundleStub.replace_documents.assert_called_once_with([])
 
     def test_command_notify_event(self):
         with mock.patch.object(self.session.documents_bundles, "fetch") as mock_fetch:
@@ -420,22 +491,12 @@ class AddIssueToJournalTest(CommandTestMixin, unittest.TestCase):
     def test_event(self):
         self.assertIn(self.event, self.SUBSCRIBERS_EVENTS)
 
-    def test_command_calls_add_issue(self):
-        with mock.patch.object(self.session.journals, "fetch") as mock_fetch:
-            JournalStub = mock.Mock(spec=domain.Journal)
-            JournalStub.add_issue = mock.Mock()
-            mock_fetch.return_value = JournalStub
+    def test_command_calls_add_item(self):
+        with mock.patch.object(self.session.journals, "add_item") as mock_add_item:
             self.command(id="0034-8910-rsp", issue={"id": "0034-8910-rsp-48-2"})
-            JournalStub.add_issue.assert_called_once_with({"id": "0034-8910-rsp-48-2"})
-
-    def test_command_update_journals(self):
-        with mock.patch.object(self.session.journals, "fetch") as mock_fetch:
-            JournalStub = mock.Mock(spec=domain.Journal)
-            JournalStub.add_issue = mock.Mock()
-            mock_fetch.return_value = JournalStub
-            with mock.patch.object(self.session.journals, "update") as mock_update:
-                self.command(id="0034-8910-rsp", issue={"id": "0034-8910-rsp-48-2"})
-                mock_update.assert_called_once_with(JournalStub)
+            mock_add_item.assert_called_once_with(
+                "0034-8910-rsp", {"id": "0034-8910-rsp-48-2"}
+            )
 
     def test_command_success(self):
         self.assertIsNone(
@@ -460,10 +521,9 @@ class AddIssueToJournalTest(CommandTestMixin, unittest.TestCase):
         )
 
     def test_command_notify_event(self):
-        with mock.patch.object(self.session.journals, "fetch") as mock_fetch:
+        with mock.patch.object(self.session.journals, "add_item") as mock_add_item:
             JournalStub = mock.Mock(spec=domain.Journal)
-            JournalStub.insert_issue = mock.Mock()
-            mock_fetch.return_value = JournalStub
+            mock_add_item.return_value = JournalStub
             with mock.patch.object(self.session, "notify") as mock_notify:
                 self.command(id="0034-8910-rsp", issue={"id": "0034-8910-rsp-48-2"})
                 mock_notify.assert_called_once_with(
@@ -496,28 +556,26 @@ class InsertIssueToJournalTest(CommandTestMixin, unittest.TestCase):
             issue={"id": "0101-8910-csp-48-2"},
         )
 
-    def test_command_calls_insert_issue(self):
-        with mock.patch.object(self.session.journals, "fetch") as mock_fetch:
-            JournalStub = mock.Mock(spec=domain.Journal)
-            JournalStub.insert_issue = mock.Mock()
-            mock_fetch.return_value = JournalStub
+    def test_command_calls_add_item_with_index(self):
+        with mock.patch.object(self.session.journals, "add_item") as mock_add_item:
             self.command(
                 id="0034-8910-rsp", index=0, issue={"id": "0034-8910-rsp-48-2"}
             )
-            JournalStub.insert_issue.assert_called_once_with(
-                0, {"id": "0034-8910-rsp-48-2"}
+            mock_add_item.assert_called_once_with(
+                "0034-8910-rsp", {"id": "0034-8910-rsp-48-2"}, index=0
             )
 
-    def test_command_update_journals(self):
-        with mock.patch.object(self.session.journals, "fetch") as mock_fetch:
-            JournalStub = mock.Mock(spec=domain.Journal)
-            JournalStub.insert_issue = mock.Mock()
-            mock_fetch.return_value = JournalStub
-            with mock.patch.object(self.session.journals, "update") as mock_update:
-                self.command(
-                    id="0034-8910-rsp", index=0, issue={"id": "0034-8910-rsp-48-2"}
-                )
-                mock_update.assert_called_once_with(JournalStub)
+    def test_command_inserts_issue_at_index(self):
+        for issue in ("0034-8910-rsp-48-2", "0034-8910-rsp-48-3"):
+            self.services.get("add_issue_to_journal")(
+                id="0034-8910-rsp", issue={"id": issue}
+            )
+        self.command(id="0034-8910-rsp", index=1, issue={"id": "0034-8910-rsp-48-4"})
+        journal = self.session.journals.fetch("0034-8910-rsp")
+        self.assertEqual(
+            [issue["id"] for issue in journal.issues],
+            ["0034-8910-rsp-48-2", "0034-8910-rsp-48-4", "0034-8910-rsp-48-3"],
+        )
 
     def test_command_success(self):
         self.assertIsNone(
@@ -554,10 +612,9 @@ class InsertIssueToJournalTest(CommandTestMixin, unittest.TestCase):
         )
 
     def test_command_notify_event(self):
-        with mock.patch.object(self.session.journals, "fetch") as mock_fetch:
+        with mock.patch.object(self.session.journals, "add_item") as mock_add_item:
             JournalStub = mock.Mock(spec=domain.Journal)
-            JournalStub.insert_issue = mock.Mock()
-            mock_fetch.return_value = JournalStub
+            mock_add_item.return_value = JournalStub
             with mock.patch.object(self.session, "notify") as mock_notify:
                 self.command(
                     id="0034-8910-rsp", index=0, issue={"id": "0034-8910-rsp-48-2"}
@@ -592,22 +649,14 @@ class RemoveIssueFromJournalTest(CommandTestMixin, unittest.TestCase):
             issue="0101-8910-csp-48-2",
         )
 
-    def test_command_calls_remove_issue(self):
-        with mock.patch.object(self.session.journals, "fetch") as mock_fetch:
-            JournalStub = mock.Mock(spec=domain.Journal)
-            JournalStub.remove_issue = mock.Mock()
-            mock_fetch.return_value = JournalStub
+    def test_command_calls_remove_item(self):
+        with mock.patch.object(
+            self.session.journals, "remove_item"
+        ) as mock_remove_item:
             self.command(id="0034-8910-rsp", issue="0034-8910-rsp-48-2")
-            JournalStub.remove_issue.assert_called_once_with("0034-8910-rsp-48-2")
-
-    def test_command_update_journals(self):
-        with mock.patch.object(self.session.journals, "fetch") as mock_fetch:
-            JournalStub = mock.Mock(spec=domain.Journal)
-            JournalStub.remove_issue = mock.Mock()
-            mock_fetch.return_value = JournalStub
-            with mock.patch.object(self.session.journals, "update") as mock_update:
-                self.command(id="0034-8910-rsp", issue="0034-8910-rsp-48-2")
-                mock_update.assert_called_once_with(JournalStub)
+            mock_remove_item.assert_called_once_with(
+                "0034-8910-rsp", "0034-8910-rsp-48-2"
+            )
 
     def test_command_success(self):
         self.services.get("add_issue_to_journal")(
@@ -624,10 +673,11 @@ class RemoveIssueFromJournalTest(CommandTestMixin, unittest.TestCase):
         )
 
     def test_command_notify_event(self):
-        with mock.patch.object(self.session.journals, "fetch") as mock_fetch:
+        with mock.patch.object(
+            self.session.journals, "remove_item"
+        ) as mock_remove_item:
             JournalStub = mock.Mock(spec=domain.Journal)
-            JournalStub.remove_issue = mock.Mock()
-            mock_fetch.return_value = JournalStub
+            mock_remove_item.return_value = JournalStub
             with mock.patch.object(self.session, "notify") as mock_notify:
                 self.command(id="0034-8910-rsp", issue="0034-8910-rsp-48-2")
                 mock_notify.assert_called_once_with(
@@ -660,15 +710,11 @@ class UpdateIssuesInJournalTest(CommandTestMixin, unittest.TestCase):
         with mock.patch.object(self.session.journals, "fetch") as mock_fetch:
             JournalStub = mock.Mock(spec=domain.Journal)
             JournalStub.issues = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
-            JournalStub.add_issue = mock.Mock()
-            JournalStub.remove_issue = mock.Mock()
+            JournalStub.replace_issues = mock.Mock()
             mock_fetch.return_value = JournalStub
 
-            self.command(id="journal-example-id", issues=["d"])
-            JournalStub.remove_issue.assert_has_calls(
-                [mock.call("a"), mock.call("b"), mock.call("c")]
-            )
-            JournalStub.add_issue.assert_called_once_with("d")
+            self.command(id="journal-example-id", issues=[{"id": "d"}])
+            JournalStub.replace_issues.assert_called_once_with([{"id": "d"}])
 
     def test_raises_already_exists_if_duplicated_are_in_list(self):
         self.assertRaises(
@@ -687,13 +733,11 @@ class UpdateIssuesInJournalTest(CommandTestMixin, unittest.TestCase):
         with mock.patch.object(self.session.journals, "fetch") as mock_fetch:
             JournalStub = mock.Mock(spec=domain.Journal)
             JournalStub.issues = [{"id": "a"}]
-            JournalStub.add_issue = mock.Mock()
-            JournalStub.remove_issue = mock.Mock()
+            JournalStub.replace_issues = mock.Mock()
             mock_fetch.return_value = JournalStub
 
             self.command(id="journal-example-id", issues=[])
-            JournalStub.remove_issue.assert_has_calls([mock.call("a")])
-            JournalStub.add_issue.assert_not_called()
+            JournalStub.replace_issues.assert_called_once_with([])
 
     def test_command_notify_event(self):
         with mock.patch.object(self.session.journals, "fetch") as mock_fetch:
@@ -834,6 +878,89 @@ class FetchJournalTest(CommandTestMixin, unittest.TestCase):
         self.assertRaises(TypeError, self.command)
 
 
+class FetchJournalsTest(CommandTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.services, self.session = make_services()
+        self.command = self.services.get("fetch_journals")
+
+    def test_command_success(self):
+        self.services["create_journal"](id="1678-4596-cr")
+        result = self.command(ids=["unknown", "1678-4596-cr"])
+        self.assertEqual(result[0], ("unknown", None))
+        self.assertEqual(result[1][1]["id"], "1678-4596-cr")
+
+
+class FetchJournalIssuesTest(CommandTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.services, self.session = make_services()
+        self.command = self.services.get("fetch_journal_issues")
+        self.services["create_journal"](id="1678-4596-cr")
+        self.services["update_issues_in_journal"](
+            id="1678-4596-cr", issues=[{"id": "issue-1"}, {"id": "issue-2"}]
+        )
+
+    def test_command_success(self):
+        result = self.command(id="1678-4596-cr", offset=0, limit=1)
+        self.assertEqual(result["items"], [{"id": "issue-1"}])
+
+    def test_command_with_fields(self):
+        result = self.command(id="1678-4596-cr", offset=0, limit=1, fields=["id"])
+        self.assertEqual(result, {"id": "1678-4596-cr"})
+
+
+class FetchJournalExpandedTest(CommandTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.services, self.session = make_services()
+        self.command = self.services.get("fetch_journal_expanded")
+        self.session.documents.add(
+            domain.Document(
+                manifest={
+                    "id": "doc-1",
+                    "versions": [
+                        {
+                            "data": "https://url.to/doc-1.xml",
+                            "assets": {},
+                            "timestamp": "2018-08-05T23:02:29.392990Z",
+                            "renditions": [],
+                        }
+                    ],
+                }
+            )
+        )
+        self.services["create_documents_bundle"](
+            id="issue-1", docs=[{"id": "doc-1"}, {"id": "doc-2"}]
+        )
+        self.services["create_journal"](id="1678-4596-cr")
+        self.services["add_issue_to_journal"](
+            id="1678-4596-cr", issue={"id": "issue-1"}
+        )
+
+    def test_command_raises_exception_if_does_not_exist(self):
+        self.assertRaises(exceptions.DoesNotExist, self.command, id="unknown")
+
+    def test_command_resolves_issues(self):
+        journal = self.command(id="1678-4596-cr")
+        bundle = journal["items"][0]["bundle"]
+        self.assertEqual(bundle["id"], "issue-1")
+        self.assertEqual(bundle["items"], [{"id": "doc-1"}, {"id": "doc-2"}])
+
+    def test_command_resolves_documents(self):
+        journal = self.command(id="1678-4596-cr", documents=True)
+        items = journal["items"][0]["bundle"]["items"]
+        self.assertEqual(items[0]["document"]["data"], "https://url.to/doc-1.xml")
+        self.assertIsNone(items[1]["document"])
+
+    def test_command_fetches_each_level_at_once(self):
+        with mock.patch.object(
+            self.session.documents_bundles, "fetch_many", return_value={}
+        ) as mock_bundles, mock.patch.object(
+            self.session.documents, "fetch_many", return_value={}
+        ) as mock_documents:
+            self.command(id="1678-4596-cr", documents=True)
+            mock_bundles.assert_called_once_with(["issue-1"])
+            mock_documents.assert_called_once_with([])
+
+
 class UpdateJornalMetadataTest(CommandTestMixin, unittest.TestCase):
     def setUp(self):
         self.services, self.session = make_services()
@@ -941,6 +1068,24 @@ class UpdateJornalMetadataTest(CommandTestMixin, unittest.TestCase):
                 {"id": "1678-4596-cr", "metadata": metadata, "instance": mock.ANY},
             )
 
+    def test_command_with_unchanged_metadata_does_not_update(self):
+        with mock.patch.object(self.session.journals, "update") as mock_update:
+            self.command(id="1678-4596-cr", metadata={"title": "Journal Title"})
+            mock_update.assert_not_called()
+
+    def test_command_with_unchanged_metadata_does_not_notify(self):
+        with mock.patch.object(self.session, "notify") as mock_notify:
+            self.command(
+                id="1678-4596-cr",
+                metadata={
+                    "mission": [
+                        {"language": "pt", "value": "Missão do Periódico"},
+                        {"language": "en", "value": "Journal Mission"},
+                    ]
+                },
+            )
+            mock_notify.assert_not_called()
+
 
 class RegisterRenditionVersionTest(CommandTestMixin, unittest.TestCase):
     def setUp(self):
@@ -1207,3 +1352,506 @@ class RegisterDocumentVersionTest(CommandTestMixin, unittest.TestCase):
                     assets=assets,
                 )
             )
+
+
+class RegisterDocumentsTest(CommandTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.services, self.session = make_services()
+        self.command = self.services["register_documents"]
+        self.event = services.Events.DOCUMENTS_REGISTERED_IN_BULK
+        with open(
+            os.path.join(
+                os.path.dirname(os.path.abspath(__file__)),
+                "0034-8910-rsp-48-2-0347.xml",
+            ),
+            "rb",
+        ) as fixture:
+            self.xml = fixture.read()
+
+        requests_patcher = mock.patch("documentstore.domain.requests.get")
+        self.mock_request = requests_patcher.start()
+        self.mock_request.return_value.content = self.xml
+        self.addCleanup(requests_patcher.stop)
+
+    def test_event(self):
+        self.assertIn(self.event, self.SUBSCRIBERS_EVENTS)
+
+    def test_registers_new_documents(self):
+        results = self.command(
+            documents=[
+                {"id": "doc-1", "data_url": "https://url.to/doc-1.xml"},
+                {"id": "doc-2", "data_url": "https://url.to/doc-2.xml"},
+            ]
+        )
+        self.assertEqual(
+            [(r["id"], r["status"]) for r in results],
+            [("doc-1", "created"), ("doc-2", "created")],
+        )
+        self.assertEqual(
+            self.session.documents.fetch("doc-2").version()["data"],
+            "https://url.to/doc-2.xml",
+        )
+
+    def test_registers_new_versions_of_existing_documents(self):
+        self.command(documents=[{"id": "doc-1", "data_url": "https://url.to/v1.xml"}])
+        results = self.command(
+            documents=[{"id": "doc-1", "data_url": "https://url.to/v2.xml"}]
+        )
+        self.assertEqual(results[0]["status"], "updated")
+        manifest = self.session.documents.fetch("doc-1").manifest
+        self.assertEqual(len(manifest["versions"]), 2)
+
+    def test_reports_unchanged_documents(self):
+        self.command(documents=[{"id": "doc-1", "data_url": "https://url.to/v1.xml"}])
+        results = self.command(
+            documents=[{"id": "doc-1", "data_url": "https://url.to/v1.xml"}]
+        )
+        self.assertEqual(results[0]["status"], "unchanged")
+
+    def test_failures_do_not_prevent_other_registrations(self):
+        results = self.command(
+            documents=[
+                {
+                    "id": "doc-1",
+                    "data_url": "https://url.to/doc-1.xml",
+                    "assets": {"unknown-asset": "https://url.to/asset.jpg"},
+                },
+                {"id": "doc-2", "data_url": "https://url.to/doc-2.xml"},
+            ]
+        )
+        self.assertEqual(results[0]["status"], "failed")
+        self.assertIsInstance(results[0]["error"], ValueError)
+        self.assertEqual(results[1]["status"], "created")
+        self.assertRaises(
+            exceptions.DoesNotExist, self.session.documents.fetch, "doc-1"
+        )
+
+    def test_registers_assets(self):
+        self.command(
+            documents=[
+                {
+                    "id": "doc-1",
+                    "data_url": "https://url.to/doc-1.xml",
+                    "assets": {
+                        "0034-8910-rsp-48-2-0347-gf01": "https://url.to/gf01.jpg"
+                    },
+                }
+            ]
+        )
+        self.assertEqual(
+            self.session.documents.fetch("doc-1").version()["assets"][
+                "0034-8910-rsp-48-2-0347-gf01"
+            ],
+            "https://url.to/gf01.jpg",
+        )
+
+    def test_fetches_each_xml_once(self):
+        self.command(
+            documents=[
+                {"id": "doc-1", "data_url": "https://url.to/doc-1.xml"},
+                {"id": "doc-2", "data_url": "https://url.to/doc-2.xml"},
+            ]
+        )
+        self.assertEqual(self.mock_request.call_count, 2)
+
+    def test_duplicated_ids_raise_value_error(self):
+        self.assertRaises(
+            ValueError,
+            self.command,
+            documents=[
+                {"id": "doc-1", "data_url": "https://url.to/v1.xml"},
+                {"id": "doc-1", "data_url": "https://url.to/v2.xml"},
+            ],
+        )
+        self.mock_request.assert_not_called()
+        self.assertRaises(
+            exceptions.DoesNotExist, self.session.documents.fetch, "doc-1"
+        )
+
+    def test_command_notify_event_once(self):
+        with mock.patch.object(self.session, "notify") as mock_notify:
+            self.command(
+                documents=[
+                    {"id": "doc-1", "data_url": "https://url.to/doc-1.xml"},
+                    {"id": "doc-2", "data_url": "https://url.to/doc-2.xml"},
+                ]
+            )
+            mock_notify.assert_called_once_with(self.event, {"items": mock.ANY})
+            items = mock_notify.call_args[0][1]["items"]
+            self.assertEqual([item["id"] for item in items], ["doc-1", "doc-2"])
+
+
+class FetchDocumentsDataTest(CommandTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.services, self.session = make_services()
+        self.command = self.services["fetch_documents_data"]
+        with open(
+            os.path.join(
+                os.path.dirname(os.path.abspath(__file__)),
+                "0034-8910-rsp-48-2-0347.xml",
+            ),
+            "rb",
+        ) as fixture:
+            xml = fixture.read()
+
+        requests_patcher = mock.patch("documentstore.domain.requests.get")
+        mock_request = requests_patcher.start()
+        mock_request.return_value.content = xml
+        self.addCleanup(requests_patcher.stop)
+
+        self.services["register_documents"](
+            documents=[
+                {"id": "doc-1", "data_url": "https://url.to/doc-1.xml"},
+                {"id": "doc-2", "data_url": "https://url.to/doc-2.xml"},
+            ]
+        )
+
+    def test_results_preserve_the_order_of_ids(self):
+        results = list(self.command(ids=["doc-2", "doc-1"]))
+        self.assertEqual([id for id, _ in results], ["doc-2", "doc-1"])
+        for _, data in results:
+            self.assertIsInstance(data, bytes)
+
+    def test_manifests_are_fetched_at_once(self):
+        documents = self.session.documents
+        with mock.patch.object(
+            documents, "fetch_many", wraps=documents.fetch_many
+        ) as mock_fetch_many:
+            list(self.command(ids=["doc-1", "doc-2"]))
+            mock_fetch_many.assert_called_once_with(["doc-1", "doc-2"])
+
+    def test_unknown_documents_are_reported(self):
+        results = dict(self.command(ids=["doc-1", "unknown"]))
+        self.assertIsInstance(results["unknown"], exceptions.DoesNotExist)
+
+    def test_deleted_documents_are_reported(self):
+        self.services["delete_document"](id="doc-2")
+        results = dict(self.command(ids=["doc-1", "doc-2"]))
+        self.assertIsInstance(results["doc-1"], bytes)
+        self.assertIsInstance(results["doc-2"], exceptions.DeletedVersion)
+
+    def test_versions_prior_to_creation_are_reported(self):
+        results = dict(self.command(ids=["doc-1"], version_at="1900-01-01"))
+        self.assertIsInstance(results["doc-1"], ValueError)
+
+    def test_manifests_are_fetched_before_results_are_consumed(self):
+        documents = self.session.documents
+        with mock.patch.object(
+            documents, "fetch_many", wraps=documents.fetch_many
+        ) as mock_fetch_many:
+            self.command(ids=["doc-1"])
+            mock_fetch_many.assert_called_once_with(["doc-1"])
+
+    def test_data_is_produced_under_the_deadline_of_the_caller(self):
+        started = threading.Event()
+        remaining = []
+        data = domain.Document.data
+
+        def _data(document, **kwargs):
+            started.wait(5)
+            remaining.append(domain.remaining_time())
+            return data(document, **kwargs)
+
+        with mock.patch.object(domain.Document, "data", _data):
+            with domain.deadline(60):
+                results = self.command(ids=["doc-1"])
+            # os resultados são consumidos fora do prazo, como na transmissão
+            # da resposta HTTP
+            started.set()
+            self.assertIsInstance(dict(results)["doc-1"], bytes)
+        self.assertIsNotNone(remaining[0])
+
+
+class LRUCacheTest(unittest.TestCase):
+    def test_get_returns_default_for_unknown_keys(self):
+        cache = services.LRUCache(2)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("a", b""), b"")
+
+    def test_least_recently_used_items_are_evicted(self):
+        cache = services.LRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_zero_maxsize_disables_the_cache(self):
+        cache = services.LRUCache(0)
+        cache.set("a", 1)
+        self.assertIsNone(cache.get("a"))
+
+
+class FetchDocumentDataCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.services, self.session = make_services()
+        self.command = services.FetchDocumentData(
+            lambda: self.session, cache=services.LRUCache(8)
+        )
+        with open(
+            os.path.join(
+                os.path.dirname(os.path.abspath(__file__)),
+                "0034-8910-rsp-48-2-0347.xml",
+            ),
+            "rb",
+        ) as fixture:
+            xml = fixture.read()
+
+        requests_patcher = mock.patch("documentstore.domain.requests.get")
+        self.mock_request = requests_patcher.start()
+        self.mock_request.return_value.content = xml
+        self.addCleanup(requests_patcher.stop)
+
+        self.services["register_document"](
+            id="doc-1", data_url="https://url.to/doc-1.xml", assets={}
+        )
+        self.first_version_at = domain.utcnow()
+        self.services["register_document_version"](
+            id="doc-1", data_url="https://url.to/doc-1-v2.xml", assets={}
+        )
+
+    def assertFetchesData(self, times, **kwargs):
+        data = self.command(id="doc-1", **kwargs)
+        call_count = self.mock_request.call_count
+        self.assertEqual(self.command(id="doc-1", **kwargs), data)
+        self.assertEqual(self.mock_request.call_count - call_count, times)
+
+    def test_versions_prior_to_the_latest_are_cached(self):
+        self.assertFetchesData(0, version_index=0)
+
+    def test_latest_version_is_not_cached(self):
+        self.assertFetchesData(1)
+
+    def test_past_versions_at_are_cached(self):
+        self.assertFetchesData(0, version_at=self.first_version_at)
+
+    def test_future_versions_at_are_not_cached(self):
+        self.assertFetchesData(1, version_at="2100-01-01")
+
+    def test_versions_are_shared_between_index_and_timestamp(self):
+        data = self.command(id="doc-1", version_index=0)
+        call_count = self.mock_request.call_count
+        self.assertEqual(
+            self.command(id="doc-1", version_at=self.first_version_at), data
+        )
+        self.assertEqual(self.mock_request.call_count, call_count)
+
+
+class FetchDocumentDataSizeTest(unittest.TestCase):
+    def setUp(self):
+        self.services, self.session = make_services()
+        sizes = services.LRUCache(8)
+        self.fetch_data = services.FetchDocumentData(lambda: self.session, sizes=sizes)
+        self.command = services.FetchDocumentDataSize(lambda: self.session, sizes=sizes)
+        requests_patcher = mock.patch("documentstore.domain.requests.get")
+        self.mock_request = requests_patcher.start()
+        self.mock_request.return_value.content = b"<article/>"
+        self.addCleanup(requests_patcher.stop)
+        self.services["register_document"](
+            id="doc-1", data_url="https://url.to/doc-1.xml", assets={}
+        )
+
+    def test_size_is_unknown_until_the_data_is_produced(self):
+        self.assertIsNone(self.command(id="doc-1"))
+        data = self.fetch_data(id="doc-1")
+        self.assertEqual(self.command(id="doc-1"), len(data))
+
+    def test_size_is_fetched_without_producing_the_data(self):
+        self.fetch_data(id="doc-1")
+        call_count = self.mock_request.call_count
+        self.command(id="doc-1")
+        self.command(id="doc-1", version_at="2100-01-01")
+        self.assertEqual(self.mock_request.call_count, call_count)
+
+    def test_deleted_documents_raise_exception(self):
+        self.services["delete_document"](id="doc-1")
+        self.assertRaises(exceptions.DeletedVersion, self.command, id="doc-1")
+
+    def test_unknown_documents_raise_exception(self):
+        self.assertRaises(exceptions.DoesNotExist, self.command, id="unknown")
+
+
+class FetchDocumentVersionTest(CommandTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.services, self.session = make_services()
+        self.command = self.services["fetch_document_version"]
+        services.DATA_SIZES_CACHE.clear()
+        services.IMMUTABLE_VERSIONS_CACHE.clear()
+        self.session.documents.add(
+            domain.Document(
+                manifest={
+                    "id": "doc-1",
+                    "versions": [
+                        {
+                            "data": "https://url.to/doc-1.xml",
+                            "assets": {},
+                            "timestamp": "2018-08-05T23:02:29.392990Z",
+                            "renditions": [],
+                        }
+                    ],
+                }
+            )
+        )
+
+        requests_patcher = mock.patch("documentstore.domain.requests.get")
+        self.mock_request = requests_patcher.start()
+        self.mock_request.return_value.content = b"<article/>"
+        self.addCleanup(requests_patcher.stop)
+
+    def test_past_versions_return_the_canonical_timestamp(self):
+        self.assertEqual(
+            self.command(id="doc-1", version_at="2019-01-01"),
+            (b"<article/>", "2018-08-05T23:02:29.392990Z"),
+        )
+
+    def test_future_versions_return_none(self):
+        _, timestamp = self.command(id="doc-1", version_at="2100-01-01")
+        self.assertIsNone(timestamp)
+
+    def test_size_only_does_not_fetch_the_xml(self):
+        self.assertEqual(
+            self.command(id="doc-1", version_at="2019-01-01", size_only=True),
+            (None, "2018-08-05T23:02:29.392990Z"),
+        )
+        self.mock_request.assert_not_called()
+
+    def test_document_is_read_once(self):
+        documents = self.session.documents
+        with mock.patch.object(documents, "fetch", wraps=documents.fetch) as mock_fetch:
+            self.command(id="doc-1", version_at="2019-01-01")
+            mock_fetch.assert_called_once_with("doc-1")
+
+    def test_versions_prior_to_creation_raise_exception(self):
+        self.assertRaises(ValueError, self.command, id="doc-1", version_at="1900-01-01")
+
+    def test_unknown_documents_raise_exception(self):
+        self.assertRaises(
+            exceptions.DoesNotExist, self.command, id="unknown", version_at="2019-01-01"
+        )
+
+
+class LogChangesTest(unittest.TestCase):
+    def test_changes_are_added_in_a_single_call(self):
+        session = mock.Mock()
+        instance = mock.Mock(data_type="text/xml")
+        instance.data_bytes.return_value = b"<article/>"
+        services.log_changes(
+            {
+                "items": [
+                    {"id": "doc-1", "instance": instance},
+                    {"id": "doc-2", "instance": instance},
+                ]
+            },
+            session,
+            entity="Document",
+        )
+        session.changes.add_many.assert_called_once()
+        changes = session.changes.add_many.call_args[0][0]
+        self.assertEqual([c["id"] for c in changes], ["doc-1", "doc-2"])
+
+    def test_timestamps_are_unique(self):
+        session = mock.Mock()
+        instance = mock.Mock(data_type="text/xml")
+        now = mock.Mock(return_value="2018-08-05T23:03:44.999999Z")
+        services.log_changes(
+            {
+                "items": [
+                    {"id": "doc-1", "instance": instance, "data_bytes": b"<a/>"},
+                    {"id": "doc-2", "instance": instance, "data_bytes": b"<b/>"},
+                ]
+            },
+            session,
+            now=now,
+            entity="Document",
+        )
+        changes = session.changes.add_many.call_args[0][0]
+        self.assertEqual(
+            [c["timestamp"] for c in changes],
+            ["2018-08-05T23:03:44.999999Z", "2018-08-05T23:03:45.000000Z"],
+        )
+        instance.data_bytes.assert_not_called()
+
+    def test_clock_is_read_for_each_item(self):
+        session = mock.Mock()
+        instance = mock.Mock(data_type="text/xml")
+        now = mock.Mock(
+            side_effect=[
+                "2018-08-05T23:03:44.000001Z",
+                "2018-08-05T23:03:44.000005Z",
+                "2018-08-05T23:03:44.000003Z",
+            ]
+        )
+        services.log_changes(
+            {
+                "items": [
+                    {"id": "doc-%s" % i, "instance": instance, "data_bytes": b"<a/>"}
+                    for i in range(3)
+                ]
+            },
+            session,
+            now=now,
+            entity="Document",
+        )
+        changes = session.changes.add_many.call_args[0][0]
+        self.assertEqual(
+            [c["timestamp"] for c in changes],
+            [
+                "2018-08-05T23:03:44.000001Z",
+                "2018-08-05T23:03:44.000005Z",
+                "2018-08-05T23:03:44.000006Z",
+            ],
+        )
+
+    def test_interleaved_single_write_precedes_the_batch(self):
+        session = apptesting.Session()
+        ticks = itertools.count(1)
+
+        def now():
+            return "2018-08-05T23:03:44.%06dZ" % next(ticks)
+
+        instance = mock.Mock(data_type="text/xml")
+        instance.data_bytes.return_value = b"<article/>"
+
+        def compress(data):
+            # escrita individual concorrente à produção do lote
+            if not session.changes.filter():
+                services.log_change(
+                    {"id": "bundle-1", "instance": instance},
+                    session,
+                    now=now,
+                    entity="DocumentsBundle",
+                )
+            return data
+
+        services.log_changes(
+            {
+                "items": [
+                    {"id": "doc-%s" % i, "instance": instance, "data_bytes": b"<a/>"}
+                    for i in range(3)
+                ]
+            },
+            session,
+            now=now,
+            entity="Document",
+            compress=compress,
+        )
+        changes = session.changes.filter()
+        self.assertEqual(
+            [c["id"] for c in changes], ["bundle-1", "doc-0", "doc-1", "doc-2"]
+        )
+        timestamps = [c["timestamp"] for c in changes]
+        self.assertEqual(timestamps, sorted(set(timestamps)))
+
+    def test_timestamps_without_microseconds(self):
+        session = mock.Mock()
+        instance = mock.Mock(data_type="text/xml")
+        services.log_changes(
+            {"items": [{"id": "doc-1", "instance": instance, "data_bytes": b"<a/>"}]},
+            session,
+            now=lambda: "2018-08-05T23:03:44Z",
+            entity="Document",
+        )
+        changes = session.changes.add_many.call_args[0][0]
+        self.assertEqual(changes[0]["timestamp"], "2018-08-05T23:03:44.000000Z")